@@ -0,0 +1,72 @@
+"""Measure the throughput of the multihash functions on a large local file.
+
+Compares reading the whole file and hashing it with `multihash_as_hex` (as the STAC item creation used to do)
+with `multihash_file` (memory mapped) and `multihash_file_object` (chunked reads), and hashing several files
+one after the other with hashing them in parallel threads with `multihash_files`.
+
+Usage:
+    uv run python packages/topo-imagery-common/benchmarks/checksum_benchmark.py --size-mb 1024
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+
+from topo_imagery_common.files.checksum import (
+    CHUNK_SIZE,
+    multihash_as_hex,
+    multihash_file,
+    multihash_file_object,
+    multihash_files,
+)
+
+
+def _read_and_hash(path: str) -> str:
+    with open(path, "rb") as file:
+        return multihash_as_hex(file.read())
+
+
+def _hash_file_object(path: str) -> str:
+    with open(path, "rb") as file:
+        return multihash_file_object(file)
+
+
+def _report(name: str, function: Callable[[], object], size: int) -> None:
+    start_time = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start_time
+    print(f"{name:<36} {size / duration / 1024 / 1024:8.0f} MB/s")
+
+
+def _create_file(path: str, size: int) -> None:
+    chunk = os.urandom(CHUNK_SIZE)
+    with open(path, "wb") as file:
+        for _ in range(size // CHUNK_SIZE):
+            file.write(chunk)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024, help="Size of the file to hash, in MB")
+    parser.add_argument("--files", type=int, default=4, help="Number of files hashed by the batch measures")
+    arguments = parser.parse_args()
+    size = arguments.size_mb * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as tmp_path:
+        paths = [os.path.join(tmp_path, f"{i}.bin") for i in range(arguments.files)]
+        for path in paths:
+            _create_file(path, size)
+        # Warm up the page cache so that every measure reads from memory
+        multihash_files(paths)
+
+        _report("multihash_file (mmap)", lambda: multihash_file(paths[0]), size)
+        _report("multihash_file_object", lambda: _hash_file_object(paths[0]), size)
+        _report("read + multihash_as_hex", lambda: _read_and_hash(paths[0]), size)
+        _report(f"{arguments.files} files, sequential", lambda: [multihash_file(path) for path in paths], size * len(paths))
+        _report(f"{arguments.files} files, multihash_files", lambda: multihash_files(paths), size * len(paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Measure the throughput and memory of the `fs` primitives against a local `s3` stand-in.
+
+Synthetic objects, from KB sized STAC Item JSON to GB sized TIFF blobs, are put in a bucket of a local
+moto server (or of the in-process moto mock if `moto[server]` is not installed), then read with `fs.read`,
+written with `fs.write`, copied to a local directory with `fs.write_all` and got with
+`get_object_parallel_multithreading` at each concurrency level.
+A latency is added to every `s3` call and the transfers are limited to a bandwidth per request,
+so that the results are closer to a real bucket than the stand-in on its own. No network access is needed.
+
+Usage:
+    uv run python packages/topo-imagery-common/benchmarks/fs_benchmark.py --sizes 4KB,1MB,64MB,1GB --concurrency 1,4,16
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from boto3 import client
+from moto import mock_aws
+from topo_imagery_common.aws.aws_helper import get_s3_client
+from topo_imagery_common.files import fs
+from topo_imagery_common.files.fs_s3 import get_object_parallel_multithreading
+from topo_imagery_common.files.io_telemetry import OperationStats, get_io_telemetry
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+else:
+    S3Client = dict
+
+BUCKET = "benchmark-bucket"
+REGION = "us-east-1"
+JSON_MAX_SIZE = 64 * 1024
+"""Objects up to this size are STAC Item JSON documents, larger ones are TIFF blobs"""
+BLOCK_SIZE = 1024 * 1024
+SIZE_UNITS = {"GB": 1024**3, "MB": 1024**2, "KB": 1024, "B": 1}
+
+
+def parse_size(size: str) -> int:
+    """Parse a size like "4KB" or "1GB" to a number of bytes.
+
+    Args:
+        size: the size, with an optional unit (B, KB, MB or GB)
+
+    Returns:
+        the size in bytes
+
+    Examples:
+        >>> parse_size("4KB")
+        4096
+        >>> parse_size("1GB")
+        1073741824
+        >>> parse_size("100")
+        100
+    """
+    size = size.strip().upper()
+    for unit, multiplier in SIZE_UNITS.items():
+        if size.endswith(unit):
+            return int(float(size.removesuffix(unit)) * multiplier)
+    return int(size)
+
+
+def _format_size(size: int) -> str:
+    for unit, multiplier in SIZE_UNITS.items():
+        if size >= multiplier and size % multiplier == 0:
+            return f"{size // multiplier}{unit}"
+    return f"{size}B"
+
+
+def synthetic_object(size: int) -> tuple[str, bytes]:
+    """Create the content of a synthetic object of `size` bytes.
+
+    Args:
+        size: the size of the object
+
+    Returns:
+        the file extension and the content of the object: a STAC Item padded to `size` if it is small,
+        otherwise a little endian TIFF header followed by random bytes
+
+    Examples:
+        >>> extension, content = synthetic_object(4096)
+        >>> extension, len(content), json.loads(content)["type"]
+        ('.json', 4096, 'Feature')
+        >>> extension, content = synthetic_object(JSON_MAX_SIZE + 1)
+        >>> extension, len(content), content[:4]
+        ('.tiff', 65537, b'II*\\x00')
+    """
+    if size <= JSON_MAX_SIZE:
+        item: dict[str, Any] = {
+            "type": "Feature",
+            "stac_version": "1.0.0",
+            "id": "benchmark",
+            "properties": {"datetime": "2024-01-01T00:00:00Z", "padding": ""},
+            "links": [],
+            "assets": {},
+        }
+        padding = max(0, size - len(json.dumps(item)))
+        item["properties"]["padding"] = "a" * padding
+        return ".json", json.dumps(item).encode("utf-8")
+    # The random block is repeated so that GB sized objects are quick to create
+    block = os.urandom(min(size, BLOCK_SIZE))
+    content = b"II*\x00\x08\x00\x00\x00" + block * (size // len(block) + 1)
+    return ".tiff", content[:size]
+
+
+class Throttle:  # pylint: disable=too-few-public-methods
+    """Add a `latency` to each `s3` call and limit its transfer to `bandwidth` bytes per second,
+    through the events of the `s3` client."""
+
+    def __init__(self, latency: float, bandwidth: float | None) -> None:
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def install(self, s3_client: S3Client) -> None:
+        """Register the delays on the events of `s3_client`.
+
+        Args:
+            s3_client: the client to slow down
+        """
+        s3_client.meta.events.register("before-call.s3", self._before_call)
+        s3_client.meta.events.register("after-call.s3.GetObject", self._after_get_object)
+
+    def _transfer(self, size: int) -> None:
+        if self.bandwidth and size:
+            time.sleep(size / self.bandwidth)
+
+    def _before_call(self, params: dict[str, Any], **_kwargs: Any) -> None:
+        time.sleep(self.latency)
+        body = params.get("body")
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            self._transfer(len(body))
+
+    def _after_get_object(self, parsed: dict[str, Any], **_kwargs: Any) -> None:
+        self._transfer(int(parsed.get("ContentLength", 0)))
+
+
+@contextmanager
+def s3_stand_in() -> Generator[str, None, None]:
+    """Start a moto server on a free local port and point the `s3` clients to it, or mock `s3` in process
+    if `moto[server]` is not installed.
+
+    Yields:
+        a description of the stand-in
+    """
+    try:
+        from moto.server import ThreadedMotoServer  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        with mock_aws():
+            yield "in-process moto mock"
+        return
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    environment = {
+        "AWS_ENDPOINT_URL_S3": f"http://{host}:{port}",
+        "AWS_ACCESS_KEY_ID": "benchmark",
+        "AWS_SECRET_ACCESS_KEY": "benchmark",
+        "AWS_DEFAULT_REGION": REGION,
+    }
+    previous = {name: os.environ.get(name) for name in environment}
+    os.environ.update(environment)
+    try:
+        yield f"moto server on {host}:{port}"
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        server.stop()
+
+
+def _run_concurrently(function: Callable[[str], object], paths: list[str], concurrency: int) -> None:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in executor.map(function, paths):
+            pass
+
+
+def _get_objects(paths: list[str], concurrency: int) -> None:
+    keys = [path.removeprefix(f"s3://{BUCKET}/") for path in paths]
+    for _, result in get_object_parallel_multithreading(BUCKET, keys, get_s3_client(), concurrency):
+        if isinstance(result, BaseException):
+            raise result
+        result["Body"].read()
+
+
+@contextmanager
+def _measure(name: str, size: int, count: int, concurrency: int) -> Generator[None, None, None]:
+    get_io_telemetry().take()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    start_time = time.perf_counter()
+    yield
+    duration = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    # The latencies are only known for the calls recorded by the I/O telemetry
+    stats = OperationStats()
+    for operation_stats in get_io_telemetry().take().values():
+        stats.add(operation_stats)
+    latencies = f"{stats.percentile(0.5):8.1f} {stats.percentile(0.99):8.1f}" if stats.ops else f"{'-':>8} {'-':>8}"
+    print(
+        f"{name:<22} {_format_size(size):>6} {count:>5} {concurrency:>11}"
+        f" {size * count / duration / 1024 / 1024:10.1f} {count / duration:9.1f}"
+        f" {latencies} {(peak - baseline) / 1024 / 1024:10.1f}"
+    )
+
+
+def _benchmark_size(s3_client: S3Client, size: int, count: int, concurrency_levels: list[int], tmp_path: str) -> None:
+    extension, content = synthetic_object(size)
+    paths = [f"s3://{BUCKET}/{_format_size(size)}/{i}{extension}" for i in range(count)]
+    # The objects are put with an unthrottled client
+    for path in paths:
+        s3_client.put_object(Bucket=BUCKET, Key=path.removeprefix(f"s3://{BUCKET}/"), Body=content)
+
+    for concurrency in concurrency_levels:
+        with _measure("fs.read", size, count, concurrency):
+            _run_concurrently(fs.read, paths, concurrency)
+        with _measure("fs.write", size, count, concurrency):
+            _run_concurrently(lambda path: fs.write(f"{path}.copy", content), paths, concurrency)
+        target = os.path.join(tmp_path, f"{_format_size(size)}-{concurrency}")
+        with _measure("fs.write_all", size, count, concurrency):
+            fs.write_all(paths, target, concurrency, generate_name=False)
+        with _measure("get_object_parallel", size, count, concurrency):
+            _get_objects(paths, concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="4KB,1MB,64MB", help="Comma separated sizes of the objects, like 4KB,1GB")
+    parser.add_argument("--count", type=int, default=16, help="Number of objects of each size")
+    parser.add_argument("--max-bytes", type=parse_size, default="1GB", help="Maximum total size of the objects of each size")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma separated concurrency levels")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Latency added to each s3 call")
+    parser.add_argument(
+        "--bandwidth-mb", type=float, default=100, help="Bandwidth of each s3 request in MB/s, 0 for unlimited"
+    )
+    arguments = parser.parse_args()
+    sizes = [parse_size(size) for size in arguments.sizes.split(",")]
+    concurrency_levels = [int(concurrency) for concurrency in arguments.concurrency.split(",")]
+    throttle = Throttle(arguments.latency_ms / 1000, arguments.bandwidth_mb * 1024 * 1024)
+
+    with s3_stand_in() as stand_in, tempfile.TemporaryDirectory() as tmp_path:
+        s3_client: S3Client = client("s3", region_name=REGION)
+        s3_client.create_bucket(Bucket=BUCKET)
+        throttle.install(get_s3_client())
+        print(f"s3 stand-in: {stand_in}, latency: {arguments.latency_ms} ms, bandwidth: {arguments.bandwidth_mb} MB/s")
+        print(
+            f"{'primitive':<22} {'size':>6} {'count':>5} {'concurrency':>11}"
+            f" {'MB/s':>10} {'files/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak MB':>10}"
+        )
+        tracemalloc.start()
+        for size in sizes:
+            count = max(1, min(arguments.count, arguments.max_bytes // size))
+            _benchmark_size(s3_client, size, count, concurrency_levels, tmp_path)
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
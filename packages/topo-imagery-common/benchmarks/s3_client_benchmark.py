@@ -0,0 +1,58 @@
+"""Measure the per-call overhead of getting an `s3` client.
+
+Compares creating a new client for each call (as `fs_s3` used to do) with the shared client
+from `aws_helper.get_s3_client()`, alone and followed by a `head_object` on a mocked bucket.
+
+Usage:
+    uv run python packages/topo-imagery-common/benchmarks/s3_client_benchmark.py --iterations 200
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+
+from boto3 import client
+from moto import mock_aws
+from topo_imagery_common.aws.aws_helper import get_s3_client
+
+BUCKET = "benchmark-bucket"
+KEY = "object.json"
+
+
+def _new_client_head() -> None:
+    client("s3").head_object(Bucket=BUCKET, Key=KEY)
+
+
+def _pooled_client_head() -> None:
+    get_s3_client().head_object(Bucket=BUCKET, Key=KEY)
+
+
+def _report(name: str, function: Callable[[], object], iterations: int) -> float:
+    duration = timeit.timeit(function, number=iterations)
+    per_call_ms = duration / iterations * 1000
+    print(f"{name:<28} {per_call_ms:8.3f} ms/call")
+    return per_call_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="Number of calls for each measure")
+    arguments = parser.parse_args()
+
+    with mock_aws():
+        s3_client = client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket=BUCKET)
+        s3_client.put_object(Bucket=BUCKET, Key=KEY, Body=b"{}")
+        get_s3_client()  # Warm up the shared client
+
+        new_client = _report("client per call", lambda: client("s3"), arguments.iterations)
+        pooled_client = _report("get_s3_client()", get_s3_client, arguments.iterations)
+        new_client_head = _report("client per call + head", _new_client_head, arguments.iterations)
+        pooled_client_head = _report("get_s3_client() + head", _pooled_client_head, arguments.iterations)
+
+    print(f"client overhead saved per call: {new_client - pooled_client:.3f} ms")
+    print(f"head_object speed up: {new_client_head / pooled_client_head:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
 import json
+import os
+import threading
 from os import environ
 from time import sleep
 from typing import TYPE_CHECKING, Any, NamedTuple
 from urllib.parse import urlparse
 
-from boto3 import Session
+from boto3 import Session, client
+from botocore.config import Config
 from botocore.credentials import AssumeRoleCredentialFetcher, DeferredRefreshableCredentials, ReadOnlyCredentials
 from botocore.session import Session as BotocoreSession
 from linz_logger import get_log
 from topo_imagery_common.aws.aws_credential_source import CredentialSource
+from topo_imagery_common.aws.prefix_trie import PrefixTrie
 
 if TYPE_CHECKING:
     from mypy_boto3_s3 import S3Client
@@ -24,9 +28,20 @@ session = Session(profile_name=aws_profile)
 sessions: dict[str, Session] = {}
 
 bucket_roles: list[CredentialSource] = []
+bucket_roles_trie: PrefixTrie[CredentialSource] = PrefixTrie()
+"""`bucket_roles` by prefix"""
 
 bucket_config_path = environ.get("AWS_ROLE_CONFIG_PATH", "s3://linz-bucket-config/config.json")
 
+DEFAULT_CLIENT_KEY = "default"
+"""Key of the `s3` client using the default credentials in `s3_clients`"""
+max_pool_connections = int(environ.get("AWS_MAX_POOL_CONNECTIONS", "32"))
+"""Size of the connection pool of each `s3` client, shared by all the threads of a process"""
+s3_clients: dict[str, S3Client] = {}
+_s3_clients_lock = threading.Lock()
+default_access_denied_buckets: set[str] = set()
+"""Buckets the default credentials have been denied access to, which are accessed with an assumed role instead"""
+
 
 def _init_roles() -> None:
     """Load bucket to roleArn mapping for LINZ internal buckets from SSM"""
@@ -39,7 +54,9 @@ def _init_roles() -> None:
     get_log().trace("bucket_config_load", config=bucket_config_path)
 
     for cfg in json_content["prefixes"]:
-        bucket_roles.append(CredentialSource(**cfg))
+        credential_source = CredentialSource(**cfg)
+        bucket_roles.append(credential_source)
+        bucket_roles_trie.insert(credential_source.prefix, credential_source)
 
     get_log().debug("bucket_config_loaded", config=bucket_config_path, prefix_count=len(bucket_roles))
 
@@ -96,6 +113,81 @@ def get_session(prefix: str) -> Session:
     return current_session
 
 
+def get_s3_client(prefix: str | None = None) -> S3Client:
+    """Get the `s3` client shared by the current process for a `prefix`.
+    Clients are created once per assumed role (or once for the default credentials) and reused,
+    so their connection pool is shared by every thread. They are dropped after a `fork`
+    as their connections can't be shared with the child process.
+
+    Args:
+        prefix: the `s3` object path (key) to get the assumed role client for.
+            Defaults to None which returns the client using the default credentials.
+
+    Raises:
+        Exception: if there is no AWS role found for this prefix
+
+    Returns:
+        an `s3` client
+    """
+    client_key = DEFAULT_CLIENT_KEY
+    if prefix is not None:
+        cfg = _get_credential_config(prefix)
+        if cfg is None:
+            raise Exception(f"Unable to find role for prefix: {prefix}")
+        client_key = cfg.roleArn
+
+    with _s3_clients_lock:
+        s3_client = s3_clients.get(client_key)
+        if s3_client is None:
+            # Creating a client is not thread safe, hence the creation is done while holding the lock
+            config = Config(max_pool_connections=max_pool_connections)
+            if prefix is None:
+                s3_client = client("s3", config=config)
+            else:
+                s3_client = get_session(prefix).client("s3", config=config)
+            s3_clients[client_key] = s3_client
+            get_log().debug("s3_client_created", client=client_key, max_pool_connections=max_pool_connections)
+        return s3_client
+
+
+def _reset_s3_clients_after_fork() -> None:
+    """Drop the `s3` clients inherited from the parent process and the lock, which may have been held while forking.
+    The buckets known to deny the default credentials are forgotten too, as they are tied to the clients of the parent.
+    """
+    global _s3_clients_lock  # pylint: disable=global-statement
+    _s3_clients_lock = threading.Lock()
+    s3_clients.clear()
+    default_access_denied_buckets.clear()
+
+
+def is_default_access_denied(path: str) -> bool:
+    """Check if the default credentials have been denied access to the bucket of `path` (see `set_default_access_denied`).
+
+    Args:
+        path: a `s3` path
+
+    Returns:
+        True if the bucket should be accessed with its assumed role straight away
+    """
+    return parse_path(path).bucket in default_access_denied_buckets
+
+
+def set_default_access_denied(path: str) -> None:
+    """Remember that the default credentials have been denied access to the bucket of `path`,
+    so that the next requests to this bucket use its assumed role without trying the default credentials first.
+
+    Args:
+        path: a `s3` path
+    """
+    bucket = parse_path(path).bucket
+    if bucket not in default_access_denied_buckets:
+        get_log().debug("s3_bucket_default_access_denied", bucket=bucket)
+        default_access_denied_buckets.add(bucket)
+
+
+os.register_at_fork(after_in_child=_reset_s3_clients_after_fork)
+
+
 def get_session_credentials(prefix: str, retry_count: int = 3) -> ReadOnlyCredentials:
     """Attempt to get credentials for a `prefix`, retrying upto `retry_count` amount of times.
 
@@ -124,6 +216,18 @@ def get_session_credentials(prefix: str, retry_count: int = 3) -> ReadOnlyCreden
     raise last_error
 
 
+def has_role(prefix: str) -> bool:
+    """Check if there is an AWS role to assume for `prefix` (see `get_s3_client`).
+
+    Args:
+        prefix: the `s3` object path (key)
+
+    Returns:
+        True if a role is configured for `prefix`
+    """
+    return _get_credential_config(prefix) is not None
+
+
 def _get_credential_config(prefix: str) -> CredentialSource | None:
     """Get the credential config (`bucket-config`) for the `prefix`.
 
@@ -137,11 +241,7 @@ def _get_credential_config(prefix: str) -> CredentialSource | None:
     if not bucket_roles:
         _init_roles()
 
-    for cfg in bucket_roles:
-        if prefix.startswith(cfg.prefix):
-            return cfg
-
-    return None
+    return bucket_roles_trie.find(prefix)
 
 
 def parse_path(path: str) -> S3Path:
@@ -0,0 +1,66 @@
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class PrefixTrie(Generic[T]):
+    """Map prefixes to values, finding the values for a path in a time proportional to the length of the path
+    rather than to the number of prefixes.
+
+    Example:
+        >>> trie: PrefixTrie[str] = PrefixTrie()
+        >>> trie.insert("s3://bucket/", "bucket")
+        >>> trie.insert("s3://bucket/prefix/", "prefix")
+        >>> trie.find("s3://bucket/prefix/file.tiff")
+        'bucket'
+        >>> trie.find("s3://other-bucket/file.tiff") is None
+        True
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node[T] = _Node()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def insert(self, prefix: str, value: T) -> None:
+        """Add a prefix. If the prefix is already in the trie, the first value inserted is kept.
+
+        Args:
+            prefix: the prefix
+            value: the value of the prefix
+        """
+        node = self._root
+        for character in prefix:
+            node = node.children.setdefault(character, _Node())
+        if node.value is None:
+            node.value = (self._count, value)
+        self._count += 1
+
+    def find(self, path: str) -> T | None:
+        """Find the value of the first inserted prefix of `path`, like a scan of the prefixes in insertion order.
+
+        Args:
+            path: a path
+
+        Returns:
+            the value of the prefix, or None if no prefix matches
+        """
+        node = self._root
+        found = node.value
+        for character in path:
+            child = node.children.get(character)
+            if child is None:
+                break
+            node = child
+            if node.value is not None and (found is None or node.value[0] < found[0]):
+                found = node.value
+        return found[1] if found else None
+
+
+class _Node(Generic[T]):  # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        self.children: dict[str, _Node[T]] = {}
+        self.value: tuple[int, T] | None = None
+        """Insertion order and value of the prefix ending at this node"""
@@ -0,0 +1,187 @@
+import os
+import random
+import time
+from collections.abc import Callable
+from os import environ
+from threading import Condition
+from typing import ParamSpec, TypeVar
+
+from botocore.exceptions import ClientError
+from linz_logger import get_log
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+TRANSFER_MAX_CONCURRENCY = int(environ.get("TRANSFER_MAX_CONCURRENCY", "32"))
+"""Maximum number of transfers in flight in a process, shared by the bulk transfer helpers. Defaults to 32."""
+LATENCY_MIN_SIZE = 1024 * 1024  # 1MB
+"""Transfers smaller than this are bound by the request latency: their duration is compared as if they were this size"""
+THROTTLING_ERROR_CODES = {
+    "SlowDown",
+    "ServiceUnavailable",
+    "Throttling",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "503",
+}
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Check if an error is a throttling response from AWS, like a S3 `503 SlowDown`.
+
+    Args:
+        error: an error raised by a request
+
+    Returns:
+        True if the request has been throttled
+    """
+    if not isinstance(error, ClientError):
+        return False
+    return (
+        error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+        or error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 503
+    )
+
+
+class AdaptiveConcurrency:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """Limit the number of transfers in flight with an additive increase, multiplicative decrease (AIMD) controller.
+
+    Each time as many transfers as the limit complete without throttling or latency increase, the limit is doubled
+    until its first decrease ("slow start"), then it grows by one.
+    It is multiplied by `decrease_factor`, at most once per average transfer duration, when a transfer is throttled
+    or when the recent average duration per byte of the transfers of known size (see `call_sized`) gets over
+    `latency_factor` times the long term average, so that batches mixing small and large files don't back off.
+    Throttled transfers are retried after a random ("full jitter") exponential backoff.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        maximum: int = TRANSFER_MAX_CONCURRENCY,
+        decrease_factor: float = 0.5,
+        latency_factor: float = 3.0,
+        max_attempts: int = 5,
+        backoff_base: float = 0.1,
+        backoff_max: float = 10.0,
+    ) -> None:
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.limit = float(min(initial, maximum))
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.in_flight = 0
+        self._condition = Condition()
+        self._completed = 0
+        self._duration: float | None = None
+        self._latency: float | None = None
+        self._baseline_latency: float | None = None
+        self._last_decrease = 0.0
+        self._slow_start = True
+
+    def call(self, function: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Call `function` once a transfer slot is available, retrying it if throttled.
+        Its duration is not used to detect latency increases, as the size of the transfer is unknown.
+
+        Args:
+            function: the transfer to run
+            args: the arguments of `function`
+            kwargs: the keyword arguments of `function`
+
+        Returns:
+            the result of `function`
+        """
+        return self.call_sized(None, function, *args, **kwargs)
+
+    def call_sized(self, size: int | None, function: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Call `function`, transferring `size` bytes, once a transfer slot is available, retrying it if throttled.
+
+        Args:
+            size: the number of bytes transferred, None if unknown
+            function: the transfer to run
+            args: the arguments of `function`
+            kwargs: the keyword arguments of `function`
+
+        Returns:
+            the result of `function`
+        """
+        attempt = 1
+        while True:
+            self._acquire()
+            start_time = time.monotonic()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                throttled = is_throttling_error(error)
+                self._release(None, size, throttled)
+                if not throttled or attempt >= self.max_attempts:
+                    raise
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+                get_log().debug("transfer_throttled", attempt=attempt, delay=delay, limit=int(self.limit), error=str(error))
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._release(time.monotonic() - start_time, size, False)
+            return result
+
+    def _acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def _release(self, duration: float | None, size: int | None, throttled: bool) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self._decrease("throttled")
+            elif duration is not None:
+                self._duration = duration if self._duration is None else 0.7 * self._duration + 0.3 * duration
+                if size is not None and self._is_latency_increased(duration / max(size, LATENCY_MIN_SIZE)):
+                    self._decrease("latency")
+                else:
+                    self._completed += 1
+                    if self._completed >= self.limit and self.limit < self.maximum:
+                        self.limit = min(float(self.maximum), self.limit * 2 if self._slow_start else self.limit + 1)
+                        self._completed = 0
+            self._condition.notify_all()
+
+    def _is_latency_increased(self, latency: float) -> bool:
+        self._latency = latency if self._latency is None else 0.7 * self._latency + 0.3 * latency
+        self._baseline_latency = latency if self._baseline_latency is None else 0.95 * self._baseline_latency + 0.05 * latency
+        return self._latency > self.latency_factor * self._baseline_latency
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        # Transfers started before the last decrease may report throttling too: only react once per transfer duration
+        if now - self._last_decrease < (self._duration or 0):
+            return
+        self._last_decrease = now
+        self._slow_start = False
+        self._completed = 0
+        self.limit = max(1.0, self.limit * self.decrease_factor)
+        get_log().info("transfer_concurrency_decreased", reason=reason, limit=int(self.limit))
+
+
+_adaptive_concurrency = AdaptiveConcurrency()
+
+
+def get_adaptive_concurrency() -> AdaptiveConcurrency:
+    """Get the controller shared by the bulk transfers of the process, so that they back off together.
+
+    Returns:
+        the shared `AdaptiveConcurrency`
+    """
+    return _adaptive_concurrency
+
+
+def _reset_after_fork() -> None:
+    """Give a child process its own controller, as the lock of the parent's could have been held while forking."""
+    global _adaptive_concurrency  # pylint: disable=global-statement
+    _adaptive_concurrency = AdaptiveConcurrency()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,23 +1,125 @@
 import hashlib
-import io
+import mmap
+import os
+from collections.abc import Buffer, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
 
 import multihash
 
 CHUNK_SIZE = 1024 * 1024  # 1MB
+HASH_CONCURRENCY = 4
+"""Number of files `multihash_files` hashes in parallel"""
 
 
-def multihash_as_hex(file_content: bytes) -> str:
+class MultihashHasher:
+    """Incremental SHA-256 multihash, for content received by parts.
+
+    `hashlib` releases the GIL while hashing chunks larger than 2KB, so hashers can run in parallel threads.
+
+    Example:
+        >>> hasher = MultihashHasher()
+        >>> hasher.update(b"test ")
+        >>> hasher.update(b"content")
+        >>> hasher.hexdigest() == multihash_as_hex(b"test content")
+        True
+    """
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+
+    def update(self, data: Buffer) -> None:
+        """Add a part of the content to the hash.
+
+        Args:
+            data: the next part of the content
+        """
+        self._hash.update(data)
+
+    def hexdigest(self) -> str:
+        """Get the multihash of the content added so far.
+
+        Returns:
+            the hexadecimal SHA-256 multihash
+        """
+        result: str = multihash.to_hex_string(multihash.encode(self._hash.digest(), "sha2-256"))
+        return result
+
+
+def multihash_as_hex(file_content: Buffer) -> str:
     """Convert file bytes to hexadecimal SHA-256 hash
 
     Args:
-        file_content: content of a file to hash
+        file_content: content of a file to hash, as `bytes` or any other buffer like a `memoryview` or a `mmap`
 
     Returns:
         the hash of the file
     """
-    file_hash = hashlib.sha256()
-    file = io.BytesIO(file_content)
-    while chunk := file.read(CHUNK_SIZE):
-        file_hash.update(chunk)
-    result: str = multihash.to_hex_string(multihash.encode(file_hash.digest(), "sha2-256"))
-    return result
+    hasher = MultihashHasher()
+    hasher.update(file_content)
+    return hasher.hexdigest()
+
+
+def multihash_stream(chunks: Iterable[Buffer]) -> str:
+    """Hash a content received by chunks, like the body of a `s3` object.
+
+    Args:
+        chunks: the successive parts of the content
+
+    Returns:
+        the hexadecimal SHA-256 multihash of the content
+
+    Example:
+        >>> multihash_stream([b"test ", b"content"]) == multihash_as_hex(b"test content")
+        True
+    """
+    hasher = MultihashHasher()
+    for chunk in chunks:
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def multihash_file_object(file: BinaryIO) -> str:
+    """Hash a file object from its current position to its end, reading it by chunks of `CHUNK_SIZE`.
+
+    Args:
+        file: a binary file object opened for reading
+
+    Returns:
+        the hexadecimal SHA-256 multihash of the content read
+    """
+    return multihash_stream(iter(lambda: file.read(CHUNK_SIZE), b""))
+
+
+def multihash_file(path: str) -> str:
+    """Hash a local file without reading it in memory, through a memory map.
+
+    Args:
+        path: a local path to a file
+
+    Returns:
+        the hexadecimal SHA-256 multihash of the file
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            return multihash_as_hex(b"")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            mapped_file.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mapped_file) as view:
+                # Hashing by chunks releases the GIL for each chunk
+                return multihash_stream(view[offset : offset + CHUNK_SIZE] for offset in range(0, len(view), CHUNK_SIZE))
+
+
+def multihash_files(paths: list[str], concurrency: int = HASH_CONCURRENCY) -> dict[str, str]:
+    """Hash local files in parallel threads (see `multihash_file`).
+
+    Args:
+        paths: local paths to the files
+        concurrency: number of files hashed in parallel. Defaults to `HASH_CONCURRENCY`.
+
+    Returns:
+        the hexadecimal SHA-256 multihash of each file, by path
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return dict(zip(paths, executor.map(multihash_file, paths)))
@@ -1,67 +1,290 @@
+import io
+import json
 import os
-from concurrent.futures import Future, ThreadPoolExecutor
-
-from boto3 import client
+import tempfile
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import partial
+from os import environ
+from threading import Condition
+from typing import TYPE_CHECKING, BinaryIO, Literal, overload
+
+from botocore.exceptions import ClientError
 from linz_logger import get_log
 from topo_imagery_common.aws.aws_helper import is_s3
 from topo_imagery_common.files import fs_local, fs_s3
-from topo_imagery_common.files.checksum import multihash_as_hex
+from topo_imagery_common.files.adaptive_concurrency import TRANSFER_MAX_CONCURRENCY, get_adaptive_concurrency
+from topo_imagery_common.files.checksum import multihash_as_hex, multihash_file
+from topo_imagery_common.files.files_helper import ContentType
+from topo_imagery_common.files.fs_executor import run_all
+from topo_imagery_common.files.io_telemetry import IO_TELEMETRY_FILE_NAME, IO_TELEMETRY_SUMMARY, get_io_telemetry
+from topo_imagery_common.files.range_reader import RangeReader
+from topo_imagery_common.files.source_cache import get_source_cache
+
+if TYPE_CHECKING:
+    from topo_imagery_common.files.prefix_index import PrefixIndex
+
+WRITE_ALL_MAX_IN_FLIGHT_BYTES = int(environ.get("WRITE_ALL_MAX_IN_FLIGHT_BYTES", str(4 * 1024 * 1024 * 1024)))
+"""Maximum total size of the files `iter_write_all` writes in parallel. Defaults to 4GB."""
 
 
-def write(destination: str, source: bytes, content_type: str | None = None) -> str:
+def write(destination: str, source: bytes, content_type: str | None = None, skip_unchanged: bool = False) -> str:
     """Write a file from its source to a destination path.
 
     Args:
         destination: A path to where the file will be written.
         source: The source file in bytes.
         content_type: A standard Media Type describing the format of the contents.
+        skip_unchanged: Do not write an S3 `destination` that already has the same multihash. Defaults to False.
     """
     get_log().debug("write", path=destination)
     if is_s3(destination):
-        fs_s3.write(destination, source, content_type)
+        fs_s3.write(destination, source, content_type, skip_unchanged)
     else:
         fs_local.write(destination, source)
     return destination
 
 
-def read(path: str) -> bytes:
+@overload
+def read(path: str, use_mmap: Literal[False] = False) -> bytes: ...
+
+
+@overload
+def read(path: str, use_mmap: Literal[True]) -> memoryview: ...
+
+
+def read(path: str, use_mmap: bool = False) -> bytes | memoryview:
     """Read a file from its path.
 
     Args:
         path: A path to a file to read.
+        use_mmap: Return a read-only view of a memory map of local files instead of a copy of their content
+            (see `fs_local.read_mmap`). S3 files are then returned as a view of their content. Defaults to False.
 
     Returns:
-        bytes: The bytes content of the file.
+        The bytes content of the file, or a `memoryview` of it if `use_mmap`.
     """
     get_log().debug("read", path=path)
     if is_s3(path):
         try:
-            return fs_s3.read(path)
+            content = fs_s3.read(path)
+            return memoryview(content) if use_mmap else content
         # https://boto3.amazonaws.com/v1/documentation/api/latest/guide/error-handling.html#parsing-error-responses-and-catching-exceptions-from-aws-services
-        except client("s3").exceptions.ClientError as ce:
+        except ClientError as ce:
             # Error Code can be found here:
             # https://docs.aws.amazon.com/AmazonS3/latest/API/ErrorResponses.html#ErrorCodeList
             if ce.response["Error"]["Code"] == "NoSuchKey":
                 raise NoSuchFileError(path) from ce
 
     try:
-        return fs_local.read(path)
+        return fs_local.read_mmap(path) if use_mmap else fs_local.read(path)
+    except FileNotFoundError as error:
+        raise NoSuchFileError(path) from error
+
+
+def read_range(path: str, start: int, length: int) -> bytes:
+    """Read a part of a file without reading the whole file.
+
+    Args:
+        path: A path to a file to read.
+        start: Offset of the first byte to read.
+        length: Number of bytes to read. Less bytes are returned if the end of the file is reached.
+
+    Returns:
+        bytes: The bytes read.
+    """
+    get_log().debug("read_range", path=path, start=start, length=length)
+    if is_s3(path):
+        try:
+            return fs_s3.read_range(path, start, length)
+        except ClientError as ce:
+            if ce.response["Error"]["Code"] == "NoSuchKey":
+                raise NoSuchFileError(path) from ce
+            raise
+
+    try:
+        return fs_local.read_range(path, start, length)
+    except FileNotFoundError as error:
+        raise NoSuchFileError(path) from error
+
+
+def open(path: str) -> BinaryIO:  # pylint: disable=redefined-builtin
+    """Open a file for reading, without downloading it.
+    S3 files are read on demand by blocks with ranged GETs (see `RangeReader`), so that parsers of file
+    headers like `tifffile.TiffFile` only read the parts of the file they need.
+
+    Args:
+        path: A path to a file to read.
+
+    Returns:
+        A seekable, read-only binary file object, to be closed by the caller.
+    """
+    get_log().debug("open", path=path)
+    if is_s3(path):
+        return io.BufferedReader(RangeReader(partial(fs_s3.read_range, path), get_size(path)))
+
+    try:
+        return io.open(path, "rb")
+    except FileNotFoundError as error:
+        raise NoSuchFileError(path) from error
+
+
+def get_multihash(path: str) -> str:
+    """Hash a file without loading it in memory.
+
+    Args:
+        path: A path to a file to hash.
+
+    Returns:
+        The hexadecimal SHA-256 multihash of the file.
+    """
+    if is_s3(path):
+        try:
+            return fs_s3.get_multihash(path)
+        except ClientError as ce:
+            if ce.response["Error"]["Code"] == "NoSuchKey":
+                raise NoSuchFileError(path) from ce
+            raise
+
+    try:
+        return multihash_file(path)
+    except FileNotFoundError as error:
+        raise NoSuchFileError(path) from error
+
+
+def upload_file(
+    local_path: str, target: str, content_type: str | None = None, skip_unchanged: bool = False, hardlink: bool = False
+) -> str:
+    """Write a local file to a target path without loading it in memory.
+
+    Args:
+        local_path: A local path to the file to write.
+        target: A path to where the file will be written.
+        content_type: A standard Media Type describing the format of the contents.
+        skip_unchanged: Do not upload to an S3 `target` that already has the same multihash. Defaults to False.
+        hardlink: Hard link a local `target` to `local_path` if possible, instead of copying it (see `fs_local.copy`).
+            Defaults to False.
+
+    Returns:
+        The path of the file created
+    """
+    get_log().debug("upload_file", path=local_path, target=target)
+    try:
+        if is_s3(target):
+            fs_s3.upload_file(local_path, target, content_type, skip_unchanged=skip_unchanged)
+        else:
+            fs_local.copy(local_path, target, hardlink)
+    except FileNotFoundError as error:
+        raise NoSuchFileError(local_path) from error
+    return target
+
+
+def download_file(source: str, local_path: str) -> str:
+    """Write a file to a local path without loading it in memory.
+
+    Args:
+        source: A path to a file to read.
+        local_path: A local path to where the file will be written.
+
+    Returns:
+        The path of the file created
+    """
+    get_log().debug("download_file", path=source, target=local_path)
+    if is_s3(source):
+        try:
+            fs_s3.download_file(source, local_path)
+        except ClientError as ce:
+            if ce.response["Error"]["Code"] == "NoSuchKey":
+                raise NoSuchFileError(source) from ce
+            raise
+        return local_path
+
+    try:
+        fs_local.copy(source, local_path)
+    except FileNotFoundError as error:
+        raise NoSuchFileError(source) from error
+    return local_path
+
+
+def fetch(source: str, local_path: str, etag: str | None = None) -> str:
+    """Get a local copy of a source file, through the node source cache if enabled (see `source_cache`).
+    Files fetched through the cache are read-only hard links to the cached files: use `source_cache.unshare()`
+    before editing them in place. An S3 `source` is looked up with a `HEAD` request to get its version,
+    unless its `etag` is given.
+
+    Args:
+        source: A path to a file to read.
+        local_path: A local path to where the file will be written.
+        etag: The `ETag` of an S3 `source` if already known, like from a listing. Defaults to None.
+
+    Returns:
+        The path of the file created
+    """
+    source_cache = get_source_cache()
+    if source_cache is None:
+        return download_file(source, local_path)
+    return source_cache.get(get_cache_key(source, etag), local_path, partial(download_file, source))
+
+
+def get_cache_key(path: str, etag: str | None = None) -> str:
+    """Get a key identifying the current content of a file, made of its path and
+    its `ETag` if on S3, or its size and modification time if local.
+
+    Args:
+        path: A path to a file.
+        etag: The `ETag` of an S3 `path` if already known, like from a listing. Defaults to None.
+
+    Returns:
+        the cache key of the file
+    """
+    if is_s3(path):
+        if etag:
+            return f"{path}:{etag}"
+        try:
+            return f"{path}:{fs_s3.head(path)['ETag']}"
+        except ClientError as ce:
+            if ce.response["Error"]["Code"] == "404":
+                raise NoSuchFileError(path) from ce
+            raise
+    try:
+        stat = os.stat(path)
     except FileNotFoundError as error:
         raise NoSuchFileError(path) from error
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
 
 
-def copy(source: str, target: str) -> str:
+def copy(source: str, target: str, skip_unchanged: bool = False) -> str:
     """Copy a `source` file to a `target`.
+    Local files are streamed from or to their location. S3 to S3 copies are done server-side,
+    unless the credentials of the `source` can't write the `target`: the file is then streamed
+    through a temporary local file.
 
     Args:
         source: A path to a file to copy
         target: A path of the copy to create
+        skip_unchanged: Do not copy to an S3 `target` that already has the same multihash. Defaults to False.
 
     Returns:
         The path of the file created
     """
-    source_content = read(source)
-    return write(target, source_content)
+    if not is_s3(source):
+        return upload_file(source, target, skip_unchanged=skip_unchanged)
+    if not is_s3(target):
+        return download_file(source, target)
+    try:
+        fs_s3.copy(source, target, skip_unchanged=skip_unchanged)
+        return target
+    except ClientError as ce:
+        if ce.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            raise NoSuchFileError(source) from ce
+        if ce.response["Error"]["Code"] != "AccessDenied":
+            raise
+        get_log().info("copy_s3_server_side_denied", path=source, target=target)
+    with tempfile.TemporaryDirectory() as tmp_path:
+        return upload_file(
+            download_file(source, os.path.join(tmp_path, os.path.basename(source))), target, skip_unchanged=skip_unchanged
+        )
 
 
 def exists(path: str) -> bool:
@@ -78,49 +301,185 @@ def exists(path: str) -> bool:
     return fs_local.exists(path)
 
 
-def write_all(inputs: list[str], target: str, concurrency: int | None = 4, generate_name: bool | None = True) -> list[str]:
+def get_size(path: str) -> int:
+    """Get the size of a file without reading it.
+
+    Args:
+        path: A path to a file
+
+    Raises:
+        NoSuchFileError: if the file does not exist
+
+    Returns:
+        the size of the file in bytes
+    """
+    if is_s3(path):
+        try:
+            return fs_s3.head(path)["ContentLength"]
+        except ClientError as ce:
+            if ce.response["Error"]["Code"] == "404":
+                raise NoSuchFileError(path) from ce
+            raise
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError as error:
+        raise NoSuchFileError(path) from error
+
+
+def write_all(
+    inputs: list[str],
+    target: str,
+    concurrency: int | None = None,
+    generate_name: bool | None = True,
+    use_source_cache: bool = False,
+    skip_unchanged: bool = False,
+    source_index: "PrefixIndex | None" = None,
+) -> list[str]:
     """Writes list of files to target destination using multithreading.
+    The number of files written in parallel adapts to throttling (see `AdaptiveConcurrency`).
+
     Args:
         inputs: list of files to read
         target: target folder to write to
-        concurrency: max thread pool workers
+        concurrency: maximum number of files written in parallel. Defaults to `TRANSFER_MAX_CONCURRENCY`:
+            the shared `AdaptiveConcurrency` starts lower and raises the number of transfers in flight while they succeed.
         generated_name: create a target file name based on multihash the source filename
+        use_source_cache: get the files through the node source cache (see `fetch`) if `target` is local
+        skip_unchanged: do not write the files already in an S3 `target` with the same multihash
+        source_index: listing of the directories of `inputs`, giving their size and `ETag` without a request per file
 
     Returns:
-        list of written file paths
+        list of written file paths, in the order of `inputs`
     """
-    results: list[Future] = []  # type: ignore
-    written_tiffs: list[str] = []
-    with ThreadPoolExecutor(max_workers=concurrency) as executor:
-        for input_ in inputs:
-            results.append(executor.submit(write_file, input_, target, generate_name))
-
-    for future in results:
-        if future.exception():
-            get_log().warn("Failed Read-Write", error=future.exception())
-        else:
-            written_tiffs.append(future.result())
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    written = dict(
+        iter_write_all(inputs, target, concurrency, generate_name, use_source_cache, skip_unchanged, source_index=source_index)
+    )
+    return [written[input_] for input_ in inputs]
+
+
+def iter_write_all(
+    inputs: list[str],
+    target: str,
+    concurrency: int | None = None,
+    generate_name: bool | None = True,
+    use_source_cache: bool = False,
+    skip_unchanged: bool = False,
+    max_in_flight_bytes: int = WRITE_ALL_MAX_IN_FLIGHT_BYTES,
+    source_index: "PrefixIndex | None" = None,
+) -> Generator[tuple[str, str], None, None]:
+    """Write files to a target destination using multithreading, yielding each file as soon as it is written.
+    The number of files written in parallel adapts to throttling (see `AdaptiveConcurrency`),
+    and the total size of the files being transferred through this process is limited to `max_in_flight_bytes`.
+    S3 to S3 copies are done server-side and don't count in this budget.
 
-    if len(inputs) != len(written_tiffs):
-        get_log().error("Missing Files", count=len(inputs) - len(written_tiffs))
+    Args:
+        inputs: list of files to read
+        target: target folder to write to
+        concurrency: maximum number of files written in parallel. Defaults to `TRANSFER_MAX_CONCURRENCY`:
+            the shared `AdaptiveConcurrency` starts lower and raises the number of transfers in flight while they succeed.
+        generated_name: create a target file name based on multihash the source filename
+        use_source_cache: get the files through the node source cache (see `fetch`) if `target` is local
+        skip_unchanged: do not write the files already in an S3 `target` with the same multihash
+        max_in_flight_bytes: maximum total size of the files being written. A larger file is written alone.
+            Defaults to `WRITE_ALL_MAX_IN_FLIGHT_BYTES`.
+        source_index: listing of the directories of `inputs`, giving their size and `ETag` without a request per file.
+            The S3 inputs it doesn't cover are looked up with a `HEAD` request. Defaults to None.
+
+    Raises:
+        Exception: once all the files are processed, if some of them could not be written
+
+    Yields:
+        the input path and the written path of each file, in the order they are written
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    skipped_count, skipped_size = fs_s3.skipped_writes.count, fs_s3.skipped_writes.size
+    adaptive_concurrency = get_adaptive_concurrency()
+    byte_budget = _ByteBudget(max_in_flight_bytes)
+
+    def write_in_budget(input_: str) -> str:
+        size, etag = _get_transfer_info(input_, target, source_index)
+        with byte_budget.reserve(size):
+            return adaptive_concurrency.call_sized(
+                size or None, write_file, input_, target, generate_name, use_source_cache, skip_unchanged, etag
+            )
+
+    failed_count = 0
+    with ThreadPoolExecutor(max_workers=concurrency or TRANSFER_MAX_CONCURRENCY) as executor:
+        future_to_input = {executor.submit(write_in_budget, input_): input_ for input_ in inputs}
+        for future in as_completed(future_to_input):
+            if future.exception():
+                get_log().warn("Failed Read-Write", error=future.exception())
+                failed_count += 1
+            else:
+                yield future_to_input[future], future.result()
+
+    if skip_unchanged:
+        get_log().info(
+            "write_all_skipped_unchanged",
+            count=fs_s3.skipped_writes.count - skipped_count,
+            size=fs_s3.skipped_writes.size - skipped_size,
+        )
+    if failed_count:
+        get_log().error("Missing Files", count=failed_count)
         raise Exception("Not all mandatory source files were written")
 
-    return written_tiffs
+
+def _get_transfer_info(input_: str, target: str, source_index: "PrefixIndex | None") -> tuple[int, str | None]:
+    """Get the number of bytes transferred through this process to write `input_` to `target`, and the `ETag` of
+    `input_` if it is on S3 and had to be looked up. Missing files count as 0 bytes: `write_file` reports them."""
+    if is_s3(input_) and is_s3(target):
+        # Copied server-side
+        return 0, None
+    if not is_s3(input_):
+        try:
+            return os.path.getsize(input_), None
+        except FileNotFoundError:
+            return 0, None
+    if source_index is not None and source_index.covers(input_):
+        file_info = source_index.get(input_)
+        return (file_info.size, file_info.etag) if file_info else (0, None)
+    try:
+        head = get_adaptive_concurrency().call(fs_s3.head, input_)
+    except ClientError as ce:
+        if ce.response["Error"]["Code"] == "404":
+            return 0, None
+        raise
+    return head["ContentLength"], head["ETag"]
+
+
+class _ByteBudget:  # pylint: disable=too-few-public-methods
+    """Limit the total size of the transfers in flight. A transfer larger than the budget runs alone."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._condition = Condition()
+
+    @contextmanager
+    def reserve(self, size: int) -> Generator[None, None, None]:
+        """Wait until `size` bytes fit in the budget, and hold them until the end of the context."""
+        with self._condition:
+            while self.in_flight and self.in_flight + size > self.max_bytes:
+                self._condition.wait()
+            self.in_flight += size
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= size
+                self._condition.notify_all()
 
 
-def write_sidecars(inputs: list[str], target: str, concurrency: int | None = 4) -> None:
-    """Writes list of files (if found) to target destination using multithreading.
+def write_sidecars(inputs: list[str], target: str) -> None:
+    """Writes list of files (if found) to target destination, in the shared executor (see `run_all`).
     The copy of the files have a generated file name (@see `write_file`)
 
     Args:
         inputs: list of files to read
         target: target folder to write to
-        concurrency: max thread pool workers
     """
-    results: list[Future] = []  # type: ignore
-    with ThreadPoolExecutor(max_workers=concurrency) as executor:
-        for input_ in inputs:
-            results.append(executor.submit(write_file, input_, target))
+    results = run_all(partial(write_file, target=target), inputs)
 
     for future in results:
         future_ex = future.exception()
@@ -130,16 +489,27 @@ def write_sidecars(inputs: list[str], target: str, concurrency: int | None = 4)
             get_log().info("wrote_sidecar_file", path=future.result())
 
 
-def write_file(input_: str, target: str, generate_name: bool | None = True) -> str:
+def write_file(
+    input_: str,
+    target: str,
+    generate_name: bool | None = True,
+    use_source_cache: bool = False,
+    skip_unchanged: bool = False,
+    etag: str | None = None,
+) -> str:
     """Read a file from a path and write it to a target path.
     Args:
         input: A path to a file to read.
         target: A path to write the file to.
         generate_name: create a target file name based on multihash the source filename
+        use_source_cache: get the file through the node source cache (see `fetch`) if `target` is local
+        skip_unchanged: do not write the file if already in an S3 `target` with the same multihash
+        etag: the `ETag` of an S3 `input_` if already known, used by the node source cache
 
     Returns:
         str: Target file name.
     """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
     get_log().info(f"Trying write from file: {input_}")
 
     if generate_name:
@@ -148,10 +518,30 @@ def write_file(input_: str, target: str, generate_name: bool | None = True) -> s
     else:
         target_file_name = os.path.basename(input_)
 
-    return copy(input_, os.path.join(target, target_file_name))
+    target_path = os.path.join(target, target_file_name)
+    if use_source_cache and not is_s3(target_path):
+        return fetch(input_, target_path, etag)
+    return copy(input_, target_path, skip_unchanged)
 
 
 class NoSuchFileError(Exception):
     def __init__(self, path: str) -> None:
         self.message = f"File not found: {path}"
         self.path = path
+
+
+def write_io_telemetry_summary(directory: str) -> None:
+    """Log the I/O telemetry summary of the process (see `io_telemetry`),
+    and write it as JSON in `directory` if `IO_TELEMETRY_SUMMARY` is enabled.
+
+    Args:
+        directory: the directory of the outputs of the run
+    """
+    summary = get_io_telemetry().summary()
+    get_log().info("io_telemetry", summary=summary)
+    if IO_TELEMETRY_SUMMARY:
+        write(
+            os.path.join(directory, IO_TELEMETRY_FILE_NAME),
+            json.dumps(summary, indent=2).encode("utf-8"),
+            content_type=ContentType.JSON.value,
+        )
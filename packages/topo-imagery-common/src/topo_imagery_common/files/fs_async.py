@@ -0,0 +1,166 @@
+import asyncio
+from asyncio import AbstractEventLoop, Semaphore
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Callable, Iterable
+from functools import partial
+from os import environ
+from typing import Any, ParamSpec, TypeVar
+from weakref import WeakKeyDictionary
+
+from linz_logger import get_log
+from topo_imagery_common.aws.aws_helper import is_s3, parse_path
+from topo_imagery_common.files import fs
+from topo_imagery_common.files.adaptive_concurrency import TRANSFER_MAX_CONCURRENCY, get_adaptive_concurrency
+from topo_imagery_common.files.fs_executor import FS_MAX_WORKERS, get_executor
+from topo_imagery_common.files.hedged_requests import HedgedRequests
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+ASYNC_CONCURRENCY_PER_BUCKET = int(environ.get("ASYNC_CONCURRENCY_PER_BUCKET", "32"))
+"""Maximum number of operations in flight on a bucket (or on the local file system) in an event loop"""
+
+_semaphores: WeakKeyDictionary[AbstractEventLoop, dict[str, Semaphore]] = WeakKeyDictionary()
+
+
+async def aread(path: str) -> bytes:
+    """Read a file from its path, see `fs.read`.
+
+    Args:
+        path: A path to a file to read.
+
+    Returns:
+        bytes: The bytes content of the file.
+    """
+    return await _run(path, fs.read, path)
+
+
+async def awrite(destination: str, source: bytes, content_type: str | None = None) -> str:
+    """Write a file from its source to a destination path, see `fs.write`.
+
+    Args:
+        destination: A path to where the file will be written.
+        source: The source file in bytes.
+        content_type: A standard Media Type describing the format of the contents.
+
+    Returns:
+        The path of the file written
+    """
+    return await _run(destination, fs.write, destination, source, content_type)
+
+
+async def aexists(path: str) -> bool:
+    """Check if path (file or directory) exists, see `fs.exists`.
+
+    Args:
+        path: A path to a directory or file
+
+    Returns:
+        bool: True if the path exists
+    """
+    return await _run(path, fs.exists, path)
+
+
+async def acopy(source: str, target: str) -> str:
+    """Copy a `source` file to a `target`, see `fs.copy`.
+
+    Args:
+        source: A path to a file to copy
+        target: A path of the copy to create
+
+    Returns:
+        The path of the file created
+    """
+    return await _run(source, fs.copy, source, target)
+
+
+async def aread_many(
+    paths: Iterable[str] | AsyncIterable[str],
+    concurrency: int | None = None,
+    hedged_requests: HedgedRequests | None = None,
+) -> AsyncGenerator[tuple[str, bytes], None]:
+    """Read files concurrently, yielding them as soon as they are read.
+    `paths` is consumed as reads complete, so it can be a generator of a listing in progress. A synchronous iterable
+    is consumed in the default executor of the event loop, so that waiting for the next listing page does not block
+    the reads in flight.
+    If a read fails, the reads in flight are cancelled and the error is raised.
+
+    Args:
+        paths: Paths to the files to read.
+        concurrency: maximum number of reads in flight. Defaults to `ASYNC_CONCURRENCY_PER_BUCKET`.
+            The reads are also limited by `ASYNC_CONCURRENCY_PER_BUCKET` per bucket, by the `FS_MAX_WORKERS` threads
+            of the shared executor and by the shared `AdaptiveConcurrency` (up to `TRANSFER_MAX_CONCURRENCY`),
+            so a higher `concurrency` is logged with the effective limit.
+        hedged_requests: send a duplicate of the slowest reads (see `HedgedRequests`). Defaults to None.
+
+    Yields:
+        the path and the content of each file, in the order they complete
+    """
+
+    async def read_one(path: str) -> tuple[str, bytes]:
+        if hedged_requests:
+            return path, await _run(path, hedged_requests.call, fs.read, path)
+        return path, await aread(path)
+
+    concurrency = concurrency or ASYNC_CONCURRENCY_PER_BUCKET
+    if concurrency > (effective_concurrency := get_max_concurrency()):
+        get_log().info("aread_many_concurrency_limited", concurrency=concurrency, effective=effective_concurrency)
+    paths_iterator = aiter(paths) if isinstance(paths, AsyncIterable) else _iterate_in_executor(paths)
+    next_path: asyncio.Future[str | None] | None = asyncio.ensure_future(anext(paths_iterator, None))
+    pending: set[asyncio.Future[tuple[str, bytes]]] = set()
+    try:
+        while next_path or pending:
+            waiting: set[asyncio.Future[Any]] = set(pending)
+            if next_path and len(pending) < concurrency:
+                waiting.add(next_path)
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if next_path in done:
+                if (path := next_path.result()) is None:
+                    next_path = None
+                else:
+                    pending.add(asyncio.ensure_future(read_one(path)))
+                    next_path = asyncio.ensure_future(anext(paths_iterator, None))
+            for task in done & pending:
+                pending.remove(task)
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if next_path:
+            next_path.cancel()
+
+
+def get_max_concurrency() -> int:
+    """Get the maximum number of operations of the async API in flight on a bucket.
+
+    Returns:
+        the smallest of `ASYNC_CONCURRENCY_PER_BUCKET`, `FS_MAX_WORKERS` and `TRANSFER_MAX_CONCURRENCY`
+    """
+    return min(ASYNC_CONCURRENCY_PER_BUCKET, FS_MAX_WORKERS, TRANSFER_MAX_CONCURRENCY)
+
+
+async def _iterate_in_executor(paths: Iterable[str]) -> AsyncIterator[str]:
+    """Iterate `paths` in the default executor of the running event loop, as getting the next path can block."""
+    loop = asyncio.get_running_loop()
+    paths_iterator = iter(paths)
+    while (path := await loop.run_in_executor(None, next, paths_iterator, None)) is not None:
+        yield path
+
+
+async def _run(path: str, function: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run a blocking `fs` operation in the shared executor, once the semaphore of the bucket of `path` is acquired.
+    The operation goes through the shared `AdaptiveConcurrency`, so that it backs off on throttling with the other
+    bulk transfers of the process.
+    """
+    async with _get_semaphore(path):
+        return await asyncio.get_running_loop().run_in_executor(
+            get_executor(), partial(get_adaptive_concurrency().call, function, *args, **kwargs)
+        )
+
+
+def _get_semaphore(path: str) -> Semaphore:
+    """Get the semaphore of the bucket of `path` in the running event loop. Local paths share one semaphore."""
+    bucket = parse_path(path).bucket if is_s3(path) else ""
+    semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if bucket not in semaphores:
+        semaphores[bucket] = Semaphore(ASYNC_CONCURRENCY_PER_BUCKET)
+    return semaphores[bucket]
@@ -0,0 +1,57 @@
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import environ
+from threading import Lock
+from typing import TypeVar
+
+from topo_imagery_common.files.adaptive_concurrency import get_adaptive_concurrency
+
+T = TypeVar("T")
+
+FS_MAX_WORKERS = int(environ.get("FS_MAX_WORKERS", "64"))
+"""Number of threads running the blocking `fs` operations of the async API (see `fs_async`) and of `run_all`,
+shared by the whole process"""
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the thread pool running the concurrent `fs` operations of the process, instead of a pool per caller.
+
+    Returns:
+        the shared executor
+    """
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=FS_MAX_WORKERS, thread_name_prefix="fs")
+        return _executor
+
+
+def run_all(function: Callable[[str], T], paths: Iterable[str]) -> list[Future[T]]:
+    """Run a blocking `fs` operation on each path in the shared executor, from synchronous code.
+    The operations go through the shared `AdaptiveConcurrency`, so that they back off on throttling with the other
+    bulk transfers of the process.
+    Do not wait for the results from a task of the shared executor: it could be waiting for its own thread.
+
+    Args:
+        function: the operation to run, taking a path
+        paths: the paths to run the operation on
+
+    Returns:
+        the future result of each operation, in the order of `paths`
+    """
+    adaptive_concurrency = get_adaptive_concurrency()
+    return [get_executor().submit(adaptive_concurrency.call, function, path) for path in paths]
+
+
+def _reset_executor_after_fork() -> None:
+    """Drop the executor inherited from the parent process, as its threads do not exist in the child."""
+    global _executor, _executor_lock  # pylint: disable=global-statement
+    _executor = None
+    _executor_lock = Lock()
+
+
+os.register_at_fork(after_in_child=_reset_executor_after_fork)
@@ -1,16 +1,83 @@
+import errno
+import mmap
 import os
+import shutil
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from linz_logger import get_log
+
+COPY_FILE_RANGE_UNSUPPORTED_ERRORS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EPERM}
+"""Errors of `os.copy_file_range` meaning the copy has to be done another way"""
 
 
 def write(destination: str, source: bytes) -> None:
     """Write the source to the local destination file.
+    The file is written to a temporary file renamed to `destination`, so that `destination` is never partially written.
 
     Args:
         destination: The local path to the file to write.
         source: The source file in bytes.
     """
-    os.makedirs(os.path.dirname(destination), mode=0o777, exist_ok=True)
-    with open(destination, "wb") as file:
-        file.write(source)
+    if directory := os.path.dirname(destination):
+        os.makedirs(directory, mode=0o777, exist_ok=True)
+    with _atomic_destination(destination) as temp_path:
+        with open(temp_path, "wb") as file:
+            file.write(source)
+
+
+def copy(source: str, destination: str, hardlink: bool = False) -> None:
+    """Copy a local file to a local destination without loading it in memory.
+    The content is copied by the kernel (see `_copy_file_range`) to a temporary file renamed to `destination`,
+    so that `destination` is never partially written.
+
+    Args:
+        source: The local path to the file to copy.
+        destination: The local path to the file to write.
+        hardlink: Hard link `destination` to `source` when they are on the same file system, instead of copying it.
+            Only for a `source` that will not be edited in place, like a working file. Defaults to False.
+    """
+    if directory := os.path.dirname(destination):
+        os.makedirs(directory, mode=0o777, exist_ok=True)
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        get_log().debug("copy_local_same_file", path=source)
+        return
+    with _atomic_destination(destination) as temp_path:
+        if hardlink:
+            try:
+                os.link(source, temp_path)
+                return
+            except OSError as error:
+                # Different file systems, or no hard link support: copy instead
+                get_log().trace("copy_local_hardlink_failed", path=source, destination=destination, error=str(error))
+        _copy_file_range(source, temp_path)
+
+
+def _copy_file_range(source: str, destination: str) -> None:
+    """Copy a local file with `os.copy_file_range`, which copies in the kernel
+    and can share the blocks (reflink) or copy server-side (NFS 4.2) if the file system supports it.
+    Falls back to `shutil.copyfile`, which uses `sendfile` on Linux, if `copy_file_range` is not supported.
+
+    Args:
+        source: The local path to the file to copy.
+        destination: The local path to the file to write.
+    """
+    if hasattr(os, "copy_file_range"):
+        with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+            remaining = os.fstat(source_file.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(source_file.fileno(), destination_file.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                return
+            except OSError as error:
+                if error.errno not in COPY_FILE_RANGE_UNSUPPORTED_ERRORS:
+                    raise
+                get_log().trace("copy_file_range_unsupported", path=source, error=str(error))
+    shutil.copyfile(source, destination)
 
 
 def read(path: str) -> bytes:
@@ -26,6 +93,42 @@ def read(path: str) -> bytes:
         return file.read()
 
 
+def read_mmap(path: str) -> memoryview:
+    """Map a local file in memory instead of reading it.
+    The pages of the file are only read when accessed, and shared with the page cache instead of copied.
+
+    Args:
+        path: A local path to a file.
+
+    Returns:
+        A read-only view of the file content, valid until released or garbage collected.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            return memoryview(b"")
+        # The map stays valid after the file is closed, and is closed when the view is released
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def read_range(path: str, start: int, length: int) -> bytes:
+    """Read `length` bytes of a local file from the `start` offset.
+
+    Args:
+        path: A local path to a file.
+        start: Offset of the first byte to read.
+        length: Number of bytes to read. Less bytes are returned if the end of the file is reached.
+
+    Returns:
+        The bytes read.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.pread(fd, length, start)
+    finally:
+        os.close(fd)
+
+
 def exists(path: str) -> bool:
     """Check if path (file or directory) exists
 
@@ -36,3 +139,22 @@ def exists(path: str) -> bool:
         True if the path exists
     """
     return os.path.exists(path)
+
+
+@contextmanager
+def _atomic_destination(destination: str) -> Generator[str, None, None]:
+    """Give a temporary path next to `destination`, renamed to `destination` if no error is raised.
+
+    Args:
+        destination: The local path of the file to write.
+
+    Yields:
+        the temporary path to write the file to
+    """
+    temp_path = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        yield temp_path
+        os.replace(temp_path, destination)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -1,36 +1,77 @@
+import os
 from collections.abc import Generator
 from concurrent import futures
-from concurrent.futures import ThreadPoolExecutor
-from typing import TYPE_CHECKING, Any
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from queue import Queue
+from threading import Event, Lock
+from typing import TYPE_CHECKING, Any, BinaryIO
 
-from boto3 import client
 from linz_logger import get_log
-from topo_imagery_common.aws.aws_helper import get_session, parse_path
+from topo_imagery_common.aws.aws_helper import (
+    get_s3_client,
+    has_role,
+    is_default_access_denied,
+    parse_path,
+    set_default_access_denied,
+)
 from topo_imagery_common.files import checksum
+from topo_imagery_common.files.adaptive_concurrency import get_adaptive_concurrency
+from topo_imagery_common.files.io_telemetry import (
+    instrumented,
+    measure_pages,
+    record_retry,
+    set_transferred_bytes,
+)
 from topo_imagery_common.log.time_helper import time_in_ms
 
 if TYPE_CHECKING:
     from mypy_boto3_s3 import S3Client
-    from mypy_boto3_s3.type_defs import GetObjectOutputTypeDef
+    from mypy_boto3_s3.type_defs import (
+        CompletedPartTypeDef,
+        CopySourceTypeDef,
+        GetObjectOutputTypeDef,
+        HeadObjectOutputTypeDef,
+        ListObjectsV2OutputTypeDef,
+        ObjectTypeDef,
+    )
 else:
-    S3Client = GetObjectOutputTypeDef = dict
-
-
-def write(destination: str, source: bytes, content_type: str | None = None) -> None:
+    S3Client = CompletedPartTypeDef = CopySourceTypeDef = GetObjectOutputTypeDef = dict
+    HeadObjectOutputTypeDef = ListObjectsV2OutputTypeDef = ObjectTypeDef = dict
+
+MULTIPART_PART_SIZE = 64 * 1024 * 1024  # 64MB
+"""Size of each part sent by `upload_file`. Files smaller than this are sent with a single `put_object`."""
+MULTIPART_CONCURRENCY = 4
+"""Number of parts `upload_file` sends in parallel, which also bounds the number of parts held in memory."""
+DOWNLOAD_PART_SIZE = 64 * 1024 * 1024  # 64MB
+"""Size of each ranged GET sent by `download_file`. Files smaller than this are downloaded with a single GET."""
+DOWNLOAD_CONCURRENCY = 8
+"""Number of ranged GETs `download_file` sends in parallel."""
+COPY_MAX_SIZE = 5 * 1024 * 1024 * 1024  # 5GB
+"""Largest object `copy_object` accepts. Larger objects are copied by parts with `upload_part_copy`."""
+COPY_PART_SIZE = 512 * 1024 * 1024  # 512MB
+"""Size of each part copied by `upload_part_copy`."""
+
+
+@instrumented("write")
+def write(destination: str, source: bytes, content_type: str | None = None, skip_unchanged: bool = False) -> None:
     """Write a source (bytes) in a AWS s3 destination (path in a bucket).
 
     Args:
         destination: The AWS S3 path to the file to write.
         source: The source file in bytes.
         content_type: A standard Media Type describing the format of the contents.
+        skip_unchanged: Do not write if `destination` already has the same multihash. Defaults to False.
     """
     start_time = time_in_ms()
     if source is None:
         get_log().error("write_s3_source_none", path=destination, error="The 'source' is None.")
         raise Exception("The 'source' is None.")
     bucket, key = parse_path(destination)
-    s3_client: S3Client = client("s3")
+    s3_client = get_s3_client()
     multihash = checksum.multihash_as_hex(source)
+    if skip_unchanged and _is_unchanged(s3_client, destination, multihash):
+        _skip_write(destination, len(source))
+        return
 
     try:
         if content_type:
@@ -39,12 +80,168 @@ def write(destination: str, source: bytes, content_type: str | None = None) -> N
             )
         else:
             s3_client.put_object(Bucket=bucket, Key=key, Body=source, Metadata={"multihash": multihash})
+        set_transferred_bytes(len(source))
         get_log().debug("write_s3_success", path=destination, duration=time_in_ms() - start_time)
     except s3_client.exceptions.ClientError as ce:
         get_log().error("write_s3_error", path=destination, error=f"Unable to write the file: {ce}")
         raise ce
 
 
+@instrumented("read_range")
+def read_range(path: str, start: int, length: int, needs_credentials: bool = False) -> bytes:
+    """Read `length` bytes of a file on a AWS S3 bucket, from the `start` offset, with a ranged GET.
+
+    Args:
+        path: The AWS S3 path to the file to read.
+        start: Offset of the first byte to read.
+        length: Number of bytes to read. Less bytes are returned if the end of the file is reached.
+        needs_credentials: Tells if credentials are needed. Defaults to False.
+
+    Raises:
+        ClientError
+
+    Returns:
+        The bytes read.
+    """
+    if length <= 0:
+        return b""
+    bucket, key = parse_path(path)
+    needs_credentials = needs_credentials or is_default_access_denied(path)
+    s3_client = get_s3_client(path if needs_credentials else None)
+
+    try:
+        s3_object = s3_client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{start + length - 1}")
+        data: bytes = s3_object["Body"].read()
+        return data
+    except s3_client.exceptions.ClientError as ce:
+        if not needs_credentials and ce.response["Error"]["Code"] == "AccessDenied":
+            get_log().debug("read_s3_needs_credentials", path=path)
+            set_default_access_denied(path)
+            record_retry()
+            return read_range(path, start, length, True)
+        if ce.response["Error"]["Code"] == "InvalidRange":
+            # The range starts after the end of the file
+            return b""
+        raise
+
+
+@instrumented("upload", path_argument=1)
+def upload_file(
+    source: str | BinaryIO,
+    destination: str,
+    content_type: str | None = None,
+    part_size: int = MULTIPART_PART_SIZE,
+    concurrency: int = MULTIPART_CONCURRENCY,
+    skip_unchanged: bool = False,
+) -> None:
+    """Upload a local file to a AWS S3 destination without loading it in memory.
+    Files larger than `part_size` are sent as a multipart upload with up to `concurrency` parts in flight.
+
+    Args:
+        source: A local path or a seekable binary file object positioned at the start of the content to upload.
+        destination: The AWS S3 path to the file to write.
+        content_type: A standard Media Type describing the format of the contents.
+        part_size: Size in bytes of each part. S3 requires at least 5MB. Defaults to `MULTIPART_PART_SIZE`.
+        concurrency: Maximum number of parts uploaded in parallel. Defaults to `MULTIPART_CONCURRENCY`.
+        skip_unchanged: Do not upload if `destination` already has the same multihash. Defaults to False.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            upload_file(file, destination, content_type, part_size, concurrency, skip_unchanged)
+        return
+
+    start_time = time_in_ms()
+    bucket, key = parse_path(destination)
+    s3_client = get_s3_client()
+
+    # S3 only accepts user metadata when the object (or the multipart upload) is created,
+    # so the multihash is computed by streaming the file once before sending it.
+    start_position = source.tell()
+    multihash = checksum.multihash_file_object(source)
+    size = source.tell() - start_position
+    source.seek(start_position)
+    if skip_unchanged and _is_unchanged(s3_client, destination, multihash):
+        _skip_write(destination, size)
+        return
+
+    extra_args: dict[str, Any] = {"Metadata": {"multihash": multihash}}
+    if content_type:
+        extra_args["ContentType"] = content_type
+
+    try:
+        if size <= part_size:
+            s3_client.put_object(Bucket=bucket, Key=key, Body=source, **extra_args)
+        else:
+            _upload_multipart(s3_client, source, bucket, key, extra_args, part_size, concurrency)
+        set_transferred_bytes(size)
+        get_log().debug("upload_s3_success", path=destination, size=size, duration=time_in_ms() - start_time)
+    except s3_client.exceptions.ClientError as ce:
+        get_log().error("upload_s3_error", path=destination, error=f"Unable to upload the file: {ce}")
+        raise ce
+
+
+def _upload_multipart(
+    s3_client: S3Client,
+    source: BinaryIO,
+    bucket: str,
+    key: str,
+    extra_args: dict[str, Any],
+    part_size: int,
+    concurrency: int,
+) -> None:
+    """Send a file object as a multipart upload, aborting the upload if any part fails.
+
+    Args:
+        s3_client: an `s3` client
+        source: a binary file object positioned at the start of the content to upload
+        bucket: the `s3` bucket
+        key: the object key
+        extra_args: `Metadata` and `ContentType` to set on the object
+        part_size: size in bytes of each part
+        concurrency: maximum number of parts held in memory and uploaded in parallel
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key, **extra_args)["UploadId"]
+    parts: list[CompletedPartTypeDef] = []
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight: set[Future[CompletedPartTypeDef]] = set()
+            part_number = 1
+            while chunk := source.read(part_size):
+                if len(in_flight) >= concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    parts.extend(future.result() for future in done)
+                in_flight.add(executor.submit(_upload_part, s3_client, bucket, key, upload_id, part_number, chunk))
+                part_number += 1
+            parts.extend(future.result() for future in futures.as_completed(in_flight))
+
+        s3_client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+        )
+    except BaseException:
+        get_log().warn("upload_s3_multipart_abort", path=f"s3://{bucket}/{key}", upload_id=upload_id)
+        s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+
+
+def _upload_part(
+    s3_client: S3Client, bucket: str, key: str, upload_id: str, part_number: int, body: bytes
+) -> CompletedPartTypeDef:
+    """Upload one part of a multipart upload.
+
+    Returns:
+        the part number and its `ETag`, needed to complete the upload
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    response = s3_client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body)
+    return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+
+@instrumented("read")
 def read(path: str, needs_credentials: bool = False) -> bytes:
     """Read a file on a AWS S3 bucket.
 
@@ -60,12 +257,10 @@ def read(path: str, needs_credentials: bool = False) -> bytes:
     """
     start_time = time_in_ms()
     bucket, key = parse_path(path)
-    s3_client: S3Client = client("s3")
+    needs_credentials = needs_credentials or is_default_access_denied(path)
+    s3_client = get_s3_client(path if needs_credentials else None)
 
     try:
-        if needs_credentials:
-            s3_client = get_session(path).client("s3")
-
         s3_object: GetObjectOutputTypeDef = s3_client.get_object(Bucket=bucket, Key=key)
         file: bytes = s3_object["Body"].read()
     except s3_client.exceptions.NoSuchBucket as nsb:
@@ -78,6 +273,8 @@ def read(path: str, needs_credentials: bool = False) -> bytes:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/guide/error-handling.html#parsing-error-responses-and-catching-exceptions-from-aws-services
         if not needs_credentials and ce.response["Error"]["Code"] == "AccessDenied":
             get_log().debug("read_s3_needs_credentials", path=path)
+            set_default_access_denied(path)
+            record_retry()
             return read(path, True)
         raise
 
@@ -85,6 +282,326 @@ def read(path: str, needs_credentials: bool = False) -> bytes:
     return file
 
 
+@instrumented("get_multihash")
+def get_multihash(path: str, needs_credentials: bool = False) -> str:
+    """Hash a file on a AWS S3 bucket, streaming it by chunks of `checksum.CHUNK_SIZE` instead of reading it in memory.
+
+    Args:
+        path: The AWS S3 path to the file to hash.
+        needs_credentials: Tells if credentials are needed. Defaults to False.
+
+    Raises:
+        ClientError
+
+    Returns:
+        the hexadecimal SHA-256 multihash of the file
+    """
+    bucket, key = parse_path(path)
+    needs_credentials = needs_credentials or is_default_access_denied(path)
+    s3_client = get_s3_client(path if needs_credentials else None)
+
+    try:
+        s3_object: GetObjectOutputTypeDef = s3_client.get_object(Bucket=bucket, Key=key)
+        return checksum.multihash_stream(s3_object["Body"].iter_chunks(checksum.CHUNK_SIZE))
+    except s3_client.exceptions.ClientError as ce:
+        if not needs_credentials and ce.response["Error"]["Code"] == "AccessDenied":
+            get_log().debug("read_s3_needs_credentials", path=path)
+            set_default_access_denied(path)
+            record_retry()
+            return get_multihash(path, True)
+        raise
+
+
+@instrumented("download")
+def download_file(
+    source: str,
+    destination: str,
+    needs_credentials: bool = False,
+    part_size: int = DOWNLOAD_PART_SIZE,
+    concurrency: int = DOWNLOAD_CONCURRENCY,
+) -> None:
+    """Download a file on a AWS S3 bucket to a local destination without loading it in memory.
+    Files larger than `part_size` are downloaded with parallel ranged GETs written straight into a preallocated
+    local file, which is then checked against the `multihash` metadata of the object if it has one.
+
+    Args:
+        source: The AWS S3 path to the file to download.
+        destination: The local path to the file to write.
+        needs_credentials: Tells if credentials are needed. Defaults to False.
+        part_size: Size in bytes of each ranged GET. Defaults to `DOWNLOAD_PART_SIZE`.
+        concurrency: Maximum number of ranged GETs in parallel. Defaults to `DOWNLOAD_CONCURRENCY`.
+
+    Raises:
+        ClientError
+        Exception: if the downloaded file does not match the `multihash` metadata of the object
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    start_time = time_in_ms()
+    bucket, key = parse_path(source)
+    needs_credentials = needs_credentials or is_default_access_denied(source)
+    s3_client = get_s3_client(source if needs_credentials else None)
+
+    try:
+        try:
+            s3_object: GetObjectOutputTypeDef = s3_client.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{part_size - 1}")
+        except s3_client.exceptions.ClientError as ce:
+            if ce.response["Error"]["Code"] != "InvalidRange":
+                raise
+            # Ranges can't be requested on empty objects
+            s3_object = s3_client.get_object(Bucket=bucket, Key=key)
+        size = _get_object_size(s3_object)
+        if directory := os.path.dirname(destination):
+            os.makedirs(directory, mode=0o777, exist_ok=True)
+        with open(destination, "wb") as file:
+            for chunk in s3_object["Body"].iter_chunks(checksum.CHUNK_SIZE):
+                file.write(chunk)
+            if size > file.tell():
+                os.posix_fallocate(file.fileno(), 0, size)
+                _download_parts(s3_client, source, s3_object["ETag"], file.fileno(), size, part_size, concurrency)
+    except s3_client.exceptions.NoSuchBucket as nsb:
+        get_log().error("s3_bucket_not_found", path=source, error=f"The specified bucket does not seem to exist: {nsb}")
+        raise
+    except s3_client.exceptions.NoSuchKey as nsk:
+        get_log().error("s3_key_not_found", path=source, error=f"The specified file does not seem to exist: {nsk}")
+        raise
+    except s3_client.exceptions.ClientError as ce:
+        if not needs_credentials and ce.response["Error"]["Code"] == "AccessDenied":
+            get_log().debug("read_s3_needs_credentials", path=source)
+            set_default_access_denied(source)
+            record_retry()
+            download_file(source, destination, True, part_size, concurrency)
+            return
+        raise
+
+    if size > part_size and "multihash" in s3_object["Metadata"]:
+        with open(destination, "rb") as file:
+            multihash = checksum.multihash_file_object(file)
+        if multihash != s3_object["Metadata"]["multihash"]:
+            get_log().error(
+                "download_s3_multihash_mismatch", path=source, expected=s3_object["Metadata"]["multihash"], actual=multihash
+            )
+            os.remove(destination)
+            raise Exception(f"The downloaded file does not match the multihash of {source}")
+
+    set_transferred_bytes(size)
+    get_log().debug("download_s3_success", path=source, size=size, duration=time_in_ms() - start_time)
+
+
+def _get_object_size(s3_object: GetObjectOutputTypeDef) -> int:
+    """Get the size of a whole object from a `get_object` response, ranged or not."""
+    if "ContentRange" in s3_object:
+        # "bytes 0-1023/4096"
+        return int(s3_object["ContentRange"].rsplit("/", 1)[1])
+    return s3_object["ContentLength"]
+
+
+def _download_parts(s3_client: S3Client, source: str, etag: str, fd: int, size: int, part_size: int, concurrency: int) -> None:
+    """Download the parts of an object after its first part, in parallel, to a local file of `size` bytes.
+    The parts are requested with `IfMatch` so that an object replaced during the download is not mixed with the previous one.
+
+    Args:
+        s3_client: an `s3` client
+        source: the AWS S3 path of the object
+        etag: the `ETag` of the object when its first part was read
+        fd: the file descriptor of the local file to write the parts to
+        size: the size of the object
+        part_size: size in bytes of each part
+        concurrency: maximum number of parts downloaded in parallel
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        parts = [
+            executor.submit(_download_part, s3_client, source, etag, fd, start, min(start + part_size, size) - 1)
+            for start in range(part_size, size, part_size)
+        ]
+        for future in futures.as_completed(parts):
+            future.result()
+
+
+def _download_part(s3_client: S3Client, source: str, etag: str, fd: int, start: int, end: int) -> None:
+    """Download the bytes `start` to `end` (included) of an object to the same offsets of a local file."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    bucket, key = parse_path(source)
+    s3_object = s3_client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag)
+    offset = start
+    for chunk in s3_object["Body"].iter_chunks(checksum.CHUNK_SIZE):
+        view = memoryview(chunk)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            offset += written
+            view = view[written:]
+
+
+@instrumented("copy")
+def copy(
+    source: str,
+    destination: str,
+    needs_credentials: bool = False,
+    max_size: int = COPY_MAX_SIZE,
+    part_size: int = COPY_PART_SIZE,
+    skip_unchanged: bool = False,
+) -> None:
+    """Copy a AWS S3 object to another AWS S3 path server-side, without transferring it through this process.
+    The `multihash` metadata is carried over, or computed by streaming the source if it is missing.
+
+    Args:
+        source: The AWS S3 path to the file to copy.
+        destination: The AWS S3 path to the copy to create.
+        needs_credentials: Tells if credentials are needed. Defaults to False.
+        max_size: Objects larger than this are copied by parts. Defaults to `COPY_MAX_SIZE`.
+        part_size: Size in bytes of each part copied. Defaults to `COPY_PART_SIZE`.
+        skip_unchanged: Do not copy if `source` has a multihash and `destination` already has the same one.
+            Defaults to False.
+
+    Raises:
+        ClientError: with a "AccessDenied" error code if the same credentials can't read `source` and write `destination`
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    start_time = time_in_ms()
+    source_bucket, source_key = parse_path(source)
+    bucket, key = parse_path(destination)
+    needs_credentials = needs_credentials or is_default_access_denied(source)
+    s3_client = get_s3_client(source if needs_credentials else None)
+
+    try:
+        source_head = s3_client.head_object(Bucket=source_bucket, Key=source_key)
+    except s3_client.exceptions.ClientError as ce:
+        if not needs_credentials and ce.response["Error"]["Code"] == "AccessDenied":
+            get_log().debug("read_s3_needs_credentials", path=source)
+            set_default_access_denied(source)
+            record_retry()
+            copy(source, destination, True, max_size, part_size, skip_unchanged)
+            return
+        raise
+
+    # A denied write of `destination` is raised as is: the credentials of `source` can't be used for it
+    copy_source: CopySourceTypeDef = {"Bucket": source_bucket, "Key": source_key}
+    metadata = source_head["Metadata"]
+    if skip_unchanged and "multihash" in metadata and _is_unchanged(s3_client, destination, metadata["multihash"]):
+        _skip_write(destination, source_head["ContentLength"])
+        return
+    if "multihash" in metadata and source_head["ContentLength"] <= max_size:
+        s3_client.copy_object(CopySource=copy_source, Bucket=bucket, Key=key, MetadataDirective="COPY")
+    else:
+        if "multihash" not in metadata:
+            get_log().debug("copy_s3_compute_multihash", path=source)
+            source_object = s3_client.get_object(Bucket=source_bucket, Key=source_key)
+            metadata = {**metadata, "multihash": checksum.multihash_file_object(source_object["Body"])}
+        if source_head["ContentLength"] <= max_size:
+            s3_client.copy_object(
+                CopySource=copy_source,
+                Bucket=bucket,
+                Key=key,
+                Metadata=metadata,
+                MetadataDirective="REPLACE",
+                ContentType=source_head["ContentType"],
+            )
+        else:
+            _copy_multipart(
+                s3_client,
+                copy_source,
+                source_head["ContentLength"],
+                bucket,
+                key,
+                metadata,
+                source_head["ContentType"],
+                part_size,
+            )
+
+    set_transferred_bytes(source_head["ContentLength"])
+    get_log().debug("copy_s3_success", path=source, destination=destination, duration=time_in_ms() - start_time)
+
+
+class SkippedWrites:  # pylint: disable=too-few-public-methods
+    """Thread-safe tally of the writes skipped because their destination already had the same content."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.size = 0
+        self._lock = Lock()
+
+    def add(self, size: int) -> None:
+        with self._lock:
+            self.count += 1
+            self.size += size
+
+
+skipped_writes = SkippedWrites()
+"""Writes skipped by `skip_unchanged` since the start of the process"""
+
+
+def _is_unchanged(s3_client: S3Client, destination: str, multihash: str) -> bool:
+    """Check if a AWS S3 object exists and has the `multihash` metadata `multihash`."""
+    bucket, key = parse_path(destination)
+    try:
+        return s3_client.head_object(Bucket=bucket, Key=key)["Metadata"].get("multihash") == multihash
+    except s3_client.exceptions.ClientError:
+        # Not found, or not readable: the write decides
+        return False
+
+
+def _skip_write(destination: str, size: int) -> None:
+    skipped_writes.add(size)
+    get_log().info("write_s3_skipped_unchanged", path=destination, size=size)
+
+
+def _copy_multipart(
+    s3_client: S3Client,
+    copy_source: CopySourceTypeDef,
+    size: int,
+    bucket: str,
+    key: str,
+    metadata: dict[str, str],
+    content_type: str,
+    part_size: int,
+) -> None:
+    """Copy an object server-side by parts of `part_size`, aborting the upload if any part fails."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key, Metadata=metadata, ContentType=content_type)[
+        "UploadId"
+    ]
+    try:
+        byte_ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+        with ThreadPoolExecutor(max_workers=MULTIPART_CONCURRENCY) as executor:
+            part_futures = [
+                executor.submit(_copy_part, s3_client, copy_source, bucket, key, upload_id, part_number, byte_range)
+                for part_number, byte_range in enumerate(byte_ranges, start=1)
+            ]
+            parts = [future.result() for future in part_futures]
+        s3_client.complete_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts})
+    except BaseException:
+        get_log().warn("copy_s3_multipart_abort", path=f"s3://{bucket}/{key}", upload_id=upload_id)
+        s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+
+
+def _copy_part(
+    s3_client: S3Client,
+    copy_source: CopySourceTypeDef,
+    bucket: str,
+    key: str,
+    upload_id: str,
+    part_number: int,
+    byte_range: tuple[int, int],
+) -> CompletedPartTypeDef:
+    """Copy a byte range of an object as one part of a multipart upload.
+
+    Returns:
+        the part number and its `ETag`, needed to complete the upload
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    response = s3_client.upload_part_copy(
+        Bucket=bucket,
+        Key=key,
+        UploadId=upload_id,
+        PartNumber=part_number,
+        CopySource=copy_source,
+        CopySourceRange=f"bytes={byte_range[0]}-{byte_range[1]}",
+    )
+    return {"PartNumber": part_number, "ETag": response["CopyPartResult"]["ETag"]}
+
+
+@instrumented("exists")
 def exists(path: str, needs_credentials: bool = False) -> bool:
     """Check if s3 Object exists
 
@@ -100,12 +617,10 @@ def exists(path: str, needs_credentials: bool = False) -> bool:
         True if the S3 Object exists
     """
     bucket, key = parse_path(path)
-    s3_client: S3Client = client("s3")
+    needs_credentials = needs_credentials or is_default_access_denied(path)
+    s3_client = get_s3_client(path if needs_credentials else None)
 
     try:
-        if needs_credentials:
-            s3_client = get_session(path).client("s3")
-
         if path.endswith("/"):
             # MaxKeys limits to 1 object in the response
             objects = s3_client.list_objects_v2(Bucket=bucket, Prefix=key, MaxKeys=1)
@@ -122,6 +637,8 @@ def exists(path: str, needs_credentials: bool = False) -> bool:
     except s3_client.exceptions.ClientError as ce:
         if not needs_credentials and ce.response["Error"]["Code"] == "AccessDenied":
             get_log().debug("read_s3_needs_credentials", path=path)
+            set_default_access_denied(path)
+            record_retry()
             return exists(path, True)
         # https://boto3.amazonaws.com/v1/documentation/api/latest/guide/error-handling.html#parsing-error-responses-and-catching-exceptions-from-aws-services
         # 404 for NoSuchKey - https://github.com/boto/boto3/issues/2442
@@ -132,6 +649,71 @@ def exists(path: str, needs_credentials: bool = False) -> bool:
         raise
 
 
+@instrumented("list")
+def list_directory(path: str, needs_credentials: bool = False) -> list[ObjectTypeDef]:
+    """List the objects directly in a AWS S3 "directory", excluding its sub-directories, with paginated `list_objects_v2`.
+
+    Args:
+        path: path to the s3 "directory"
+        needs_credentials: if acces to object needs credentials. Defaults to False.
+
+    Raises:
+        s3_client.exceptions.ClientError: with a "AccessDenied" error code if listing the directory is denied
+
+    Returns:
+        the objects in the directory, empty if the bucket does not exist
+    """
+    bucket, key = parse_path(path)
+    prefix = f"{key}/" if key else ""
+    needs_credentials = needs_credentials or is_default_access_denied(path)
+    s3_client = get_s3_client(path if needs_credentials else None)
+
+    objects: list[ObjectTypeDef] = []
+    try:
+        for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix, Delimiter="/"):
+            objects.extend(page.get("Contents", []))
+    except s3_client.exceptions.NoSuchBucket as nsb:
+        get_log().debug("s3_bucket_not_found", path=path, info=f"The specified bucket does not seem to exist: {nsb}")
+        return []
+    except s3_client.exceptions.ClientError as ce:
+        # `s3:ListBucket` can be denied where the objects can be read: the bucket is not marked as denied
+        if not needs_credentials and ce.response["Error"]["Code"] == "AccessDenied" and has_role(path):
+            get_log().debug("list_s3_needs_credentials", path=path)
+            record_retry()
+            return list_directory(path, True)
+        raise
+    return objects
+
+
+@instrumented("head")
+def head(path: str, needs_credentials: bool = False) -> HeadObjectOutputTypeDef:
+    """Get the attributes (size, `ETag`, metadata) of a s3 Object without reading it.
+
+    Args:
+        path: path to the s3 object/key
+        needs_credentials: if access to object needs credentials. Defaults to False.
+
+    Raises:
+        s3_client.exceptions.ClientError: with a "404" error code if the object does not exist
+
+    Returns:
+        the `head_object` response
+    """
+    bucket, key = parse_path(path)
+    needs_credentials = needs_credentials or is_default_access_denied(path)
+    s3_client = get_s3_client(path if needs_credentials else None)
+
+    try:
+        return s3_client.head_object(Bucket=bucket, Key=key)
+    except s3_client.exceptions.ClientError as ce:
+        if not needs_credentials and ce.response["Error"]["Code"] == "AccessDenied":
+            get_log().debug("read_s3_needs_credentials", path=path)
+            set_default_access_denied(path)
+            record_retry()
+            return head(path, True)
+        raise
+
+
 def bucket_name_from_path(path: str) -> str:
     """Get the bucket name from an `s3` path.
 
@@ -177,19 +759,97 @@ def list_files_in_uri(uri: str, suffixes: list[str], s3_client: S3Client | None)
     Returns:
         a list of file paths
     """
-    s3_client = s3_client or client("s3")
-    files = []
+    return [key for page in iter_files_in_uri(uri, suffixes, s3_client) for keys in page.values() for key in keys]
+
+
+def iter_files_in_uri(
+    uri: str, suffixes: list[str], s3_client: S3Client | None = None, concurrency: int = 1
+) -> Generator[dict[str, list[str]], None, None]:
+    """List the file paths from a s3 path based on their suffixes, yielding them as the listing pages arrive.
+
+    With a `concurrency` greater than 1, the "sub-directories" of `uri` are discovered first,
+    then listed in parallel. The pages are then yielded in the order they arrive.
+
+    Args:
+        uri: an s3 path
+        suffixes: a list of suffixes. example: [".json", "_meta.xml"]
+        s3_client: an s3 client. Defaults to None.
+        concurrency: number of "sub-directories" listed in parallel. Defaults to 1.
+
+    Yields:
+        the file paths of each page, by suffix
+    """
+    s3_client = s3_client or get_s3_client()
+    bucket = bucket_name_from_path(uri)
+    prefix = prefix_from_path(uri)
+    number_of_files = 0
+    sub_prefixes: list[str] = []
     paginator = s3_client.get_paginator("list_objects_v2")
-    response_iterator = paginator.paginate(Bucket=bucket_name_from_path(uri), Prefix=prefix_from_path(uri))
-
-    for response in response_iterator:
-        for contents_data in response["Contents"]:
-            key = contents_data["Key"]
-            if not key.lower().endswith(tuple(suffixes)):
-                get_log().trace("skipping file not json", file=key, action="collection_from_items", reason="skip")
-                continue
-            files.append(key)
-    get_log().info("Files Listed", number_of_files=len(files))
+    if concurrency > 1:
+        pages = paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter="/")
+    else:
+        pages = paginator.paginate(Bucket=bucket, Prefix=prefix)
+    for page in measure_pages("list", uri, pages):
+        sub_prefixes.extend(common_prefix["Prefix"] for common_prefix in page.get("CommonPrefixes", []))
+        files = _group_by_suffix(page, suffixes)
+        number_of_files += sum(len(keys) for keys in files.values())
+        yield files
+    for files in _iter_files_in_prefixes(bucket, sub_prefixes, suffixes, s3_client, concurrency):
+        number_of_files += sum(len(keys) for keys in files.values())
+        yield files
+    get_log().info("Files Listed", number_of_files=number_of_files, sub_prefixes=len(sub_prefixes))
+
+
+def _iter_files_in_prefixes(
+    bucket: str, prefixes: list[str], suffixes: list[str], s3_client: S3Client, concurrency: int
+) -> Generator[dict[str, list[str]], None, None]:
+    """List `prefixes` in parallel, yielding the file paths of each page as it arrives (see `iter_files_in_uri`)."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    pages: Queue[dict[str, list[str]] | BaseException | None] = Queue()
+    stop = Event()
+
+    def list_prefix(prefix: str) -> None:
+        try:
+            prefix_pages = s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix)
+            for page in measure_pages("list", f"s3://{bucket}/{prefix}", prefix_pages):
+                if stop.is_set():
+                    return
+                pages.put(_group_by_suffix(page, suffixes))
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            pages.put(error)
+        finally:
+            pages.put(None)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for prefix in prefixes:
+            executor.submit(list_prefix, prefix)
+        try:
+            running = len(prefixes)
+            while running:
+                files = pages.get()
+                if files is None:
+                    running -= 1
+                elif isinstance(files, BaseException):
+                    raise files
+                else:
+                    yield files
+        finally:
+            # Stop the listings in flight if the consumer stops early or a listing failed
+            stop.set()
+
+
+def _group_by_suffix(page: ListObjectsV2OutputTypeDef, suffixes: list[str]) -> dict[str, list[str]]:
+    """Group the keys of a listing page by suffix, skipping the keys that have none of `suffixes`.
+    A page of an empty prefix has no `Contents`.
+    """
+    files: dict[str, list[str]] = {}
+    for contents_data in page.get("Contents", []):
+        key = contents_data["Key"]
+        suffix = next((suffix for suffix in suffixes if key.lower().endswith(suffix)), None)
+        if suffix is None:
+            get_log().trace("skipping file not json", file=key, action="collection_from_items", reason="skip")
+            continue
+        files.setdefault(suffix, []).append(key)
     return files
 
 
@@ -209,22 +869,28 @@ def _get_object(bucket: str, file_name: str, s3_client: S3Client) -> GetObjectOu
 
 
 def get_object_parallel_multithreading(
-    bucket: str, files_to_read: list[str], s3_client: S3Client | None, concurrency: int
+    bucket: str,
+    files_to_read: list[str],
+    s3_client: S3Client | None,
+    concurrency: int,
 ) -> Generator[Any, Any | BaseException, None]:
-    """Get s3 objects in parallel
+    """Get s3 objects in parallel. The number of concurrent calls adapts to throttling (see `AdaptiveConcurrency`).
 
     Args:
         bucket: a `s3` bucket
         files_to_read: list of object names to get
         s3_client: an `s3` client
-        concurrency: number of concurrent calls
+        concurrency: maximum number of concurrent calls
 
     Yields:
         the object when got
     """
-    s3_client = s3_client or client("s3")
+    s3_client = s3_client or get_s3_client()
+    adaptive_concurrency = get_adaptive_concurrency()
     with ThreadPoolExecutor(max_workers=concurrency) as executor:
-        future_to_key = {executor.submit(_get_object, bucket, key, s3_client): key for key in files_to_read}
+        future_to_key = {
+            executor.submit(adaptive_concurrency.call, _get_object, bucket, key, s3_client): key for key in files_to_read
+        }
 
         for future in futures.as_completed(future_to_key):
             key = future_to_key[future]
@@ -0,0 +1,108 @@
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from functools import partial
+from threading import Lock
+from types import TracebackType
+from typing import ParamSpec, TypeVar
+
+from linz_logger import get_log
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class HedgedRequests:  # pylint: disable=too-many-instance-attributes
+    """Cut the tail latency of many small requests by sending a duplicate ("hedge") of the slow ones.
+
+    A request that has not returned after the `percentile` of the durations of the last completed requests
+    is sent again, and the first response is used. Hedges are only sent after `min_samples` requests completed,
+    and while they are less than `budget` times the number of requests.
+    The requests run in a thread pool of `max_workers` owned by this object, which must be closed after use.
+    """
+
+    def __init__(self, percentile: float = 0.95, budget: float = 0.05, min_samples: int = 20, max_workers: int = 64) -> None:
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self) -> "HedgedRequests":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the thread pool without waiting for the requests that lost their race."""
+        self._executor.shutdown(wait=False)
+        get_log().info("hedged_requests", requests=self.requests, hedgesSent=self.hedges_sent, hedgesWon=self.hedges_won)
+
+    def get_hedge_delay(self) -> float | None:
+        """Get the duration after which a request is hedged.
+
+        Returns:
+            the `percentile` of the last request durations, in seconds, or None if not enough requests completed yet
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(self.percentile * len(latencies)))]
+
+    def call(self, function: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Call `function`, calling it again in parallel if it is slower than the hedge delay.
+        `function` must be safe to call twice, like a GET request.
+
+        Args:
+            function: the request to run
+            args: the arguments of `function`
+            kwargs: the keyword arguments of `function`
+
+        Returns:
+            the result of the first call of `function` to succeed
+        """
+        with self._lock:
+            self.requests += 1
+        request_function = partial(function, *args, **kwargs)
+        requests = [self._executor.submit(_timed, request_function)]
+
+        delay = self.get_hedge_delay()
+        if delay is not None and not wait(requests, timeout=delay).done and self._spend_budget():
+            get_log().trace("hedged_request_sent", delay=delay)
+            requests.append(self._executor.submit(_timed, request_function))
+
+        errors: list[BaseException] = []
+        for request in as_completed(requests):
+            if (error := request.exception()) is not None:
+                errors.append(error)
+                continue
+            result, latency = request.result()
+            with self._lock:
+                self._latencies.append(latency)
+                if request is not requests[0]:
+                    self.hedges_won += 1
+            return result
+        raise errors[0]
+
+    def _spend_budget(self) -> bool:
+        with self._lock:
+            if self.hedges_sent >= self.budget * self.requests:
+                return False
+            self.hedges_sent += 1
+            return True
+
+
+def _timed(function: Callable[[], T]) -> tuple[T, float]:
+    """Call `function` and measure its duration."""
+    start_time = time.monotonic()
+    result = function()
+    return result, time.monotonic() - start_time
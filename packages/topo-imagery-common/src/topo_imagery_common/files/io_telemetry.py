@@ -0,0 +1,344 @@
+import os
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from os import environ
+from threading import Lock
+from typing import Any, ParamSpec, TypeVar
+
+from topo_imagery_common.aws.aws_helper import is_s3, parse_path
+from topo_imagery_common.files.adaptive_concurrency import is_throttling_error
+
+P = ParamSpec("P")
+T = TypeVar("T")
+A = TypeVar("A")
+
+IO_TELEMETRY_SUMMARY = environ.get("IO_TELEMETRY_SUMMARY", "true").lower() == "true"
+"""Write the I/O telemetry summary of a run next to its outputs. Defaults to True. If False, the summary is only logged."""
+IO_TELEMETRY_FILE_NAME = "io-telemetry.json"
+LATENCY_BUCKETS_MS = [2 ** (i / 4) for i in range(100)]
+"""Upper bounds of the latency histogram buckets, 4 per power of 2 from 1ms, so that the percentiles are within 19%.
+The buckets are fixed so that histograms of different processes can be added."""
+
+
+@dataclass
+class OperationStats:  # pylint: disable=too-many-instance-attributes
+    """Counters and latency histogram of an operation type on a bucket."""
+
+    ops: int = 0
+    bytes: int = 0
+    errors: int = 0
+    throttled: int = 0
+    retries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    latency_histogram: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def add(self, other: "OperationStats") -> None:
+        """Add the counters and histogram of `other` to these.
+
+        Args:
+            other: the stats to add
+        """
+        self.ops += other.ops
+        self.bytes += other.bytes
+        self.errors += other.errors
+        self.throttled += other.throttled
+        self.retries += other.retries
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.latency_histogram = [
+            count + other_count for count, other_count in zip(self.latency_histogram, other.latency_histogram)
+        ]
+
+    def percentile(self, quantile: float) -> float:
+        """Estimate a latency percentile from the histogram.
+
+        Args:
+            quantile: the quantile, between 0 and 1
+
+        Returns:
+            the upper bound of the histogram bucket of the percentile, in milliseconds, capped to the maximum latency
+
+        Example:
+            >>> stats = OperationStats()
+            >>> for latency in [10, 10, 10, 100]:
+            ...     stats.add_latency(latency)
+            >>> round(stats.percentile(0.5))
+            11
+            >>> round(stats.percentile(0.99))
+            100
+        """
+        total = sum(self.latency_histogram)
+        if total == 0:
+            return 0.0
+        cumulated = 0
+        for index, count in enumerate(self.latency_histogram):
+            cumulated += count
+            if cumulated >= quantile * total:
+                return min(LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms, self.max_ms)
+        return self.max_ms
+
+    def add_latency(self, latency_ms: float) -> None:
+        """Add an operation duration to the histogram.
+
+        Args:
+            latency_ms: the duration of the operation in milliseconds
+        """
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        index = next((index for index, bound in enumerate(LATENCY_BUCKETS_MS) if latency_ms <= bound), len(LATENCY_BUCKETS_MS))
+        self.latency_histogram[index] += 1
+
+    def to_summary(self) -> dict[str, Any]:
+        """Get the counters and the p50/p95/p99 latencies, without the histogram.
+
+        Returns:
+            the summary of the stats
+        """
+        return {
+            "ops": self.ops,
+            "bytes": self.bytes,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "totalMs": round(self.total_ms, 3),
+            "p50Ms": round(self.percentile(0.5), 3),
+            "p95Ms": round(self.percentile(0.95), 3),
+            "p99Ms": round(self.percentile(0.99), 3),
+            "maxMs": round(self.max_ms, 3),
+        }
+
+
+class IoTelemetry:
+    """Thread-safe `OperationStats` of a process, by operation type and bucket."""
+
+    def __init__(self) -> None:
+        self._stats: dict[tuple[str, str], OperationStats] = {}
+        self._lock = Lock()
+
+    def record(
+        self,
+        operation: str,
+        bucket: str,
+        latency_ms: float,
+        size: int = 0,
+        retries: int = 0,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record a completed operation.
+
+        Args:
+            operation: the operation type, like "read"
+            bucket: the bucket of the operation
+            latency_ms: the duration of the operation in milliseconds
+            size: the number of bytes transferred. Defaults to 0.
+            retries: the number of times the operation has been retried. Defaults to 0.
+            error: the error raised by the operation, if it failed. Defaults to None.
+        """
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        with self._lock:
+            stats = self._stats.setdefault((operation, bucket), OperationStats())
+            stats.ops += 1
+            stats.bytes += size
+            stats.retries += retries
+            stats.add_latency(latency_ms)
+            if error is not None:
+                stats.errors += 1
+                if is_throttling_error(error):
+                    stats.throttled += 1
+
+    def take(self) -> dict[tuple[str, str], OperationStats]:
+        """Get the stats recorded so far and reset them, to send them to another process.
+
+        Returns:
+            the stats by operation type and bucket
+        """
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        return stats
+
+    def merge(self, stats: dict[tuple[str, str], OperationStats]) -> None:
+        """Add stats taken from another process (see `take`).
+
+        Args:
+            stats: the stats by operation type and bucket
+        """
+        with self._lock:
+            for key, operation_stats in stats.items():
+                self._stats.setdefault(key, OperationStats()).add(operation_stats)
+
+    def summary(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Get the summary of the stats by operation type and bucket (see `OperationStats.to_summary`).
+
+        Returns:
+            the summaries by operation type, then by bucket
+        """
+        summary: dict[str, dict[str, dict[str, Any]]] = {}
+        with self._lock:
+            for (operation, bucket), stats in sorted(self._stats.items()):
+                summary.setdefault(operation, {})[bucket] = stats.to_summary()
+        return summary
+
+
+@dataclass
+class _Measurement:
+    operation: str
+    bucket: str
+    size: int = 0
+    retries: int = 0
+    recorded: bool = True
+
+
+_io_telemetry = IoTelemetry()
+_active = threading.local()
+
+
+def get_io_telemetry() -> IoTelemetry:
+    """Get the telemetry of the process.
+
+    Returns:
+        the `IoTelemetry` of the process
+    """
+    return _io_telemetry
+
+
+@contextmanager
+def measure(operation: str, path: str) -> Generator[_Measurement | None, None, None]:
+    """Record the duration, size and error of an operation on `path`.
+    Nested operations, like the `head` of a `copy` or a retry with other credentials, are part of the outer operation.
+
+    Args:
+        operation: the operation type, like "read"
+        path: the path of the file or directory of the operation
+
+    Yields:
+        the measurement, None if the operation is part of an outer operation
+    """
+    measurements = _get_measurements()
+    if measurements:
+        yield None
+        return
+    measurement = _Measurement(operation, parse_path(path).bucket if is_s3(path) else "local")
+    measurements.append(measurement)
+    start_time = time.perf_counter()
+    error: BaseException | None = None
+    try:
+        yield measurement
+    except BaseException as raised:
+        error = raised
+        raise
+    finally:
+        measurements.pop()
+        if measurement.recorded:
+            _io_telemetry.record(
+                measurement.operation,
+                measurement.bucket,
+                (time.perf_counter() - start_time) * 1000,
+                measurement.size,
+                measurement.retries,
+                error,
+            )
+
+
+def set_transferred_bytes(size: int) -> None:
+    """Set the number of bytes transferred by the operation being measured in this thread, if any.
+
+    Args:
+        size: the number of bytes
+    """
+    measurements = _get_measurements()
+    if measurements:
+        measurements[-1].size = size
+
+
+def record_retry() -> None:
+    """Count a retry of the operation being measured in this thread, if any, like a retry with other credentials."""
+    measurements = _get_measurements()
+    if measurements:
+        measurements[-1].retries += 1
+
+
+def instrumented(operation: str, path_argument: int = 0) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Decorate a function to `measure` it as an `operation` on the path given as one of its positional arguments.
+    The size of `bytes` results is recorded as transferred bytes.
+
+    Args:
+        operation: the operation type
+        path_argument: the position of the path argument. Defaults to 0.
+
+    Returns:
+        the decorator
+    """
+
+    def decorator(function: Callable[P, T]) -> Callable[P, T]:
+        @wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with measure(operation, str(args[path_argument]) if len(args) > path_argument else ""):
+                result = function(*args, **kwargs)
+                if isinstance(result, bytes):
+                    set_transferred_bytes(len(result))
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def call_with_telemetry(function: Callable[[A], T], argument: A) -> tuple[T, dict[tuple[str, str], OperationStats]]:
+    """Call `function` in a worker process, returning the telemetry it recorded with its result
+    so that the parent process can `merge` it. The telemetry of the worker is reset.
+
+    Args:
+        function: the function to call
+        argument: the argument of `function`
+
+    Returns:
+        the result of `function` and the telemetry recorded while it ran
+    """
+    result = function(argument)
+    return result, _io_telemetry.take()
+
+
+def measure_pages(operation: str, path: str, pages: Iterable[T]) -> Generator[T, None, None]:
+    """Measure the request of each page of a paginated listing as an `operation`.
+    Reaching the end of the listing is not measured, as there is no request after the last page.
+
+    Args:
+        operation: the operation type
+        path: the path listed
+        pages: the pages, requested as they are iterated
+
+    Yields:
+        the pages
+    """
+    iterator = iter(pages)
+    while True:
+        with measure(operation, path) as measurement:
+            page = next(iterator, None)
+            if page is None and measurement:
+                measurement.recorded = False
+        if page is None:
+            return
+        yield page
+
+
+def _get_measurements() -> list[_Measurement]:
+    """Get the operations being measured in this thread."""
+    if not hasattr(_active, "measurements"):
+        _active.measurements = []
+    measurements: list[_Measurement] = _active.measurements
+    return measurements
+
+
+def _reset_after_fork() -> None:
+    """Start a child process with empty stats, so that they are not counted twice when merged in the parent."""
+    global _io_telemetry, _active  # pylint: disable=global-statement
+    _io_telemetry = IoTelemetry()
+    _active = threading.local()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,122 @@
+import os
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from botocore.exceptions import ClientError
+from linz_logger import get_log
+from topo_imagery_common.aws.aws_helper import is_s3, parse_path
+from topo_imagery_common.files import fs, fs_s3
+from topo_imagery_common.log.time_helper import time_in_ms
+
+
+class FileInfo(NamedTuple):
+    size: int
+    etag: str | None
+    """`ETag` of the S3 object, None for local files"""
+
+
+class PrefixIndex:
+    """In-memory index of the files directly in a set of directories (S3 prefixes or local directories),
+    listed once with paginated `list_objects_v2` calls, or `os.scandir` for local directories.
+
+    Answers `exists`, size and `ETag` lookups without a request per file. Files outside of the indexed directories
+    are looked up on the file system, as well as the files of the directories which can't be listed
+    (like S3 prefixes without `s3:ListBucket` permission). Files created after the listing are not known
+    until `refresh()` is called.
+    """
+
+    def __init__(self, directories: Iterable[str]) -> None:
+        self.requested_directories = {_normalise_directory(directory) for directory in directories}
+        self.directories: set[str] = set()
+        self.files: dict[str, FileInfo] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """List the indexed directories again."""
+        start_time = time_in_ms()
+        directories: set[str] = set()
+        files: dict[str, FileInfo] = {}
+        for directory in self.requested_directories:
+            if is_s3(directory):
+                bucket, _ = parse_path(directory)
+                try:
+                    s3_objects = fs_s3.list_directory(directory)
+                except ClientError as ce:
+                    if ce.response["Error"]["Code"] != "AccessDenied":
+                        raise
+                    get_log().info("prefix_index_list_denied", directory=directory)
+                    continue
+                for s3_object in s3_objects:
+                    files[f"s3://{bucket}/{s3_object['Key']}"] = FileInfo(s3_object["Size"], s3_object["ETag"])
+            else:
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                files[_normalise(entry.path)] = FileInfo(entry.stat().st_size, None)
+                except FileNotFoundError:
+                    pass
+            directories.add(directory)
+        self.directories = directories
+        self.files = files
+        get_log().debug(
+            "prefix_index_listed", directories=len(self.directories), files=len(files), duration=time_in_ms() - start_time
+        )
+
+    def covers(self, path: str) -> bool:
+        """Check if a file is in one of the indexed directories.
+
+        Args:
+            path: a path to a file
+
+        Returns:
+            True if the index knows if the file exists
+        """
+        return _get_directory(path) in self.directories
+
+    def get(self, path: str) -> FileInfo | None:
+        """Get the size and `ETag` of a file.
+
+        Args:
+            path: a path to a file in one of the indexed directories
+
+        Raises:
+            ValueError: if `path` is not in one of the indexed directories
+
+        Returns:
+            the file info, or None if the file does not exist
+        """
+        if not self.covers(path):
+            raise ValueError(f"{path} is not in an indexed directory")
+        return self.files.get(_normalise(path))
+
+    def exists(self, path: str) -> bool:
+        """Check if a file exists, from the index if it is in one of the indexed directories.
+
+        Args:
+            path: a path to a file
+
+        Returns:
+            True if the file exists
+        """
+        if not self.covers(path):
+            return fs.exists(path)
+        return _normalise(path) in self.files
+
+
+def _normalise(path: str) -> str:
+    if is_s3(path):
+        bucket, key = parse_path(path)
+        return f"s3://{bucket}/{key}"
+    return os.path.abspath(path)
+
+
+def _normalise_directory(path: str) -> str:
+    if is_s3(path):
+        bucket, key = parse_path(path)
+        return f"s3://{bucket}/{key}" if key else f"s3://{bucket}"
+    return os.path.abspath(path)
+
+
+def _get_directory(path: str) -> str:
+    return os.path.dirname(_normalise(path))
@@ -0,0 +1,125 @@
+import io
+from collections import OrderedDict
+from collections.abc import Buffer, Callable
+
+BLOCK_SIZE = 64 * 1024  # 64KB
+"""Size of the blocks read and cached by `RangeReader`"""
+READAHEAD_BLOCKS = 4
+"""Number of blocks read after the requested ones, anticipating sequential reads"""
+MAX_BLOCKS = 64
+"""Number of blocks kept in the cache of a `RangeReader`"""
+
+
+class RangeReader(io.RawIOBase):
+    """Read-only, seekable file object over a `read_range(start, length)` function, like ranged GETs on S3.
+
+    Data is read by blocks of `block_size`. Consecutive missing blocks are fetched with a single call, extended by
+    `readahead` blocks, and the `max_blocks` most recently used blocks are cached, so that parsers doing many small
+    reads (`tifffile.TiffFile`, JSON or LAS header parsers) only trigger a few requests.
+    """
+
+    def __init__(
+        self,
+        read_range: Callable[[int, int], bytes],
+        size: int,
+        block_size: int = BLOCK_SIZE,
+        readahead: int = READAHEAD_BLOCKS,
+        max_blocks: int = MAX_BLOCKS,
+    ) -> None:
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        super().__init__()
+        self._read_range = read_range
+        self.size = size
+        self.block_size = block_size
+        self.readahead = readahead
+        self.max_blocks = max_blocks
+        self._blocks: OrderedDict[int, bytes] = OrderedDict()
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer: Buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        length = min(len(view), self.size - self._position)
+        if length <= 0:
+            return 0
+        data = self.read_at(self._position, length)
+        view[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def read_at(self, start: int, length: int) -> bytes:
+        """Read `length` bytes from `start`, through the block cache. Does not move the position of the file.
+
+        Args:
+            start: offset of the first byte to read
+            length: number of bytes to read
+
+        Returns:
+            the bytes read
+        """
+        first_block = start // self.block_size
+        last_block = (start + length - 1) // self.block_size
+        if last_block - first_block + 1 > self.max_blocks:
+            # Too large for the cache: read it directly
+            return self._read_range(start, length)
+
+        # The blocks are taken before the fetch evicts any, and the readahead is capped so that the blocks read
+        # fit in the cache with the requested ones
+        blocks = {block: self._blocks[block] for block in range(first_block, last_block + 1) if block in self._blocks}
+        missing_blocks = [block for block in range(first_block, last_block + 1) if block not in blocks]
+        if missing_blocks:
+            readahead = min(self.readahead, self.max_blocks - (last_block - first_block + 1))
+            blocks.update(self._fetch(missing_blocks, readahead))
+        for block in range(first_block, last_block + 1):
+            if block in self._blocks:
+                self._blocks.move_to_end(block)
+
+        offset = start - first_block * self.block_size
+        return b"".join(blocks[block] for block in range(first_block, last_block + 1))[offset : offset + length]
+
+    def _fetch(self, blocks: list[int], readahead: int) -> dict[int, bytes]:
+        """Fetch blocks, coalescing consecutive ones in a single `read_range` call, and add them to the cache."""
+        last_block = (self.size - 1) // self.block_size
+        runs: list[list[int]] = []
+        for block in blocks:
+            if runs and runs[-1][1] == block - 1:
+                runs[-1][1] = block
+            else:
+                runs.append([block, block])
+        runs[-1][1] = min(runs[-1][1] + readahead, last_block)
+
+        fetched: dict[int, bytes] = {}
+        for first, last in runs:
+            start = first * self.block_size
+            data = self._read_range(start, min((last + 1) * self.block_size, self.size) - start)
+            for block in range(first, last + 1):
+                offset = (block - first) * self.block_size
+                fetched[block] = data[offset : offset + self.block_size]
+                self._blocks[block] = fetched[block]
+                self._blocks.move_to_end(block)
+
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return fetched
@@ -0,0 +1,170 @@
+import fcntl
+import hashlib
+import os
+import shutil
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from os import environ
+
+from linz_logger import get_log
+
+SOURCE_CACHE_PATH = environ.get("SOURCE_CACHE_PATH")
+"""Directory of the source cache shared by all the processes of a node. The cache is disabled if not set."""
+SOURCE_CACHE_MAX_BYTES = int(environ.get("SOURCE_CACHE_MAX_BYTES", str(20 * 1024 * 1024 * 1024)))
+"""Size the cache is trimmed to, evicting the least recently used files first. Defaults to 20GB."""
+
+LOCK_SUFFIX = ".lock"
+EVICTION_LOCK = ".eviction.lock"
+
+
+class SourceCache:
+    """On-disk cache of source files, shared by concurrent processes of a node.
+
+    Each file is stored under a hash of its cache key (its path and its version, like its S3 ETag)
+    and handed out as a read-only hard link, so a file is only fetched once while it stays in the cache.
+    Processes are synchronised with `flock` on a lock file per cache entry, removed with the entry.
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, mode=0o777, exist_ok=True)
+
+    def get(self, key: str, destination: str, fetch: Callable[[str], object]) -> str:
+        """Link the cached file for `key` to `destination`, fetching it first if not in the cache.
+        The file is read-only: use `unshare()` before editing it in place.
+
+        Args:
+            key: a key identifying the content of the file, including its version
+            destination: the local path to link the file to
+            fetch: a function writing the file to the path it is called with, on a cache miss
+
+        Returns:
+            the destination path
+        """
+        entry = os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest())
+        if directory := os.path.dirname(destination):
+            os.makedirs(directory, mode=0o777, exist_ok=True)
+
+        with _lock(entry + LOCK_SUFFIX):
+            if os.path.exists(entry):
+                get_log().debug("source_cache_hit", key=key, destination=destination)
+                # The modification time is used as last access time for the LRU eviction
+                os.utime(entry)
+            else:
+                get_log().debug("source_cache_miss", key=key, destination=destination)
+                temp_entry = f"{entry}.{os.getpid()}.tmp"
+                try:
+                    fetch(temp_entry)
+                    os.chmod(temp_entry, 0o444)
+                    os.replace(temp_entry, entry)
+                except BaseException:
+                    os.remove(entry + LOCK_SUFFIX)
+                    raise
+                finally:
+                    if os.path.exists(temp_entry):
+                        os.remove(temp_entry)
+            _link(entry, destination)
+
+        self.evict()
+        return destination
+
+    def evict(self) -> None:
+        """Remove the least recently used files until the cache size is under `max_bytes`.
+        Files being fetched or linked by another process are skipped, as well as the whole eviction
+        if another process is already running it.
+        """
+        with _lock(os.path.join(self.path, EVICTION_LOCK), blocking=False) as acquired:
+            if not acquired:
+                return
+            entries: list[os.DirEntry[str]] = [
+                entry for entry in os.scandir(self.path) if entry.is_file() and "." not in entry.name
+            ]
+            size = sum(entry.stat().st_size for entry in entries)
+            if size <= self.max_bytes:
+                return
+            for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+                with _lock(entry.path + LOCK_SUFFIX, blocking=False) as entry_acquired:
+                    if not entry_acquired:
+                        continue
+                    entry_size = entry.stat().st_size
+                    os.remove(entry.path)
+                    # Removed while locked: the processes waiting for it lock a new lock file (see `_lock`)
+                    os.remove(entry.path + LOCK_SUFFIX)
+                size -= entry_size
+                get_log().debug("source_cache_evicted", path=entry.path, size=entry_size)
+                if size <= self.max_bytes:
+                    return
+
+
+def get_source_cache() -> SourceCache | None:
+    """Get the source cache configured by `SOURCE_CACHE_PATH`.
+
+    Returns:
+        the source cache, or None if not enabled
+    """
+    if not SOURCE_CACHE_PATH:
+        return None
+    return SourceCache(SOURCE_CACHE_PATH, SOURCE_CACHE_MAX_BYTES)
+
+
+def unshare(path: str) -> None:
+    """Replace a file hard linked to the source cache by a private copy.
+    Must be called before editing a file fetched through the cache in place,
+    otherwise the edit would also apply to the cached file.
+
+    Args:
+        path: a local path to a file
+    """
+    if os.stat(path).st_nlink <= 1:
+        return
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.copyfile(path, temp_path)
+    os.replace(temp_path, path)
+
+
+def _link(source: str, destination: str) -> None:
+    """Hard link `source` to `destination`, copying it if they are on different file systems."""
+    if os.path.exists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+@contextmanager
+def _lock(path: str, blocking: bool = True) -> Generator[bool, None, None]:
+    """Hold an exclusive `flock` on a lock file.
+    The lock file can be removed by its holder: the lock is then taken again on the new lock file at `path`.
+
+    Args:
+        path: the lock file path, created if needed
+        blocking: wait for the lock if held by another process. Defaults to True.
+
+    Yields:
+        True if the lock is held, False if `blocking` is False and the lock is held by another process
+    """
+    while True:
+        with open(path, "a", encoding="utf-8") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                if not _is_same_file(lock_file.fileno(), path):
+                    # Removed by the previous holder
+                    continue
+                yield True
+                return
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _is_same_file(fd: int, path: str) -> bool:
+    """Check if the open file `fd` is still the file at `path`."""
+    try:
+        return os.path.samestat(os.fstat(fd), os.stat(path))
+    except FileNotFoundError:
+        return False
@@ -1,5 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+
+from moto import mock_aws
 from pytest_subtests import SubTests
-from topo_imagery_common.aws.aws_helper import parse_path
+from topo_imagery_common.aws.aws_helper import (
+    default_access_denied_buckets,
+    get_s3_client,
+    is_default_access_denied,
+    max_pool_connections,
+    parse_path,
+    s3_clients,
+    set_default_access_denied,
+)
 
 
 def test_parse_path_s3(subtests: SubTests) -> None:
@@ -18,3 +30,53 @@ def test_parse_path_local() -> None:
     _, file_path = parse_path(local_path)
 
     assert file_path == "/home/tmp/file.test"
+
+
+@mock_aws
+def test_get_s3_client_shared_across_threads(subtests: SubTests) -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: get_s3_client(), range(32)))
+
+    with subtests.test(msg="A single client is created"):
+        assert all(s3_client is clients[0] for s3_client in clients)
+
+    with subtests.test():
+        assert clients[0].meta.config.max_pool_connections == max_pool_connections
+
+
+def _count_s3_clients() -> int:
+    return len(s3_clients)
+
+
+@mock_aws
+def test_get_s3_client_not_inherited_after_fork() -> None:
+    get_s3_client()
+    assert len(s3_clients) > 0
+
+    with get_context("fork").Pool(1) as pool:
+        assert pool.apply(_count_s3_clients) == 0
+
+
+def test_default_access_denied(subtests: SubTests) -> None:
+    set_default_access_denied("s3://denied-bucket/path/file.tiff")
+
+    with subtests.test(msg="Same bucket"):
+        assert is_default_access_denied("s3://denied-bucket/other/file.tiff")
+
+    with subtests.test(msg="Other bucket"):
+        assert not is_default_access_denied("s3://other-bucket/path/file.tiff")
+
+    default_access_denied_buckets.clear()
+
+
+def _is_default_access_denied(path: str) -> bool:
+    return is_default_access_denied(path)
+
+
+def test_default_access_denied_not_inherited_after_fork() -> None:
+    set_default_access_denied("s3://denied-bucket/file.tiff")
+
+    with get_context("fork").Pool(1) as pool:
+        assert not pool.apply(_is_default_access_denied, ("s3://denied-bucket/file.tiff",))
+
+    default_access_denied_buckets.clear()
@@ -0,0 +1,31 @@
+from pytest_subtests import SubTests
+from topo_imagery_common.aws.prefix_trie import PrefixTrie
+
+
+def test_find_first_inserted_prefix(subtests: SubTests) -> None:
+    trie: PrefixTrie[int] = PrefixTrie()
+    trie.insert("s3://bucket/prefix/", 0)
+    trie.insert("s3://bucket/", 1)
+    trie.insert("s3://bucket/prefix/", 2)
+
+    with subtests.test(msg="Longer prefix inserted first"):
+        assert trie.find("s3://bucket/prefix/file.tiff") == 0
+
+    with subtests.test(msg="Shorter prefix"):
+        assert trie.find("s3://bucket/other/file.tiff") == 1
+
+    with subtests.test(msg="No prefix"):
+        assert trie.find("s3://other-bucket/file.tiff") is None
+
+    with subtests.test(msg="Path shorter than the prefix"):
+        assert trie.find("s3://bucket") is None
+
+    with subtests.test(msg="Size"):
+        assert len(trie) == 3
+
+
+def test_empty_prefix() -> None:
+    trie: PrefixTrie[str] = PrefixTrie()
+    trie.insert("", "all")
+
+    assert trie.find("s3://bucket/file.tiff") == "all"
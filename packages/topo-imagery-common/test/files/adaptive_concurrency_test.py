@@ -0,0 +1,156 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from botocore.exceptions import ClientError
+from pytest import raises
+from pytest_subtests import SubTests
+from topo_imagery_common.files.adaptive_concurrency import AdaptiveConcurrency, is_throttling_error
+
+
+def slow_down_error() -> ClientError:
+    return ClientError(
+        {
+            "Error": {"Code": "SlowDown", "Message": "Please reduce your request rate."},
+            "ResponseMetadata": {"HTTPStatusCode": 503},
+        },
+        "GetObject",
+    )
+
+
+class ThrottlingStub:  # pylint: disable=too-few-public-methods
+    """Stub of a S3 endpoint answering `503 SlowDown` when more than `capacity` requests are in flight."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+        self._lock = Lock()
+
+    def get(self, key: str) -> str:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            throttled = self.in_flight > self.capacity
+            if throttled:
+                self.throttled += 1
+        try:
+            time.sleep(0.002)
+            if throttled:
+                raise slow_down_error()
+            return key
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_backs_off_when_throttled(subtests: SubTests) -> None:
+    stub = ThrottlingStub(capacity=3)
+    controller = AdaptiveConcurrency(initial=8, maximum=16, max_attempts=50, backoff_base=0.001, backoff_max=0.01)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda key: controller.call(stub.get, key), [str(i) for i in range(200)]))
+
+    with subtests.test(msg="All requests succeed"):
+        assert results == [str(i) for i in range(200)]
+
+    with subtests.test(msg="Requests have been throttled and retried"):
+        assert stub.throttled > 0
+        assert stub.calls == 200 + stub.throttled
+
+    with subtests.test(msg="Limit decreased"):
+        assert controller.limit < 8
+
+
+def test_increases_without_throttling(subtests: SubTests) -> None:
+    stub = ThrottlingStub(capacity=100)
+    controller = AdaptiveConcurrency(initial=1, maximum=8, latency_factor=100)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda key: controller.call(stub.get, key), [str(i) for i in range(200)]))
+
+    with subtests.test(msg="Limit increased"):
+        assert controller.limit == 8
+
+    with subtests.test(msg="In flight requests stay under the maximum"):
+        assert stub.max_in_flight <= 8
+
+
+def test_doubles_until_first_decrease(subtests: SubTests) -> None:
+    controller = AdaptiveConcurrency(initial=4, maximum=32, latency_factor=100, max_attempts=1)
+
+    with subtests.test(msg="Doubled after a round of transfers"):
+        for _ in range(4):
+            controller.call(str)
+        assert controller.limit == 8
+
+    with subtests.test(msg="Grows by one after a decrease"):
+        controller.limit = 16
+        with raises(ClientError):
+            controller.call(ThrottlingStub(capacity=0).get, "key")
+        for _ in range(8):
+            controller.call(str)
+        assert controller.limit == 9
+
+
+def test_gives_up_after_max_attempts() -> None:
+    stub = ThrottlingStub(capacity=0)
+    controller = AdaptiveConcurrency(max_attempts=3, backoff_base=0.001)
+
+    with raises(ClientError):
+        controller.call(stub.get, "key")
+
+    assert stub.calls == 3
+
+
+def test_other_errors_are_not_retried() -> None:
+    calls = []
+
+    def fail() -> None:
+        calls.append(1)
+        raise ValueError("not a throttling error")
+
+    with raises(ValueError):
+        AdaptiveConcurrency().call(fail)
+
+    assert len(calls) == 1
+
+
+def test_is_throttling_error(subtests: SubTests) -> None:
+    with subtests.test(msg="SlowDown"):
+        assert is_throttling_error(slow_down_error())
+
+    with subtests.test(msg="503 status"):
+        assert is_throttling_error(
+            ClientError({"Error": {"Code": "Unknown"}, "ResponseMetadata": {"HTTPStatusCode": 503}}, "PutObject")
+        )
+
+    with subtests.test(msg="Not found"):
+        assert not is_throttling_error(
+            ClientError({"Error": {"Code": "404"}, "ResponseMetadata": {"HTTPStatusCode": 404}}, "HeadObject")
+        )
+
+    with subtests.test(msg="Not a ClientError"):
+        assert not is_throttling_error(ValueError())
+
+
+def test_mixed_sizes_do_not_back_off() -> None:
+    controller = AdaptiveConcurrency(initial=4, maximum=4)
+
+    # Large transfers take longer, but not longer per byte
+    for size, duration in [(1024, 0.005)] * 20 + [(100 * 1024 * 1024, 0.05)] * 5:
+        controller.call_sized(size, time.sleep, duration)
+
+    assert controller.limit == 4
+
+
+def test_backs_off_when_latency_per_byte_increases() -> None:
+    controller = AdaptiveConcurrency(initial=4, maximum=4)
+
+    for duration in [0.005] * 20 + [0.1] * 3:
+        controller.call_sized(1024 * 1024, time.sleep, duration)
+
+    assert controller.limit < 4
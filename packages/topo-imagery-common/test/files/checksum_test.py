@@ -0,0 +1,27 @@
+import os
+
+from pytest_subtests import SubTests
+from topo_imagery_common.files.checksum import CHUNK_SIZE, multihash_as_hex, multihash_file, multihash_files
+
+
+def test_multihash_as_hex() -> None:
+    assert multihash_as_hex(b"test content") == "12206ae8a75555209fd6c44157c0aed8016e763ff435a19cf186f76863140143ff72"
+
+
+def test_multihash_file(setup: str, subtests: SubTests) -> None:
+    for name, content in [("empty", b""), ("small", b"test content"), ("chunks", os.urandom(2 * CHUNK_SIZE + 1))]:
+        path = os.path.join(setup, name)
+        with open(path, "wb") as file:
+            file.write(content)
+
+        with subtests.test(msg=name):
+            assert multihash_file(path) == multihash_as_hex(content)
+
+
+def test_multihash_files(setup: str) -> None:
+    contents = {os.path.join(setup, f"{i}.file"): os.urandom(1000) for i in range(10)}
+    for path, content in contents.items():
+        with open(path, "wb") as file:
+            file.write(content)
+
+    assert multihash_files(list(contents)) == {path: multihash_as_hex(content) for path, content in contents.items()}
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncGenerator, AsyncIterable, Generator, Iterable
+
+from boto3 import client
+from moto import mock_aws
+from moto.s3.responses import DEFAULT_REGION_NAME
+from mypy_boto3_s3 import S3Client
+from pytest import CaptureFixture, raises
+from topo_imagery_common.files.fs import NoSuchFileError
+from topo_imagery_common.files.fs_async import acopy, aexists, aread, aread_many, awrite, get_max_concurrency
+from topo_imagery_common.files.hedged_requests import HedgedRequests
+
+
+async def _read_many(paths: Iterable[str] | AsyncIterable[str], concurrency: int | None = None) -> dict[str, bytes]:
+    return {path: content async for path, content in aread_many(paths, concurrency)}
+
+
+def test_aread_awrite_local(setup: str) -> None:
+    path = os.path.join(setup, "test.file")
+
+    async def write_read() -> bytes:
+        await awrite(path, b"test content")
+        return await aread(path)
+
+    assert asyncio.run(write_read()) == b"test content"
+
+
+@mock_aws
+def test_aexists_acopy_s3() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=b"test content")
+
+    async def copy_exists() -> tuple[bool, bool]:
+        await acopy("s3://testbucket/test.file", "s3://testbucket/copy.file")
+        return await aexists("s3://testbucket/copy.file"), await aexists("s3://testbucket/missing.file")
+
+    assert asyncio.run(copy_exists()) == (True, False)
+    assert s3_client.get_object(Bucket="testbucket", Key="copy.file")["Body"].read() == b"test content"
+
+
+@mock_aws
+def test_aread_many_s3() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    paths = []
+    for index in range(10):
+        s3_client.put_object(Bucket="testbucket", Key=f"{index}.json", Body=f"{index}".encode())
+        paths.append(f"s3://testbucket/{index}.json")
+
+    assert asyncio.run(_read_many(paths, concurrency=3)) == {path: os.path.basename(path)[0].encode() for path in paths}
+
+
+@mock_aws
+def test_aread_many_hedged() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.json", Body=b"{}")
+
+    async def read_hedged(hedged_requests: HedgedRequests) -> list[tuple[str, bytes]]:
+        return [result async for result in aread_many(["s3://testbucket/test.json"], hedged_requests=hedged_requests)]
+
+    with HedgedRequests() as hedged_requests:
+        assert asyncio.run(read_hedged(hedged_requests)) == [("s3://testbucket/test.json", b"{}")]
+        assert hedged_requests.requests == 1
+
+
+def test_aread_many_generator(setup: str) -> None:
+    paths = (os.path.join(setup, f"{index}.file") for index in range(5))
+    for index in range(5):
+        with open(os.path.join(setup, f"{index}.file"), "wb") as file:
+            file.write(b"content")
+
+    assert len(asyncio.run(_read_many(paths, concurrency=2))) == 5
+
+
+def test_aread_many_blocking_listing(setup: str) -> None:
+    for index in range(2):
+        with open(os.path.join(setup, f"{index}.file"), "wb") as file:
+            file.write(b"content")
+
+    def list_pages() -> Generator[str, None, None]:
+        yield os.path.join(setup, "0.file")
+        time.sleep(0.5)  # Next listing page
+        yield os.path.join(setup, "1.file")
+
+    async def read_first() -> float:
+        start_time = time.monotonic()
+        async for _ in aread_many(list_pages()):
+            return time.monotonic() - start_time
+        raise AssertionError("No file read")
+
+    # The first file is read while the next page is listed
+    assert asyncio.run(read_first()) < 0.5
+
+
+def test_aread_many_async_iterable(setup: str) -> None:
+    for index in range(3):
+        with open(os.path.join(setup, f"{index}.file"), "wb") as file:
+            file.write(b"content")
+
+    async def list_paths() -> AsyncGenerator[str, None]:
+        for index in range(3):
+            await asyncio.sleep(0)
+            yield os.path.join(setup, f"{index}.file")
+
+    assert len(asyncio.run(_read_many(list_paths()))) == 3
+
+
+def test_aread_many_concurrency_limited(setup: str, capsys: CaptureFixture[str]) -> None:
+    path = os.path.join(setup, "test.file")
+    with open(path, "wb") as file:
+        file.write(b"content")
+
+    asyncio.run(_read_many([path], concurrency=get_max_concurrency() + 1))
+
+    assert "aread_many_concurrency_limited" in capsys.readouterr().out
+
+
+def test_aread_many_not_found(setup: str) -> None:
+    existing_path = os.path.join(setup, "test.file")
+    with open(existing_path, "wb") as file:
+        file.write(b"test content")
+    missing_path = os.path.join(setup, "missing.file")
+
+    with raises(NoSuchFileError) as error:
+        asyncio.run(_read_many([existing_path, missing_path]))
+    assert error.value.path == missing_path
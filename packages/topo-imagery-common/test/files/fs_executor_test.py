@@ -0,0 +1,24 @@
+import os
+
+from pytest import raises
+from topo_imagery_common.files.fs import NoSuchFileError, read, write
+from topo_imagery_common.files.fs_executor import get_executor, run_all
+
+
+def test_run_all(setup: str) -> None:
+    paths = [os.path.join(setup, f"{index}.file") for index in range(10)]
+    for index, path in enumerate(paths):
+        write(path, f"{index}".encode())
+
+    assert [future.result() for future in run_all(read, paths)] == [f"{index}".encode() for index in range(10)]
+
+
+def test_run_all_not_found(setup: str) -> None:
+    futures = run_all(read, [os.path.join(setup, "missing.file")])
+
+    with raises(NoSuchFileError):
+        futures[0].result()
+
+
+def test_get_executor_shared() -> None:
+    assert get_executor() is get_executor()
@@ -1,7 +1,8 @@
+import errno
 import os
 
 import pytest
-from topo_imagery_common.files.fs_local import exists, read, write
+from topo_imagery_common.files.fs_local import copy, exists, read, read_mmap, write
 
 
 @pytest.mark.dependency(name="write")
@@ -29,6 +30,25 @@ def test_read(setup: str) -> None:
     assert file_content == content
 
 
+def test_copy_to_file_name(setup: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = os.path.join(setup, "test.file")
+    write(source, b"test content")
+    monkeypatch.chdir(setup)
+
+    copy(source, "copy.file")
+
+    assert read(os.path.join(setup, "copy.file")) == b"test content"
+
+
+@pytest.mark.dependency(name="copy", depends=["write", "read"])
+def test_copy_non_existing_dir(setup: str) -> None:
+    source = os.path.join(setup, "test.file")
+    destination = os.path.join(setup, "new_dir/test.file")
+    write(source, b"test content")
+    copy(source, destination)
+    assert read(destination) == b"test content"
+
+
 @pytest.mark.dependency(name="exists", depends=["write"])
 def test_exists(setup: str) -> None:
     content = b"test content"
@@ -42,3 +62,60 @@ def test_exists(setup: str) -> None:
 def test_exists_file_not_found() -> None:
     found = exists("/tmp/test.file")
     assert found is False
+
+
+def test_write_atomic(setup: str) -> None:
+    path = os.path.join(setup, "test.file")
+    write(path, b"previous content")
+
+    with pytest.raises(TypeError):
+        write(path, "not bytes")  # type: ignore[arg-type]
+
+    assert read(path) == b"previous content"
+    assert os.listdir(setup) == ["test.file"]
+
+
+def test_copy_hardlink(setup: str) -> None:
+    source = os.path.join(setup, "test.file")
+    destination = os.path.join(setup, "new_dir/test.file")
+    write(source, b"test content")
+
+    copy(source, destination, hardlink=True)
+
+    assert os.path.samefile(source, destination)
+
+
+def test_copy_file_range_unsupported(setup: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    def copy_file_range_unsupported(*_: int) -> int:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range_unsupported)
+    source = os.path.join(setup, "test.file")
+    destination = os.path.join(setup, "copy.file")
+    write(source, b"test content")
+
+    copy(source, destination)
+
+    assert read(destination) == b"test content"
+    assert not os.path.samefile(source, destination)
+
+
+def test_copy_same_file(setup: str) -> None:
+    path = os.path.join(setup, "test.file")
+    write(path, b"test content")
+
+    copy(path, path)
+
+    assert read(path) == b"test content"
+
+
+def test_read_mmap(setup: str) -> None:
+    path = os.path.join(setup, "test.file")
+    write(path, b"test content")
+    empty_path = os.path.join(setup, "empty.file")
+    write(empty_path, b"")
+
+    with read_mmap(path) as content:
+        assert content.readonly
+        assert content.tobytes() == b"test content"
+    assert read_mmap(empty_path).tobytes() == b""
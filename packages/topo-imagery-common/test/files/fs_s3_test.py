@@ -1,14 +1,28 @@
 import json
+import os
+from io import BytesIO
 
 from boto3 import client
 from botocore.exceptions import ClientError
 from moto import mock_aws
 from moto.s3.responses import DEFAULT_REGION_NAME
 from mypy_boto3_s3 import S3Client
-from pytest import CaptureFixture, raises
+from pytest import CaptureFixture, MonkeyPatch, raises
 from pytest_subtests import SubTests
+from topo_imagery_common.files.checksum import multihash_as_hex
 from topo_imagery_common.files.files_helper import ContentType
-from topo_imagery_common.files.fs_s3 import exists, list_files_in_uri, read, write
+from topo_imagery_common.files.fs_s3 import (
+    copy,
+    download_file,
+    exists,
+    iter_files_in_uri,
+    list_files_in_uri,
+    read,
+    read_range,
+    skipped_writes,
+    upload_file,
+    write,
+)
 
 
 @mock_aws
@@ -52,6 +66,94 @@ def test_write_multihash_as_metadata(subtests: SubTests) -> None:
         assert resp["Metadata"]["multihash"] == "12206ae8a75555209fd6c44157c0aed8016e763ff435a19cf186f76863140143ff72"
 
 
+@mock_aws
+def test_write_skip_unchanged(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    write("s3://testbucket/test.file", b"test content")
+    last_modified = s3_client.head_object(Bucket="testbucket", Key="test.file")["LastModified"]
+    skipped_count, skipped_size = skipped_writes.count, skipped_writes.size
+
+    write("s3://testbucket/test.file", b"test content", skip_unchanged=True)
+    with subtests.test(msg="Same content is skipped"):
+        assert s3_client.head_object(Bucket="testbucket", Key="test.file")["LastModified"] == last_modified
+
+    with subtests.test(msg="Skip is counted"):
+        assert (skipped_writes.count - skipped_count, skipped_writes.size - skipped_size) == (1, len(b"test content"))
+
+    write("s3://testbucket/test.file", b"new content", skip_unchanged=True)
+    with subtests.test(msg="New content is written"):
+        assert s3_client.get_object(Bucket="testbucket", Key="test.file")["Body"].read() == b"new content"
+
+
+@mock_aws
+def test_upload_file_skip_unchanged(setup: str) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    write("s3://testbucket/test.file", b"test content")
+    path = os.path.join(setup, "test.file")
+    with open(path, "wb") as file:
+        file.write(b"test content")
+    skipped_count = skipped_writes.count
+
+    upload_file(path, "s3://testbucket/test.file", skip_unchanged=True)
+
+    assert skipped_writes.count - skipped_count == 1
+
+
+@mock_aws
+def test_upload_file_from_path(setup: str, subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    path = os.path.join(setup, "test.tiff")
+    with open(path, "wb") as file:
+        file.write(b"test content")
+
+    upload_file(path, "s3://testbucket/test.tiff", ContentType.GEOTIFF.value)
+    resp = s3_client.get_object(Bucket="testbucket", Key="test.tiff")
+
+    with subtests.test():
+        assert resp["Body"].read() == b"test content"
+
+    with subtests.test():
+        assert resp["ContentType"] == ContentType.GEOTIFF.value
+
+    with subtests.test():
+        assert resp["Metadata"]["multihash"] == "12206ae8a75555209fd6c44157c0aed8016e763ff435a19cf186f76863140143ff72"
+
+
+@mock_aws
+def test_upload_file_multipart(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    part_size = 5 * 1024 * 1024  # S3 minimum part size
+    content = os.urandom(2 * part_size + 1024)
+
+    upload_file(BytesIO(content), "s3://testbucket/test.tiff", part_size=part_size, concurrency=2)
+    resp = s3_client.get_object(Bucket="testbucket", Key="test.tiff")
+
+    with subtests.test(msg="Uploaded as 3 parts"):
+        assert resp["ETag"].endswith('-3"')
+
+    with subtests.test():
+        assert resp["Body"].read() == content
+
+    with subtests.test(msg="Multihash of the whole content"):
+        assert resp["Metadata"]["multihash"] == multihash_as_hex(content)
+
+
+@mock_aws
+def test_upload_file_multipart_aborted_on_error() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+
+    # Parts smaller than 5MB (other than the last one) are rejected when completing the upload
+    with raises(ClientError):
+        upload_file(BytesIO(os.urandom(3 * 1024 * 1024)), "s3://testbucket/test.tiff", part_size=1024 * 1024)
+
+    assert "Uploads" not in s3_client.list_multipart_uploads(Bucket="testbucket")
+
+
 @mock_aws
 def test_read() -> None:
     s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
@@ -63,6 +165,22 @@ def test_read() -> None:
     assert content == b"test content"
 
 
+@mock_aws
+def test_read_range(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=b"test content")
+
+    with subtests.test(msg="Range in the file"):
+        assert read_range("s3://testbucket/test.file", 5, 4) == b"cont"
+
+    with subtests.test(msg="Range over the end of the file"):
+        assert read_range("s3://testbucket/test.file", 5, 100) == b"content"
+
+    with subtests.test(msg="Range after the end of the file"):
+        assert read_range("s3://testbucket/test.file", 100, 4) == b""
+
+
 @mock_aws
 def test_read_bucket_not_found(capsys: CaptureFixture[str]) -> None:
     with raises(ClientError):
@@ -85,6 +203,158 @@ def test_read_key_not_found(capsys: CaptureFixture[str]) -> None:
     assert logs["msg"] == "s3_key_not_found"
 
 
+@mock_aws
+def test_download_file(setup: str) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=b"test content")
+    path = os.path.join(setup, "new_dir", "test.file")
+
+    download_file("s3://testbucket/test.file", path)
+
+    with open(path, "rb") as file:
+        assert file.read() == b"test content"
+
+
+@mock_aws
+def test_download_file_to_file_name(setup: str, monkeypatch: MonkeyPatch) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=b"test content")
+    monkeypatch.chdir(setup)
+
+    download_file("s3://testbucket/test.file", "test.file")
+
+    with open(os.path.join(setup, "test.file"), "rb") as file:
+        assert file.read() == b"test content"
+
+
+@mock_aws
+def test_download_file_empty(setup: str) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=b"")
+    path = os.path.join(setup, "test.file")
+
+    download_file("s3://testbucket/test.file", path)
+
+    assert os.path.getsize(path) == 0
+
+
+@mock_aws
+def test_download_file_parts(setup: str) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    content = os.urandom(1024 * 1024 + 10)
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=content, Metadata={"multihash": multihash_as_hex(content)})
+    path = os.path.join(setup, "test.file")
+
+    download_file("s3://testbucket/test.file", path, part_size=100 * 1024, concurrency=3)
+
+    with open(path, "rb") as file:
+        assert file.read() == content
+
+
+@mock_aws
+def test_download_file_parts_multihash_mismatch(setup: str, subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    content = os.urandom(1024 * 1024)
+    s3_client.put_object(
+        Bucket="testbucket", Key="test.file", Body=content, Metadata={"multihash": multihash_as_hex(b"other content")}
+    )
+    path = os.path.join(setup, "test.file")
+
+    with subtests.test(msg="Raises"):
+        with raises(Exception, match="does not match the multihash"):
+            download_file("s3://testbucket/test.file", path, part_size=100 * 1024)
+
+    with subtests.test(msg="Removes the file"):
+        assert not os.path.exists(path)
+
+
+@mock_aws
+def test_download_file_key_not_found(setup: str, capsys: CaptureFixture[str]) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+
+    with raises(ClientError):
+        download_file("s3://testbucket/test.file", os.path.join(setup, "test.file"))
+
+    logs = json.loads(capsys.readouterr().out)
+    assert logs["msg"] == "s3_key_not_found"
+
+
+@mock_aws
+def test_copy_carries_multihash(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.create_bucket(Bucket="targetbucket")
+    write("s3://testbucket/test.tiff", b"test content", ContentType.GEOTIFF.value)
+
+    copy("s3://testbucket/test.tiff", "s3://targetbucket/copy.tiff")
+    resp = s3_client.get_object(Bucket="targetbucket", Key="copy.tiff")
+
+    with subtests.test():
+        assert resp["Body"].read() == b"test content"
+
+    with subtests.test():
+        assert resp["ContentType"] == ContentType.GEOTIFF.value
+
+    with subtests.test():
+        assert resp["Metadata"]["multihash"] == "12206ae8a75555209fd6c44157c0aed8016e763ff435a19cf186f76863140143ff72"
+
+
+@mock_aws
+def test_copy_skip_unchanged() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    write("s3://testbucket/test.file", b"test content")
+    write("s3://testbucket/copy.file", b"test content")
+    skipped_count = skipped_writes.count
+
+    copy("s3://testbucket/test.file", "s3://testbucket/copy.file", skip_unchanged=True)
+
+    assert skipped_writes.count - skipped_count == 1
+
+
+@mock_aws
+def test_copy_computes_missing_multihash(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.json", Body=b"test content", ContentType=ContentType.JSON.value)
+
+    copy("s3://testbucket/test.json", "s3://testbucket/copy.json")
+    resp = s3_client.get_object(Bucket="testbucket", Key="copy.json")
+
+    with subtests.test():
+        assert resp["ContentType"] == ContentType.JSON.value
+
+    with subtests.test():
+        assert resp["Metadata"]["multihash"] == "12206ae8a75555209fd6c44157c0aed8016e763ff435a19cf186f76863140143ff72"
+
+
+@mock_aws
+def test_copy_multipart(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    part_size = 5 * 1024 * 1024  # S3 minimum part size
+    content = os.urandom(2 * part_size + 1024)
+    write("s3://testbucket/test.tiff", content, ContentType.GEOTIFF.value)
+
+    copy("s3://testbucket/test.tiff", "s3://testbucket/copy.tiff", max_size=part_size, part_size=part_size)
+    resp = s3_client.get_object(Bucket="testbucket", Key="copy.tiff")
+
+    with subtests.test(msg="Copied as 3 parts"):
+        assert resp["ETag"].endswith('-3"')
+
+    with subtests.test():
+        assert resp["Body"].read() == content
+
+    with subtests.test():
+        assert resp["Metadata"]["multihash"] == multihash_as_hex(content)
+
+
 @mock_aws
 def test_exists() -> None:
     s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
@@ -160,3 +430,33 @@ def test_list_files_in_uri(subtests: SubTests) -> None:
 
     with subtests.test():
         assert "data/image.tiff" not in files
+
+
+@mock_aws
+def test_iter_files_in_uri_empty_prefix() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+
+    assert not list_files_in_uri("s3://testbucket/data/", [".json"], s3_client)
+
+
+@mock_aws
+def test_iter_files_in_uri_sharded(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="data/collection.json", Body=b"")
+    for directory in ["a", "b", "c"]:
+        s3_client.put_object(Bucket="testbucket", Key=f"data/{directory}/item.json", Body=b"")
+        s3_client.put_object(Bucket="testbucket", Key=f"data/{directory}/item_footprint.geojson", Body=b"")
+        s3_client.put_object(Bucket="testbucket", Key=f"data/{directory}/image.tiff", Body=b"")
+
+    files: dict[str, set[str]] = {}
+    for page in iter_files_in_uri("s3://testbucket/data/", [".json", "_footprint.geojson"], s3_client, concurrency=2):
+        for suffix, keys in page.items():
+            files.setdefault(suffix, set()).update(keys)
+
+    with subtests.test(msg="json"):
+        assert files[".json"] == {"data/collection.json", "data/a/item.json", "data/b/item.json", "data/c/item.json"}
+
+    with subtests.test(msg="footprints"):
+        assert files["_footprint.geojson"] == {f"data/{directory}/item_footprint.geojson" for directory in ["a", "b", "c"]}
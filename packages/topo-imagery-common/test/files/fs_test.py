@@ -1,15 +1,33 @@
 import os
+import time
 from pathlib import Path
 from shutil import rmtree
 from tempfile import mkdtemp
+from threading import Lock
+from typing import Any
+from unittest.mock import patch
 
 from boto3 import client
+from botocore.exceptions import ClientError
 from moto import mock_aws
 from moto.s3.responses import DEFAULT_REGION_NAME
 from mypy_boto3_s3 import S3Client
 from pytest import CaptureFixture, raises
 from pytest_subtests import SubTests
-from topo_imagery_common.files.fs import NoSuchFileError, read, write, write_all, write_sidecars
+from topo_imagery_common.aws.aws_helper import get_s3_client, is_default_access_denied
+from topo_imagery_common.files.adaptive_concurrency import AdaptiveConcurrency
+from topo_imagery_common.files.checksum import multihash_as_hex
+from topo_imagery_common.files.fs import (
+    NoSuchFileError,
+    copy,
+    download_file,
+    get_multihash,
+    get_size,
+    iter_write_all,
+)
+from topo_imagery_common.files.fs import open as fs_open
+from topo_imagery_common.files.fs import read, read_range, upload_file, write, write_all, write_file, write_sidecars
+from topo_imagery_common.files.prefix_index import PrefixIndex
 
 
 def test_read_key_not_found_local() -> None:
@@ -17,6 +35,31 @@ def test_read_key_not_found_local() -> None:
         read("test_dir/test.file")
 
 
+def test_read_mmap_local(setup: str) -> None:
+    path = os.path.join(setup, "test.file")
+    write(path, b"test content")
+
+    content = read(path, use_mmap=True)
+
+    assert isinstance(content, memoryview)
+    assert content.tobytes() == b"test content"
+    assert multihash_as_hex(content) == multihash_as_hex(b"test content")
+
+
+@mock_aws
+def test_read_mmap_s3() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=b"test content")
+
+    assert read("s3://testbucket/test.file", use_mmap=True).tobytes() == b"test content"
+
+
+def test_read_mmap_not_found() -> None:
+    with raises(NoSuchFileError):
+        read("test_dir/test.file", use_mmap=True)
+
+
 @mock_aws
 def test_read_key_not_found_s3(capsys: CaptureFixture[str]) -> None:
     s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
@@ -28,6 +71,133 @@ def test_read_key_not_found_s3(capsys: CaptureFixture[str]) -> None:
     assert "s3_key_not_found" in capsys.readouterr().out
 
 
+def test_upload_file_not_found_local() -> None:
+    with raises(NoSuchFileError):
+        upload_file("test_dir/test.file", "/tmp/test.file")
+
+
+@mock_aws
+def test_download_file_key_not_found_s3(setup: str) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+
+    with raises(NoSuchFileError):
+        download_file("s3://testbucket/test.file", os.path.join(setup, "test.file"))
+
+
+@mock_aws
+def test_copy_local_to_s3_and_back(setup: str, subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    source = os.path.join(setup, "test.file")
+    write(source, b"test content")
+
+    copy(source, "s3://testbucket/test.file")
+    with subtests.test(msg="Uploaded to S3"):
+        assert s3_client.get_object(Bucket="testbucket", Key="test.file")["Body"].read() == b"test content"
+
+    downloaded = copy("s3://testbucket/test.file", os.path.join(setup, "downloaded", "test.file"))
+    with subtests.test(msg="Downloaded from S3"):
+        assert read(downloaded) == b"test content"
+
+
+@mock_aws
+def test_get_multihash(setup: str, subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=b"test content")
+    path = os.path.join(setup, "test.file")
+    write(path, b"test content")
+
+    with subtests.test(msg="S3"):
+        assert get_multihash("s3://testbucket/test.file") == multihash_as_hex(b"test content")
+
+    with subtests.test(msg="Local"):
+        assert get_multihash(path) == multihash_as_hex(b"test content")
+
+    with subtests.test(msg="S3 not found"):
+        with raises(NoSuchFileError):
+            get_multihash("s3://testbucket/missing.file")
+
+    with subtests.test(msg="Local not found"):
+        with raises(NoSuchFileError):
+            get_multihash(os.path.join(setup, "missing.file"))
+
+
+def test_read_range_local(setup: str) -> None:
+    path = os.path.join(setup, "test.file")
+    write(path, b"test content")
+
+    assert read_range(path, 5, 4) == b"cont"
+
+
+@mock_aws
+def test_read_range_key_not_found_s3() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+
+    with raises(NoSuchFileError):
+        read_range("s3://testbucket/test.file", 0, 4)
+
+
+@mock_aws
+def test_open_s3(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    content = os.urandom(200_000)
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=content)
+
+    with fs_open("s3://testbucket/test.file") as file:
+        with subtests.test(msg="Read from start"):
+            assert file.read(10) == content[:10]
+
+        file.seek(150_000)
+        with subtests.test(msg="Read after seek"):
+            assert file.read(100) == content[150_000:150_100]
+
+        file.seek(-10, os.SEEK_END)
+        with subtests.test(msg="Read to the end"):
+            assert file.read() == content[-10:]
+
+
+def test_open_not_found_local() -> None:
+    with raises(NoSuchFileError):
+        fs_open("test_dir/test.file")
+
+
+@mock_aws
+def test_copy_s3_key_not_found() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+
+    with raises(NoSuchFileError):
+        copy("s3://testbucket/test.file", "s3://testbucket/copy.file")
+
+
+@mock_aws
+def test_copy_s3_server_side_denied(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.create_bucket(Bucket="targetbucket")
+    write("s3://testbucket/test.file", b"test content")
+
+    def deny_copy(**_kwargs: Any) -> None:
+        raise ClientError({"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, "CopyObject")
+
+    events = get_s3_client().meta.events
+    events.register("before-call.s3.CopyObject", deny_copy)
+    try:
+        copy("s3://testbucket/test.file", "s3://targetbucket/copy.file")
+    finally:
+        events.unregister("before-call.s3.CopyObject", deny_copy)
+
+    with subtests.test(msg="Streamed copy"):
+        assert s3_client.get_object(Bucket="targetbucket", Key="copy.file")["Body"].read() == b"test content"
+
+    with subtests.test(msg="Source bucket not denied"):
+        assert not is_default_access_denied("s3://testbucket/test.file")
+
+
 def test_write_all_file_not_found_local() -> None:
     # Raises an exception as all files are not writte·
     with raises(Exception) as e:
@@ -98,3 +268,113 @@ def test_write_all_in_order(setup: str) -> None:
         i += 1
     written_files = write_all(inputs=inputs, target=setup, generate_name=False)
     assert written_files == inputs
+
+
+def test_iter_write_all_byte_budget(setup: str, subtests: SubTests) -> None:
+    inputs = []
+    for i in range(5):
+        path = os.path.join(setup, f"{i}.file")
+        write(path, b"a" * 100 * (i + 1))
+        inputs.append(path)
+    target = os.path.join(setup, "target")
+
+    in_flight: list[int] = []
+    max_in_flight: list[tuple[int, int]] = []
+    lock = Lock()
+
+    def recording_write_file(input_: str, *args: Any) -> str:
+        with lock:
+            in_flight.append(os.path.getsize(input_))
+            max_in_flight.append((len(in_flight), sum(in_flight)))
+        time.sleep(0.05)
+        try:
+            return write_file(input_, *args)
+        finally:
+            with lock:
+                in_flight.remove(os.path.getsize(input_))
+
+    with patch("topo_imagery_common.files.fs.write_file", recording_write_file):
+        written = dict(iter_write_all(inputs, target, generate_name=False, concurrency=5, max_in_flight_bytes=300))
+
+    with subtests.test(msg="Written"):
+        assert written == {path: os.path.join(target, os.path.basename(path)) for path in inputs}
+
+    # The files larger than the budget are written alone
+    with subtests.test(msg="In flight bytes within the budget"):
+        assert all(size <= 300 or count == 1 for count, size in max_in_flight)
+
+
+def test_iter_write_all_raises_concurrency(setup: str) -> None:
+    inputs = []
+    for i in range(40):
+        path = os.path.join(setup, f"{i}.file")
+        write(path, b"test content")
+        inputs.append(path)
+
+    in_flight: list[str] = []
+    max_in_flight = 0
+    lock = Lock()
+
+    def recording_write_file(input_: str, *_: Any) -> str:
+        nonlocal max_in_flight
+        with lock:
+            in_flight.append(input_)
+            max_in_flight = max(max_in_flight, len(in_flight))
+        time.sleep(0.02)
+        with lock:
+            in_flight.remove(input_)
+        return input_
+
+    with (
+        patch("topo_imagery_common.files.fs.write_file", recording_write_file),
+        patch("topo_imagery_common.files.fs.get_adaptive_concurrency", return_value=AdaptiveConcurrency(initial=4)),
+    ):
+        list(iter_write_all(inputs, os.path.join(setup, "target")))
+
+    assert max_in_flight > 4
+
+
+@mock_aws
+def test_iter_write_all_source_index(setup: str, subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    inputs = [f"s3://testbucket/dir/{i}.file" for i in range(3)]
+    for input_ in inputs:
+        write(input_, b"test content")
+    source_index = PrefixIndex(["s3://testbucket/dir"])
+
+    with patch("topo_imagery_common.files.fs_s3.head") as head:
+        written = write_all(inputs, setup, generate_name=False, source_index=source_index)
+
+    with subtests.test(msg="Written"):
+        assert [read(path) for path in written] == [b"test content"] * 3
+
+    with subtests.test(msg="Sizes from the listing"):
+        head.assert_not_called()
+
+
+def test_iter_write_all_file_not_found(setup: str) -> None:
+    path = os.path.join(setup, "test.file")
+    write(path, b"test content")
+    written = []
+
+    with raises(Exception) as e:
+        for _, written_path in iter_write_all([path, os.path.join(setup, "missing.file")], os.path.join(setup, "target")):
+            written.append(written_path)
+
+    assert str(e.value) == "Not all mandatory source files were written"
+    assert len(written) == 1
+
+
+@mock_aws
+def test_get_size(setup: str) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="test.file", Body=b"test content")
+    path = os.path.join(setup, "test.file")
+    write(path, b"test")
+
+    assert get_size("s3://testbucket/test.file") == 12
+    assert get_size(path) == 4
+    with raises(NoSuchFileError):
+        get_size("s3://testbucket/missing.file")
@@ -0,0 +1,46 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import raises
+from pytest_subtests import SubTests
+from topo_imagery_common.files.hedged_requests import HedgedRequests
+
+
+def slow_tail_request(key: int) -> int:
+    """Stub of a GET request taking 1ms, or 200ms for one request in 20."""
+    time.sleep(0.2 if random.random() < 0.05 else 0.001)
+    return key
+
+
+def test_hedges_slow_requests(subtests: SubTests) -> None:
+    random.seed(1)
+    with HedgedRequests(percentile=0.9, budget=0.1) as hedged_requests:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda key: hedged_requests.call(slow_tail_request, key), range(400)))
+
+    with subtests.test(msg="All results returned"):
+        assert results == list(range(400))
+
+    with subtests.test(msg="Hedges sent within the budget"):
+        assert 0 < hedged_requests.hedges_sent <= 0.1 * 400
+
+    with subtests.test(msg="Hedges won"):
+        assert hedged_requests.hedges_won > 0
+
+
+def test_no_hedges_before_min_samples() -> None:
+    with HedgedRequests(min_samples=20) as hedged_requests:
+        for key in range(10):
+            hedged_requests.call(slow_tail_request, key)
+
+    assert hedged_requests.hedges_sent == 0
+
+
+def test_error_raised() -> None:
+    def fail() -> None:
+        raise ValueError("failed")
+
+    with HedgedRequests() as hedged_requests:
+        with raises(ValueError):
+            hedged_requests.call(fail)
@@ -0,0 +1,107 @@
+from boto3 import client
+from botocore.exceptions import ClientError
+from moto import mock_aws
+from moto.s3.responses import DEFAULT_REGION_NAME
+from mypy_boto3_s3 import S3Client
+from pytest import raises
+from pytest_subtests import SubTests
+from topo_imagery_common.files.fs_s3 import read, write
+from topo_imagery_common.files.io_telemetry import (
+    IoTelemetry,
+    OperationStats,
+    call_with_telemetry,
+    get_io_telemetry,
+    measure,
+    measure_pages,
+    record_retry,
+    set_transferred_bytes,
+)
+
+
+def test_measure(subtests: SubTests) -> None:
+    get_io_telemetry().take()
+
+    with measure("read", "s3://bucket/file.json"):
+        set_transferred_bytes(10)
+        record_retry()
+        # Nested operations are part of the outer one
+        with measure("head", "s3://bucket/file.json"):
+            pass
+    with raises(ValueError):
+        with measure("read", "s3://bucket/other.json"):
+            raise ValueError("error")
+
+    stats = get_io_telemetry().take()
+
+    with subtests.test(msg="Counted by operation and bucket"):
+        assert list(stats) == [("read", "bucket")]
+
+    with subtests.test(msg="Counters"):
+        assert (stats[("read", "bucket")].ops, stats[("read", "bucket")].bytes) == (2, 10)
+        assert (stats[("read", "bucket")].errors, stats[("read", "bucket")].retries) == (1, 1)
+
+    with subtests.test(msg="Reset when taken"):
+        assert not get_io_telemetry().take()
+
+
+def test_merge_and_summary() -> None:
+    telemetry = IoTelemetry()
+    telemetry.record("read", "bucket", 10, size=100)
+    other = IoTelemetry()
+    other.record("read", "bucket", 100, size=100)
+    other.record("exists", "local", 1)
+
+    telemetry.merge(other.take())
+    summary = telemetry.summary()
+
+    assert summary["read"]["bucket"]["ops"] == 2
+    assert summary["read"]["bucket"]["bytes"] == 200
+    assert summary["read"]["bucket"]["p99Ms"] == 100
+    assert summary["exists"]["local"]["ops"] == 1
+
+
+def test_percentile_empty() -> None:
+    assert OperationStats().percentile(0.5) == 0
+
+
+def test_call_with_telemetry() -> None:
+    get_io_telemetry().take()
+
+    def read_file(path: str) -> str:
+        with measure("read", path):
+            return path
+
+    result, stats = call_with_telemetry(read_file, "s3://bucket/file.json")
+
+    assert result == "s3://bucket/file.json"
+    assert stats[("read", "bucket")].ops == 1
+    assert not get_io_telemetry().take()
+
+
+@mock_aws
+def test_fs_s3_instrumented() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    get_io_telemetry().take()
+
+    write("s3://testbucket/test.file", b"test content")
+    read("s3://testbucket/test.file")
+    with raises(ClientError):
+        read("s3://testbucket/missing.file")
+
+    stats = get_io_telemetry().take()
+    assert (stats[("write", "testbucket")].ops, stats[("write", "testbucket")].bytes) == (1, 12)
+    assert (stats[("read", "testbucket")].ops, stats[("read", "testbucket")].bytes) == (2, 12)
+    assert stats[("read", "testbucket")].errors == 1
+
+
+def test_measure_pages(subtests: SubTests) -> None:
+    get_io_telemetry().take()
+
+    pages = list(measure_pages("list", "s3://bucket/prefix/", iter([["a"], ["b"]])))
+
+    with subtests.test(msg="Pages"):
+        assert pages == [["a"], ["b"]]
+
+    with subtests.test(msg="A request per page"):
+        assert get_io_telemetry().take()[("list", "bucket")].ops == 2
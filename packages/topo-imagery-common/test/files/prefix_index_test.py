@@ -0,0 +1,123 @@
+import os
+from typing import Any
+from unittest.mock import patch
+
+from boto3 import client
+from botocore.exceptions import ClientError
+from moto import mock_aws
+from moto.s3.responses import DEFAULT_REGION_NAME
+from mypy_boto3_s3 import S3Client
+from pytest import raises
+from pytest_subtests import SubTests
+from topo_imagery_common.aws.aws_helper import get_s3_client, is_default_access_denied
+from topo_imagery_common.files.fs import write
+from topo_imagery_common.files.prefix_index import FileInfo, PrefixIndex
+
+
+@mock_aws
+def test_exists_s3(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="dir/test.tiff", Body=b"test content")
+    s3_client.put_object(Bucket="testbucket", Key="dir/sub/test.prj", Body=b"test content")
+    s3_client.put_object(Bucket="testbucket", Key="other/test.prj", Body=b"test content")
+
+    index = PrefixIndex(["s3://testbucket/dir/"])
+
+    with subtests.test(msg="File in the directory"):
+        assert index.exists("s3://testbucket/dir/test.tiff")
+
+    with subtests.test(msg="Missing file in the directory"):
+        assert not index.exists("s3://testbucket/dir/test.prj")
+
+    with subtests.test(msg="Sub-directories are not listed"):
+        assert index.files.keys() == {"s3://testbucket/dir/test.tiff"}
+
+    with subtests.test(msg="File outside of the directory"):
+        assert index.exists("s3://testbucket/other/test.prj")
+
+
+@mock_aws
+def test_get_s3(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    etag = s3_client.put_object(Bucket="testbucket", Key="test.tiff", Body=b"test content")["ETag"]
+
+    index = PrefixIndex(["s3://testbucket"])
+
+    with subtests.test(msg="Size and ETag"):
+        assert index.get("s3://testbucket/test.tiff") == FileInfo(len(b"test content"), etag)
+
+    with subtests.test(msg="Missing file"):
+        assert index.get("s3://testbucket/test.prj") is None
+
+    with subtests.test(msg="File outside of the directory"):
+        with raises(ValueError):
+            index.get("s3://testbucket/dir/test.tiff")
+
+
+@mock_aws
+def test_refresh_s3(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    index = PrefixIndex(["s3://testbucket/dir/"])
+    s3_client.put_object(Bucket="testbucket", Key="dir/test.tiff", Body=b"test content")
+
+    with subtests.test(msg="Not listed yet"):
+        assert not index.exists("s3://testbucket/dir/test.tiff")
+
+    index.refresh()
+    with subtests.test(msg="Listed after refresh"):
+        assert index.exists("s3://testbucket/dir/test.tiff")
+
+
+@mock_aws
+def test_bucket_not_found_s3() -> None:
+    index = PrefixIndex(["s3://testbucket/dir/"])
+
+    assert not index.exists("s3://testbucket/dir/test.tiff")
+
+
+@mock_aws
+def test_list_denied_s3(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="dir/test.tiff", Body=b"test content")
+
+    def deny_list(**_kwargs: Any) -> None:
+        raise ClientError({"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, "ListObjectsV2")
+
+    events = get_s3_client().meta.events
+    events.register("before-call.s3.ListObjectsV2", deny_list)
+    try:
+        with patch("topo_imagery_common.files.fs_s3.has_role", return_value=False):
+            index = PrefixIndex(["s3://testbucket/dir/"])
+    finally:
+        events.unregister("before-call.s3.ListObjectsV2", deny_list)
+
+    with subtests.test(msg="Not indexed"):
+        assert not index.covers("s3://testbucket/dir/test.tiff")
+
+    with subtests.test(msg="Looked up on S3"):
+        assert index.exists("s3://testbucket/dir/test.tiff")
+
+    with subtests.test(msg="Bucket not marked as denied"):
+        assert not is_default_access_denied("s3://testbucket/dir/test.tiff")
+
+
+def test_exists_local(setup: str, subtests: SubTests) -> None:
+    write(os.path.join(setup, "test.tiff"), b"test content")
+
+    index = PrefixIndex([setup, os.path.join(setup, "missing")])
+
+    with subtests.test(msg="File in the directory"):
+        assert index.exists(os.path.join(setup, "test.tiff"))
+
+    with subtests.test(msg="Size"):
+        assert index.get(os.path.join(setup, "test.tiff")) == FileInfo(len(b"test content"), None)
+
+    with subtests.test(msg="Missing file"):
+        assert not index.exists(os.path.join(setup, "test.prj"))
+
+    with subtests.test(msg="Missing directory"):
+        assert not index.exists(os.path.join(setup, "missing", "test.tiff"))
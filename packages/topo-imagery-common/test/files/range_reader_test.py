@@ -0,0 +1,93 @@
+import io
+import os
+
+from pytest_subtests import SubTests
+from topo_imagery_common.files.range_reader import RangeReader
+
+
+class RecordingSource:  # pylint: disable=too-few-public-methods
+    """Bytes source recording the ranges read."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+        self.ranges: list[tuple[int, int]] = []
+
+    def read_range(self, start: int, length: int) -> bytes:
+        self.ranges.append((start, length))
+        return self.content[start : start + length]
+
+
+def test_read_matches_content(subtests: SubTests) -> None:
+    content = os.urandom(10_000)
+    reader = RangeReader(RecordingSource(content).read_range, len(content), block_size=1024)
+
+    with subtests.test(msg="Read whole"):
+        assert reader.read() == content
+
+    reader.seek(1000)
+    with subtests.test(msg="Read across blocks"):
+        assert reader.read(100) == content[1000:1100]
+
+    with subtests.test(msg="Position"):
+        assert reader.tell() == 1100
+
+    reader.seek(-5, io.SEEK_END)
+    with subtests.test(msg="Read past the end"):
+        assert reader.read(100) == content[-5:]
+
+    with subtests.test(msg="Read at the end"):
+        assert reader.read(100) == b""
+
+
+def test_small_reads_are_coalesced(subtests: SubTests) -> None:
+    content = os.urandom(100_000)
+    source = RecordingSource(content)
+    reader = RangeReader(source.read_range, len(content), block_size=1024, readahead=4)
+
+    for offset in range(0, 5 * 1024, 16):
+        reader.seek(offset)
+        assert reader.read(16) == content[offset : offset + 16]
+
+    with subtests.test(msg="Single request with readahead"):
+        assert source.ranges == [(0, 5 * 1024)]
+
+    reader.seek(0)
+    reader.read(5 * 1024)
+    with subtests.test(msg="Cached blocks are not read again"):
+        assert len(source.ranges) == 1
+
+
+def test_cache_is_bounded() -> None:
+    content = os.urandom(100_000)
+    source = RecordingSource(content)
+    reader = RangeReader(source.read_range, len(content), block_size=1024, readahead=0, max_blocks=2)
+
+    for offset in (0, 2048, 4096, 0):
+        reader.seek(offset)
+        reader.read(1)
+
+    assert source.ranges == [(0, 1024), (2048, 1024), (4096, 1024), (0, 1024)]
+
+
+def test_read_of_max_blocks(subtests: SubTests) -> None:
+    content = os.urandom(8 * 1024)
+    source = RecordingSource(content)
+    reader = RangeReader(source.read_range, len(content), block_size=256, readahead=4, max_blocks=16)
+    reader.seek(5000)
+    reader.read(10)
+
+    reader.seek(100)
+    with subtests.test(msg="Read of max_blocks blocks"):
+        assert reader.read(16 * 256 - 200) == content[100 : 16 * 256 - 100]
+
+    with subtests.test(msg="No readahead past the cache size"):
+        assert source.ranges[-1] == (0, 16 * 256)
+
+
+def test_large_reads_bypass_cache() -> None:
+    content = os.urandom(100_000)
+    source = RecordingSource(content)
+    reader = RangeReader(source.read_range, len(content), block_size=1024, max_blocks=4)
+
+    assert reader.read(50_000) == content[:50_000]
+    assert source.ranges == [(0, 50_000)]
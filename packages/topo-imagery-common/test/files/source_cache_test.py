@@ -0,0 +1,135 @@
+import os
+import stat
+from functools import partial
+from multiprocessing import get_context
+
+from pytest import MonkeyPatch, raises
+from pytest_subtests import SubTests
+from topo_imagery_common.files import fs, source_cache
+from topo_imagery_common.files.fs_local import read, write
+from topo_imagery_common.files.source_cache import SourceCache, unshare
+
+
+def _fetch(content: bytes, fetch_log: str, path: str) -> None:
+    with open(fetch_log, "a", encoding="utf-8") as log:
+        log.write(f"{path}\n")
+    write(path, content)
+
+
+def test_get_fetches_once(setup: str, subtests: SubTests) -> None:
+    cache = SourceCache(os.path.join(setup, "cache"), max_bytes=1024)
+    fetch_log = os.path.join(setup, "fetch.log")
+    fetch = partial(_fetch, b"test content", fetch_log)
+
+    first = cache.get("s3://bucket/test.tiff:etag", os.path.join(setup, "a", "test.tiff"), fetch)
+    second = cache.get("s3://bucket/test.tiff:etag", os.path.join(setup, "b", "test.tiff"), fetch)
+
+    with subtests.test(msg="Fetched once"):
+        assert len(read(fetch_log).splitlines()) == 1
+
+    with subtests.test(msg="Same content"):
+        assert read(first) == read(second) == b"test content"
+
+    with subtests.test(msg="Hard linked to the cache"):
+        assert os.stat(first).st_ino == os.stat(second).st_ino
+
+    with subtests.test(msg="Read-only"):
+        assert stat.S_IMODE(os.stat(first).st_mode) == 0o444
+
+
+def test_get_fetches_new_version(setup: str) -> None:
+    cache = SourceCache(os.path.join(setup, "cache"), max_bytes=1024)
+    fetch_log = os.path.join(setup, "fetch.log")
+
+    cache.get("s3://bucket/test.tiff:etag1", os.path.join(setup, "test.tiff"), partial(_fetch, b"v1", fetch_log))
+    cache.get("s3://bucket/test.tiff:etag2", os.path.join(setup, "test.tiff"), partial(_fetch, b"v2", fetch_log))
+
+    assert read(os.path.join(setup, "test.tiff")) == b"v2"
+
+
+def test_evict_least_recently_used(setup: str, subtests: SubTests) -> None:
+    cache_path = os.path.join(setup, "cache")
+    cache = SourceCache(cache_path, max_bytes=20)
+    fetch_log = os.path.join(setup, "fetch.log")
+
+    for key in ["a", "b", "a", "c"]:
+        cache.get(key, os.path.join(setup, key), partial(_fetch, b"0123456789", fetch_log))
+        # Age the cache entries so the next access is always more recent
+        for entry in os.scandir(cache_path):
+            os.utime(entry.path, ns=(entry.stat().st_atime_ns - 10**9, entry.stat().st_mtime_ns - 10**9))
+
+    with subtests.test(msg="b has been evicted"):
+        assert len(read(fetch_log).splitlines()) == 3
+        cache.get("b", os.path.join(setup, "b"), partial(_fetch, b"0123456789", fetch_log))
+        assert len(read(fetch_log).splitlines()) == 4
+
+    with subtests.test(msg="Linked file is kept"):
+        assert read(os.path.join(setup, "c")) == b"0123456789"
+
+    with subtests.test(msg="Lock files removed with their entry"):
+        entries = [entry for entry in os.listdir(cache_path) if "." not in entry]
+        locks = [
+            entry
+            for entry in os.listdir(cache_path)
+            if entry.endswith(source_cache.LOCK_SUFFIX) and entry != source_cache.EVICTION_LOCK
+        ]
+        assert sorted(locks) == sorted(f"{entry}{source_cache.LOCK_SUFFIX}" for entry in entries)
+
+
+def test_get_failed_fetch(setup: str) -> None:
+    cache_path = os.path.join(setup, "cache")
+    cache = SourceCache(cache_path, max_bytes=1024)
+
+    def fail(_path: str) -> None:
+        raise FileNotFoundError("missing")
+
+    with raises(FileNotFoundError):
+        cache.get("key", os.path.join(setup, "test.tiff"), fail)
+
+    assert not os.listdir(cache_path)
+
+
+def _get_from_cache(cache_path: str, fetch_log: str, destination: str) -> bytes:
+    SourceCache(cache_path, max_bytes=1024).get("key", destination, partial(_fetch, b"test content", fetch_log))
+    return read(destination)
+
+
+def test_get_concurrent_processes(setup: str, subtests: SubTests) -> None:
+    fetch_log = os.path.join(setup, "fetch.log")
+    destinations = [os.path.join(setup, str(i), "test.tiff") for i in range(8)]
+
+    with get_context("fork").Pool(4) as pool:
+        contents = pool.map(partial(_get_from_cache, os.path.join(setup, "cache"), fetch_log), destinations)
+
+    with subtests.test(msg="Fetched once"):
+        assert len(read(fetch_log).splitlines()) == 1
+
+    with subtests.test():
+        assert contents == [b"test content"] * 8
+
+
+def test_unshare(setup: str, subtests: SubTests) -> None:
+    cache = SourceCache(os.path.join(setup, "cache"), max_bytes=1024)
+    fetch = partial(_fetch, b"test content", os.path.join(setup, "fetch.log"))
+    path = cache.get("key", os.path.join(setup, "a", "test.tiff"), fetch)
+
+    unshare(path)
+    with open(path, "r+b") as file:
+        file.write(b"edit")
+
+    with subtests.test(msg="Edit does not alter the cache"):
+        assert read(cache.get("key", os.path.join(setup, "b", "test.tiff"), fetch)) == b"test content"
+
+    with subtests.test():
+        assert read(path) == b"edit content"
+
+
+def test_fs_fetch_through_cache(setup: str, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(source_cache, "SOURCE_CACHE_PATH", os.path.join(setup, "cache"))
+    source = os.path.join(setup, "source.tiff")
+    write(source, b"test content")
+
+    first = fs.fetch(source, os.path.join(setup, "a", "source.tiff"))
+    second = fs.fetch(source, os.path.join(setup, "b", "source.tiff"))
+
+    assert os.stat(first).st_ino == os.stat(second).st_ino
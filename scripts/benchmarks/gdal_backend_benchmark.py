@@ -0,0 +1,99 @@
+"""Compare running the GDAL commands as subprocesses with running them in process through the `osgeo.gdal` bindings.
+
+Each command is built by `gdal_commands` and run on the test fixtures with `run_gdal`, once per backend (see `GdalBackend`).
+
+Usage:
+    uv run python -m scripts.benchmarks.gdal_backend_benchmark --iterations 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+
+from scripts.gdal import gdal_bindings
+from scripts.gdal.gdal_commands import (
+    get_alpha_command,
+    get_build_vrt_command,
+    get_gdal_command,
+    get_hillshade_command,
+    get_thumbnail_command,
+)
+from scripts.gdal.gdal_helper import GdalBackend, run_gdal
+from scripts.gdal.gdal_presets import CompressionPreset, HillshadePreset
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+AERIAL = os.path.join(DATA_PATH, "input_aerial.tif")
+DEM = os.path.join(DATA_PATH, "input_dem_01.tif")
+
+
+def _report(name: str, function: Callable[[GdalBackend], object], iterations: int) -> None:
+    durations: dict[GdalBackend, float] = {}
+    for backend in GdalBackend:
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            function(backend)
+        durations[backend] = (time.perf_counter() - start_time) / iterations * 1000
+    print(
+        f"{name:<16} {durations[GdalBackend.SUBPROCESS]:10.1f} ms {durations[GdalBackend.BINDINGS]:10.1f} ms"
+        f" {durations[GdalBackend.SUBPROCESS] / durations[GdalBackend.BINDINGS]:8.1f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10, help="Number of runs of each command and backend")
+    arguments = parser.parse_args()
+    if not gdal_bindings.is_available():
+        parser.error("the osgeo.gdal Python bindings are not installed")
+
+    with tempfile.TemporaryDirectory() as tmp_path:
+        vrt = os.path.join(tmp_path, "source.vrt")
+        alpha_vrt = os.path.join(tmp_path, "alpha.vrt")
+        print(f"{'command':<16} {'subprocess':>13} {'bindings':>13} {'speed up':>9}")
+        _report(
+            "gdalinfo",
+            lambda backend: run_gdal(["gdalinfo", "-json", "--config", "GDAL_PAM_ENABLED", "NO"], AERIAL, backend=backend),
+            arguments.iterations,
+        )
+        _report(
+            "gdalsrsinfo",
+            lambda backend: run_gdal(["gdalsrsinfo", "-o", "wkt", "EPSG:2193"], backend=backend),
+            arguments.iterations,
+        )
+        _report(
+            "gdalbuildvrt",
+            lambda backend: run_gdal(get_build_vrt_command([AERIAL], vrt), backend=backend),
+            arguments.iterations,
+        )
+        _report(
+            "gdalwarp",
+            lambda backend: run_gdal(get_alpha_command(), vrt, alpha_vrt, backend=backend),
+            arguments.iterations,
+        )
+        _report(
+            "gdal_translate",
+            lambda backend: run_gdal(
+                get_gdal_command(CompressionPreset.WEBP.value, 2193), alpha_vrt, os.path.join(tmp_path, "cog.tiff"), backend
+            ),
+            arguments.iterations,
+        )
+        _report(
+            "thumbnail",
+            lambda backend: run_gdal(
+                get_thumbnail_command("jpeg", AERIAL, os.path.join(tmp_path, "thumbnail.jpg"), "50%", "50%"), backend=backend
+            ),
+            arguments.iterations,
+        )
+        _report(
+            "gdaldem",
+            lambda backend: run_gdal(
+                get_hillshade_command(HillshadePreset.DEFAULT.value), DEM, os.path.join(tmp_path, "hillshade.tiff"), backend
+            ),
+            arguments.iterations,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
 import argparse
+import asyncio
 import json
 import os
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Any, List
 
-from boto3 import client
 from linz_logger import get_log
+from topo_imagery_common.aws.aws_helper import get_s3_client
 from topo_imagery_common.cli.cli_helper import (
     coalesce_multi_single,
     empty_str_to_false,
@@ -17,7 +18,10 @@ from topo_imagery_common.cli.cli_helper import (
 from topo_imagery_common.cli.common_args import CommonArgumentParser
 from topo_imagery_common.datetimes import RFC_3339_DATETIME_FORMAT
 from topo_imagery_common.files.files_helper import SUFFIX_JSON
-from topo_imagery_common.files.fs_s3 import bucket_name_from_path, get_object_parallel_multithreading, list_files_in_uri, read
+from topo_imagery_common.files.fs import write_io_telemetry_summary
+from topo_imagery_common.files.fs_async import aread_many
+from topo_imagery_common.files.fs_s3 import bucket_name_from_path, iter_files_in_uri, prefix_from_path, read
+from topo_imagery_common.files.hedged_requests import HedgedRequests
 from topo_imagery_common.log.time_helper import time_in_ms
 
 from scripts.gdal.gdal_footprint import SUFFIX_FOOTPRINT
@@ -115,7 +119,30 @@ def get_args_parser() -> CommonArgumentParser:
     )
     parser.add_argument("--licensor-list", dest="licensor_list", help="Semicolon delimited list of imagery licensors")
     parser.add_argument(
-        "--concurrency", dest="concurrency", help="The number of files to limit concurrent reads", required=True, type=int
+        "--concurrency",
+        dest="concurrency",
+        help=(
+            "The number of files to limit concurrent reads. "
+            "Also limited per bucket by ASYNC_CONCURRENCY_PER_BUCKET and TRANSFER_MAX_CONCURRENCY (32 by default)."
+        ),
+        required=True,
+        type=int,
+    )
+    parser.add_argument(
+        "--list-concurrency",
+        dest="list_concurrency",
+        help="The number of sub-directories of the uri to list in parallel",
+        required=False,
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--hedge-requests",
+        dest="hedge_requests",
+        help="Send a duplicate of the slowest item reads to reduce the tail latency.",
+        type=str_to_bool,
+        required=False,
+        default=False,
     )
     parser.add_argument(
         "--add-title-suffix",
@@ -187,7 +214,7 @@ def get_args_parser() -> CommonArgumentParser:
     return parser
 
 
-# pylint: disable=too-many-locals
+# pylint: disable=too-many-locals,too-many-statements
 def main(args: List[str] | None = None) -> None:
     start_time = time_in_ms()
     parser = get_args_parser()
@@ -207,11 +234,9 @@ def main(args: List[str] | None = None) -> None:
         supplied_capture_area = capture_dates_path
         get_log().info("Using capture dates file to generate capture area", capture_dates_path=capture_dates_path)
 
-    s3_client: S3Client = client("s3")
+    s3_client: S3Client = get_s3_client()
 
-    files_to_read = list_files_in_uri(uri, [SUFFIX_JSON, SUFFIX_FOOTPRINT], s3_client)
-
-    items_to_add = []
+    items_to_add: list[dict[str, Any]] = []
     polygons = []
 
     if supplied_capture_area:
@@ -220,37 +245,52 @@ def main(args: List[str] | None = None) -> None:
         for feature in features:
             polygons.append(get_geometry_from_geojson_feature(feature, supplied_capture_area))
 
-    for key, result in get_object_parallel_multithreading(
-        bucket_name_from_path(uri), files_to_read, s3_client, arguments.concurrency
-    ):
-        content = json.load(result["Body"])
-        # The following if/else looks like it could be avoided by refactoring `list_files_in_uri()`
-        # to return a result list per suffix, but we would have to call `get_object_parallel_multithreading()`
-        # for each of them to avoid this if/else.
-        if key.endswith(SUFFIX_JSON):
-            if content["type"] != "Feature":
-                get_log().warn(
-                    "skipping: not a STAC item",
-                    file=key,
-                    action="collection_from_items",
-                    reason="skip",
-                )
-                continue
-            item_collection_id = content.get("collection")
-            if collection_id != item_collection_id:
-                get_log().warn(
-                    f"skipping: {item_collection_id} and {collection_id} do not match",
-                    file=key,
-                    action="collection_from_items",
-                    reason="skip",
-                )
-                continue
-            items_to_add.append(content)
-            get_log().info("Item will be added to Collection", item=content["id"], file=key)
-        elif key.endswith(SUFFIX_FOOTPRINT) and not supplied_capture_area:
-            features = get_non_empty_features(content, key)
-            for feature in features:
-                polygons.append(get_geometry_from_geojson_feature(feature, key))
+    async def load_files() -> int:
+        files_read = 0
+        bucket = bucket_name_from_path(uri)
+        # Reading starts with the first listing page
+        paths = (
+            f"s3://{bucket}/{key}"
+            for files in iter_files_in_uri(uri, [SUFFIX_JSON, SUFFIX_FOOTPRINT], s3_client, arguments.list_concurrency)
+            for keys in files.values()
+            for key in keys
+        )
+        async for path, data in aread_many(paths, arguments.concurrency, hedged_requests):
+            files_read += 1
+            key = prefix_from_path(path)
+            content = json.loads(data)
+            # The following if/else looks like it could be avoided by using the keys by suffix of `iter_files_in_uri()`,
+            # but we would have to call `aread_many()` for each of them to avoid this if/else.
+            if key.endswith(SUFFIX_JSON):
+                if content["type"] != "Feature":
+                    get_log().warn(
+                        "skipping: not a STAC item",
+                        file=key,
+                        action="collection_from_items",
+                        reason="skip",
+                    )
+                    continue
+                item_collection_id = content.get("collection")
+                if collection_id != item_collection_id:
+                    get_log().warn(
+                        f"skipping: {item_collection_id} and {collection_id} do not match",
+                        file=key,
+                        action="collection_from_items",
+                        reason="skip",
+                    )
+                    continue
+                items_to_add.append(content)
+                get_log().info("Item will be added to Collection", item=content["id"], file=key)
+            elif key.endswith(SUFFIX_FOOTPRINT) and not supplied_capture_area:
+                features = get_non_empty_features(content, key)
+                for feature in features:
+                    polygons.append(get_geometry_from_geojson_feature(feature, key))
+        return files_read
+
+    hedged_requests = HedgedRequests() if arguments.hedge_requests else None
+    files_read = asyncio.run(load_files())
+    if hedged_requests:
+        hedged_requests.close()
 
     if len(items_to_add) == 0:
         get_log().error(
@@ -291,10 +331,11 @@ def main(args: List[str] | None = None) -> None:
 
     destination = os.path.join(uri, COLLECTION_FILE_NAME)
     collection.write_to(destination)
+    write_io_telemetry_summary(uri)
 
     get_log().info(
         "Collection created",
-        item_count=len(files_to_read),
+        item_count=files_read,
         item_match_count=items_to_add,
         duration=time_in_ms() - start_time,
         destination=destination,
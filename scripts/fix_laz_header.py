@@ -156,7 +156,8 @@ def pdal_fix_laz_header(
 
         run_pdal(pdal_translate_add_proj_command, input_file=tmp_file_in, output_file=tmp_file_out)
 
-        copy(source=tmp_file_out, target=target_file)  # copy back to target location (S3 or local) before comparing
+        # copy back to target location (S3 or local) before comparing
+        copy(source=tmp_file_out, target=target_file, skip_unchanged=True)
 
         if not force and filecmp.cmp(tmp_file_in, tmp_file_out, shallow=False):
             get_log().info("No changes made to file.", path=source_file)
@@ -1,8 +1,8 @@
 from linz_logger import get_log
 
-from scripts.gdal.gdal_helper import gdal_info
 from scripts.gdal.gdal_presets import CompressionPreset
 from scripts.gdal.gdalinfo import GdalInfo, GdalInfoBand
+from scripts.tiff.tiff_header import tiff_header_info
 
 
 def find_band(bands: list[GdalInfoBand], color: str) -> GdalInfoBand | None:
@@ -75,7 +75,7 @@ def get_palette_band_args(band: GdalInfoBand, file: str) -> list[str]:
         ...
         RuntimeError: palette_band_missing_colorTable
     """
-    if colour_table := band["colorTable"]:
+    if colour_table := band.get("colorTable"):
         palette_channels = len(colour_table["entries"][0])
         if palette_channels in (3, 4):
             return ["-expand", "rgba" if palette_channels == 4 else "rgb"]
@@ -121,7 +121,7 @@ def get_gdal_band_offset(file: str, info: GdalInfo | None = None, preset: str |
 
     Args:
         file: file to check
-        info: optional precomputed gdalinfo
+        info: optional precomputed gdalinfo. Defaults to None which reads the bands from the TIFF header (see `tiff_header_info`).
         preset: TIFF compression preset for the dataset.
                 "dem_lerc" preset used to differentiate single band elevation tiffs from
                 single band historical imagery, "rgbnir_zstd" preset used to identify NIR
@@ -130,7 +130,7 @@ def get_gdal_band_offset(file: str, info: GdalInfo | None = None, preset: str |
         list of band mappings eg "-b 1 -b 1 -b 1"
     """
     if info is None:
-        info = gdal_info(file)
+        info = tiff_header_info(file)
 
     bands = info["bands"]
 
@@ -164,13 +164,13 @@ def get_gdal_band_type(file: str, info: GdalInfo | None = None) -> str:
 
     Args:
         file: file to check
-        info: optional precomputed gdalinfo
+        info: optional precomputed gdalinfo. Defaults to None which reads the bands from the TIFF header (see `tiff_header_info`).
 
     Returns:
         band type
     """
     if info is None:
-        info = gdal_info(file)
+        info = tiff_header_info(file)
 
     bands = info["bands"]
     return bands[0]["type"]
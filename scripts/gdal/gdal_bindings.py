@@ -0,0 +1,231 @@
+"""Run the GDAL commands built by `gdal_commands` in process, through the `osgeo.gdal` utility functions,
+instead of starting a GDAL program for each of them (see `gdal_helper.run_gdal`).
+"""
+
+import re
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from typing import Any
+
+try:
+    from osgeo import gdal, osr
+except ImportError:
+    gdal = osr = None
+
+OPTION_VALUE_COUNTS: dict[str, int] = {
+    "-a_nodata": 1,
+    "-a_srs": 1,
+    "-alt": 1,
+    "-az": 1,
+    "-b": 1,
+    "-co": 1,
+    "-cutline": 1,
+    "-expand": 1,
+    "-lco": 1,
+    "-max_points": 1,
+    "-md": 1,
+    "-mo": 1,
+    "-o": 1,
+    "-of": 1,
+    "-ot": 1,
+    "-outsize": 2,
+    "-r": 1,
+    "-resolution": 1,
+    "-s_srs": 1,
+    "-simplify": 1,
+    "-srcwin": 4,
+    "-t_srs": 1,
+    "-tr": 2,
+    "-wo": 1,
+}
+"""Number of values of the GDAL options used by `gdal_commands` and `gdal_presets`. Other options have no value."""
+VARIABLE_VALUE_OPTIONS = {"-scale": 4}
+"""Options with up to this number of numeric values"""
+_COLORINTERP_OPTION = re.compile(r"^-colorinterp_\d+$")
+_NUMBER = re.compile(r"^-?\d+(\.\d+)?$")
+_cache_max_mb: int | None = None
+"""Size of the GDAL block cache set in this process, in MB"""
+
+
+def is_available() -> bool:
+    """Check if the `osgeo.gdal` Python bindings are installed.
+
+    Returns:
+        True if GDAL commands can run in process
+    """
+    return gdal is not None
+
+
+def split_command(arguments: list[str]) -> tuple[list[str], list[str], dict[str, str]]:
+    """Split the arguments of a GDAL command into its options, its positional arguments (files) and its configuration options.
+
+    Args:
+        arguments: the arguments of the command, without the program name
+
+    Returns:
+        the options, the positional arguments and the `--config` options
+
+    Examples:
+        >>> split_command(["-of", "VRT", "-dstalpha", "input.tiff", "output.vrt"])
+        (['-of', 'VRT', '-dstalpha'], ['input.tiff', 'output.vrt'], {})
+        >>> split_command(["-scale", "0", "255", "0", "254", "-a_nodata", "255", "in.tiff", "out.tiff"])
+        (['-scale', '0', '255', '0', '254', '-a_nodata', '255'], ['in.tiff', 'out.tiff'], {})
+        >>> split_command(["-json", "--config", "GDAL_PAM_ENABLED", "NO", "file.tiff"])
+        (['-json'], ['file.tiff'], {'GDAL_PAM_ENABLED': 'NO'})
+    """
+    options: list[str] = []
+    files: list[str] = []
+    config: dict[str, str] = {}
+    index = 0
+    while index < len(arguments):
+        argument = arguments[index]
+        index += 1
+        if argument == "--config":
+            config[arguments[index]] = arguments[index + 1]
+            index += 2
+        elif argument in VARIABLE_VALUE_OPTIONS:
+            end = index
+            while end < len(arguments) and end - index < VARIABLE_VALUE_OPTIONS[argument] and _NUMBER.match(arguments[end]):
+                end += 1
+            options.extend(arguments[index - 1 : end])
+            index = end
+        elif argument.startswith("-") and not _NUMBER.match(argument):
+            value_count = 1 if _COLORINTERP_OPTION.match(argument) else OPTION_VALUE_COUNTS.get(argument, 0)
+            options.extend(arguments[index - 1 : index + value_count])
+            index += value_count
+        else:
+            files.append(argument)
+    return options, files, config
+
+
+def _close(dataset: Any) -> None:
+    """Flush and close the dataset returned by a GDAL utility function."""
+    if hasattr(dataset, "Close"):
+        dataset.Close()
+
+
+def _info(options: list[str], files: list[str]) -> str:
+    return str(gdal.Info(files[0], options=options))
+
+
+def _translate(options: list[str], files: list[str]) -> str:
+    _close(gdal.Translate(files[1], files[0], options=options))
+    return ""
+
+
+def _warp(options: list[str], files: list[str]) -> str:
+    _close(gdal.Warp(files[-1], files[:-1], options=options))
+    return ""
+
+
+def _build_vrt(options: list[str], files: list[str]) -> str:
+    _close(gdal.BuildVRT(files[0], files[1:], options=options))
+    return ""
+
+
+def _dem(options: list[str], files: list[str]) -> str:
+    processing, source, destination = files
+    _close(gdal.DEMProcessing(destination, source, processing, options=options))
+    return ""
+
+
+def _footprint(options: list[str], files: list[str]) -> str:
+    _close(gdal.Footprint(files[1], files[0], options=options))
+    return ""
+
+
+def _srs_info(options: list[str], files: list[str]) -> str:
+    if options != ["-o", "wkt"]:
+        raise RuntimeError(f"gdalsrsinfo options not supported in process: {options}")
+    if gdal.VSIStatL(files[0]) is not None:
+        spatial_reference = gdal.Open(files[0]).GetSpatialRef()
+    else:
+        spatial_reference = osr.SpatialReference()
+        spatial_reference.SetFromUserInput(files[0])
+    return f"{spatial_reference.ExportToWkt(['FORMAT=WKT2_2019', 'MULTILINE=YES'])}\n"
+
+
+PROGRAMS: dict[str, Callable[[list[str], list[str]], str]] = {
+    "gdalinfo": _info,
+    "gdal_translate": _translate,
+    "gdalwarp": _warp,
+    "gdalbuildvrt": _build_vrt,
+    "gdaldem": _dem,
+    "gdal_footprint": _footprint,
+    "gdalsrsinfo": _srs_info,
+}
+"""GDAL programs which can run in process.
+The others, like the `gdal_edit` and `gdal_fillnodata` Python scripts, run in a subprocess."""
+
+
+def is_supported(command: list[str]) -> bool:
+    """Check if a GDAL command can run in process.
+
+    Args:
+        command: the GDAL command, starting with the program name
+
+    Returns:
+        True if the bindings are installed and the program has an equivalent utility function
+
+    Examples:
+        >>> is_supported(["gdal_edit", "-colorinterp_4", "NIR", "file.tiff"])
+        False
+    """
+    return is_available() and command[0] in PROGRAMS
+
+
+def set_cache_max(cache_max_mb: int) -> None:
+    """Set the size of the GDAL block cache of this process.
+    `GDAL_CACHEMAX` is only read when the cache is first used, so it has no effect as the configuration option of a command.
+
+    Args:
+        cache_max_mb: size of the cache in MB
+    """
+    global _cache_max_mb  # pylint: disable=global-statement
+    if cache_max_mb != _cache_max_mb:
+        gdal.SetCacheMax(cache_max_mb * 1024 * 1024)
+        _cache_max_mb = cache_max_mb
+
+
+@contextmanager
+def _capture_messages() -> Generator[list[str], None, None]:
+    """Collect the messages GDAL reports, like warnings, formatted as the GDAL programs write them to their standard error.
+    With exceptions enabled, the errors are raised instead."""
+    messages: list[str] = []
+
+    def handler(error_class: int, error_number: int, message: str) -> None:
+        if error_class == gdal.CE_Warning:
+            messages.append(f"Warning {error_number}: {message}\n")
+        elif error_class in (gdal.CE_Failure, gdal.CE_Fatal):
+            messages.append(f"ERROR {error_number}: {message}\n")
+        else:
+            messages.append(f"{message}\n")
+
+    gdal.PushErrorHandler(handler)
+    try:
+        yield messages
+    finally:
+        gdal.PopErrorHandler()
+
+
+def run(command: list[str], config: dict[str, str] | None = None) -> tuple[bytes, bytes]:
+    """Run a GDAL command in process.
+
+    Args:
+        command: the GDAL command, starting with the program name, including its input and output files
+        config: GDAL configuration options to set while the command runs, in addition to its `--config` options.
+            `GDAL_CACHEMAX`, in MB, is set once for the process instead (see `set_cache_max`). Defaults to None.
+
+    Raises:
+        RuntimeError: if the command fails
+
+    Returns:
+        what the program would have written to its standard output and to its standard error
+    """
+    options, files, command_config = split_command(command[1:])
+    config = {**(config or {}), **command_config}
+    if config.get("GDAL_CACHEMAX", "").isdigit():
+        set_cache_max(int(config.pop("GDAL_CACHEMAX")))
+    with gdal.ExceptionMgr(useExceptions=True), gdal.config_options(config), _capture_messages() as messages:
+        stdout = PROGRAMS[command[0]](options, files)
+    return stdout.encode("utf-8"), "".join(messages).encode("utf-8")
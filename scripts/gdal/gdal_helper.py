@@ -1,24 +1,79 @@
+import copy
 import json
 import os
 import subprocess
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
+from os import environ
 from shutil import rmtree
 from tempfile import mkdtemp
+from threading import Lock
 from typing import cast
 
+from botocore.exceptions import ClientError
 from linz_logger import get_log
-from topo_imagery_common.aws.aws_helper import is_s3
+from topo_imagery_common.aws.aws_helper import get_session_credentials, is_default_access_denied, is_s3
 from topo_imagery_common.files.files_helper import get_file_name_from_path
-from topo_imagery_common.files.fs import copy
+from topo_imagery_common.files.fs import fetch
+from topo_imagery_common.files.fs_s3 import head
 from topo_imagery_common.log.time_helper import time_in_ms
 
+from scripts.gdal import gdal_bindings
+from scripts.gdal.gdal_resources import get_gdal_resources
 from scripts.gdal.gdalinfo import GdalInfo
 
 
+class GdalBackend(str, Enum):
+    SUBPROCESS = "subprocess"
+    """Run each GDAL command as a GDAL program"""
+    BINDINGS = "bindings"
+    """Run the GDAL commands in process, through the `osgeo.gdal` Python bindings (see `gdal_bindings`)"""
+
+
+GDALINFO_CACHE_SIZE = int(environ.get("GDALINFO_CACHE_SIZE", "256"))
+"""Number of `gdal_info` results kept in memory by each process. 0 disables the cache."""
+GDAL_BACKEND = GdalBackend(environ.get("GDAL_BACKEND", GdalBackend.SUBPROCESS.value))
+"""How `run_gdal` runs the GDAL commands. The commands not supported by the bindings backend always run as a subprocess."""
+
+GDAL_VSIS3_INPUTS = environ.get("GDAL_VSIS3_INPUTS", "false").lower() == "true"
+"""Pass the S3 inputs of the `HEADER_ONLY_COMMANDS` to GDAL as `/vsis3/` paths instead of downloading them.
+Defaults to False."""
+HEADER_ONLY_COMMANDS = ("gdalinfo", "gdalsrsinfo")
+"""GDAL programs which only read the header of their input. The other programs read the whole input,
+so it is downloaded, through the source cache, before running them."""
+VSIS3_CONFIG = {
+    # Do not list the "directory" of the file, which can hold thousands of objects, when opening it
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "VSI_CACHE": "TRUE",
+    "VSI_CACHE_SIZE": environ.get("GDAL_VSI_CACHE_SIZE", str(64 * 1024 * 1024)),
+}
+"""GDAL configuration options to read `/vsis3/` inputs"""
+
+if GDAL_BACKEND == GdalBackend.BINDINGS and not gdal_bindings.is_available():
+    get_log().warning("gdal_bindings_not_installed", backend=GDAL_BACKEND.value)
+
+
 class GDALExecutionException(Exception):
     pass
 
 
+@dataclass
+class GdalInfoCacheStats:
+    """Counters of the `gdal_info` cache."""
+
+    hits: int = 0
+    """Number of `gdalinfo` subprocesses avoided"""
+    misses: int = 0
+    """Number of `gdalinfo` subprocesses run"""
+
+
+_gdal_info_cache: OrderedDict[str, tuple[str, GdalInfo]] = OrderedDict()
+"""`gdal_info` results by path, with the version of the file they have been computed for"""
+_gdal_info_cache_lock = Lock()
+_gdal_info_cache_stats = GdalInfoCacheStats()
+
+
 class EpsgNumber(int, Enum):
     NZTM_2000 = 2193
     """New Zealand Transverse Mercator 2000"""
@@ -57,13 +112,16 @@ def run_gdal(
     command: list[str],
     input_file: str | None = None,
     output_file: str | None = None,
+    backend: GdalBackend | None = None,
 ) -> "subprocess.CompletedProcess[bytes]":
     """Run the GDAL command. The permissions to access to the input file are applied to the gdal environment.
+    S3 input files are downloaded, unless `GDAL_VSIS3_INPUTS` is set and the command only reads their header.
 
     Args:
         command: each arguments of the GDAL command
         input_file: the input file path
         output_file: the output file path
+        backend: how to run the command. Defaults to None which uses `GDAL_BACKEND`.
 
     Raises:
         CalledProcessError is raised if something goes wrong during the execution of the command
@@ -72,24 +130,42 @@ def run_gdal(
         subprocess.CompletedProcess: the output process.
     """
     gdal_env = os.environ.copy()
+    gdal_config: dict[str, str] = {}
     temp_command = command.copy()
     temp_dir = None
 
+    if resources := get_gdal_resources():
+        # Limit the command to the share of the node of this worker
+        gdal_config.update(resources.to_config())
+        temp_command = resources.apply_to_command(temp_command)
+
     if input_file:
-        if is_s3(input_file):
-            # Download the file from S3
+        if is_s3(input_file) and GDAL_VSIS3_INPUTS and command[0] in HEADER_ONLY_COMMANDS:
+            # GDAL only reads the parts of the file it needs
+            gdal_config.update(get_vsis3_config(input_file))
+            input_file = get_vfs_path(input_file)
+        elif is_s3(input_file):
+            # Download the file from S3, or get it from the source cache
             temp_dir = mkdtemp()
-            input_file = copy(source=input_file, target=os.path.join(temp_dir, get_file_name_from_path(input_file)))
+            input_file = fetch(source=input_file, local_path=os.path.join(temp_dir, get_file_name_from_path(input_file)))
 
         temp_command.append(input_file)
 
     if output_file:
         temp_command.append(output_file)
 
+    gdal_env.update(gdal_config)
     start_time = time_in_ms()
     try:
         get_log().debug("run_gdal_start", command=command_to_string(temp_command))
-        proc = subprocess.run(temp_command, env=gdal_env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        if (backend or GDAL_BACKEND) == GdalBackend.BINDINGS and gdal_bindings.is_supported(temp_command):
+            stdout, stderr = gdal_bindings.run(temp_command, gdal_config)
+            proc = subprocess.CompletedProcess(temp_command, 0, stdout=stdout, stderr=stderr)
+        else:
+            proc = subprocess.run(temp_command, env=gdal_env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    except RuntimeError as error:
+        get_log().error("run_gdal_failed", command=command_to_string(temp_command), error=str(error))
+        raise GDALExecutionException(f"GDAL {str(error)}") from error
     except subprocess.CalledProcessError as cpe:
         get_log().error("run_gdal_failed", command=command_to_string(temp_command), error=str(cpe.stderr, "utf-8"))
         raise GDALExecutionException(f"GDAL {str(cpe.stderr, 'utf-8')}") from cpe
@@ -107,6 +183,28 @@ def run_gdal(
     return proc
 
 
+def get_vsis3_config(path: str) -> dict[str, str]:
+    """Get the GDAL configuration options to read a S3 file as a `/vsis3/` path (see `VSIS3_CONFIG`),
+    with the credentials of the assumed role of its bucket if the default credentials are denied access to it.
+
+    Args:
+        path: a S3 path
+
+    Returns:
+        the GDAL configuration options, to set as environment variables of a GDAL program
+    """
+    # Finds out if the default credentials are denied access to the bucket, as the other S3 reads do
+    head(path)
+    config = dict(VSIS3_CONFIG)
+    if is_default_access_denied(path):
+        credentials = get_session_credentials(path)
+        config["AWS_ACCESS_KEY_ID"] = credentials.access_key
+        config["AWS_SECRET_ACCESS_KEY"] = credentials.secret_key
+        if credentials.token:
+            config["AWS_SESSION_TOKEN"] = credentials.token
+    return config
+
+
 def get_srs() -> bytes:
     """Run `gdalsrsinfo` with the EPSG code `2193`
 
@@ -127,6 +225,8 @@ def get_srs() -> bytes:
 
 def gdal_info(path: str) -> GdalInfo:
     """run gdalinfo on the provided file
+    The result is cached by path, and reused as long as the size and modification time of the file
+    (or its `ETag` on S3) do not change. Call `invalidate_gdal_info` after editing a file in place.
 
     Args:
         path: path to file to gdalinfo
@@ -134,6 +234,68 @@ def gdal_info(path: str) -> GdalInfo:
     Returns:
         GdalInfo output
     """
+    version = _get_file_version(path) if GDALINFO_CACHE_SIZE > 0 else None
+    if version is not None:
+        with _gdal_info_cache_lock:
+            cached = _gdal_info_cache.get(path)
+            if cached is not None and cached[0] == version:
+                _gdal_info_cache.move_to_end(path)
+                _gdal_info_cache_stats.hits += 1
+                # Callers may update the result, the cached one must not change
+                return copy.deepcopy(cached[1])
+
+    info = _run_gdal_info(path)
+    with _gdal_info_cache_lock:
+        _gdal_info_cache_stats.misses += 1
+        if version is not None:
+            _gdal_info_cache[path] = (version, copy.deepcopy(info))
+            _gdal_info_cache.move_to_end(path)
+            while len(_gdal_info_cache) > GDALINFO_CACHE_SIZE:
+                _gdal_info_cache.popitem(last=False)
+    return info
+
+
+def invalidate_gdal_info(path: str | None = None) -> None:
+    """Remove the cached `gdal_info` result of a file, after it has been edited in place (by `gdal_edit` for example).
+
+    Args:
+        path: the path of the file. Defaults to None which removes all the cached results.
+    """
+    with _gdal_info_cache_lock:
+        if path is None:
+            _gdal_info_cache.clear()
+        else:
+            _gdal_info_cache.pop(path, None)
+
+
+def take_gdal_info_cache_stats() -> GdalInfoCacheStats:
+    """Get the counters of the `gdal_info` cache since they were last taken, and reset them.
+
+    Returns:
+        the counters of the `gdal_info` cache
+    """
+    global _gdal_info_cache_stats  # pylint: disable=global-statement
+    with _gdal_info_cache_lock:
+        stats, _gdal_info_cache_stats = _gdal_info_cache_stats, GdalInfoCacheStats()
+    return stats
+
+
+def _get_file_version(path: str) -> str | None:
+    """Get a value which changes when the file is modified, or None if the file can't be found."""
+    if is_s3(path):
+        try:
+            return head(path)["ETag"]
+        except ClientError:
+            return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _run_gdal_info(path: str) -> GdalInfo:
+    """Run `gdalinfo -json` on a file and parse its output."""
     # Set GDAL_PAM_ENABLED to NO to temporarily disable PAM support and prevent creation of auxiliary XML file.
     gdalinfo_command = ["gdalinfo", "-json", "--config", "GDAL_PAM_ENABLED", "NO"]
 
@@ -0,0 +1,146 @@
+import os
+import re
+from dataclasses import dataclass
+from os import environ
+
+from linz_logger import get_log
+
+GDAL_CACHE_MEMORY_FRACTION = float(environ.get("GDAL_CACHE_MEMORY_FRACTION", "0.25"))
+"""Share of the memory of the node used by the GDAL block caches of all the workers. Defaults to 25%."""
+MIN_GDAL_CACHEMAX_MB = 64
+_ALL_CPUS_OPTION = re.compile(r"^(num_threads)=all_cpus$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class GdalResources:
+    """Resources of the node given to the GDAL commands of a worker process."""
+
+    num_threads: int
+    """Number of threads of each GDAL command"""
+    cache_max_mb: int
+    """Size of the GDAL block cache of each GDAL command, in MB"""
+
+    def to_config(self) -> dict[str, str]:
+        """Get the GDAL configuration options limiting a command to these resources.
+
+        Returns:
+            the GDAL configuration options
+
+        Example:
+            >>> GdalResources(num_threads=2, cache_max_mb=512).to_config()
+            {'GDAL_NUM_THREADS': '2', 'GDAL_CACHEMAX': '512'}
+        """
+        return {"GDAL_NUM_THREADS": str(self.num_threads), "GDAL_CACHEMAX": str(self.cache_max_mb)}
+
+    def apply_to_command(self, command: list[str]) -> list[str]:
+        """Replace the `NUM_THREADS=ALL_CPUS` creation and warp options of a GDAL command by the threads of the worker.
+
+        Args:
+            command: the GDAL command
+
+        Returns:
+            the GDAL command using `num_threads` threads
+
+        Example:
+            >>> resources = GdalResources(num_threads=2, cache_max_mb=512)
+            >>> resources.apply_to_command(["gdal_translate", "-co", "num_threads=all_cpus"])
+            ['gdal_translate', '-co', 'num_threads=2']
+        """
+        return [_ALL_CPUS_OPTION.sub(rf"\g<1>={self.num_threads}", argument) for argument in command]
+
+
+_resources: GdalResources | None = None
+
+
+def get_cpu_count() -> int:
+    """Get the number of CPUs the process can use, taking the CPU affinity and the cgroup CPU quota
+    (container CPU limit) into account.
+
+    Returns:
+        the number of CPUs
+    """
+    cpu_count = len(os.sched_getaffinity(0))
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpu_count = min(cpu_count, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpu_count
+
+
+def get_memory_mb() -> int:
+    """Get the memory the process can use, taking the cgroup memory limit (container memory limit) into account.
+
+    Returns:
+        the memory in MB
+    """
+    memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    try:
+        with open("/sys/fs/cgroup/memory.max", encoding="utf-8") as memory_max:
+            limit = memory_max.read().strip()
+        if limit != "max":
+            memory = min(memory, int(limit))
+    except (OSError, ValueError):
+        pass
+    return memory // (1024 * 1024)
+
+
+def split_resources(workers: int, cpu_count: int, memory_mb: int) -> GdalResources:
+    """Split the CPUs and the GDAL cache share of the memory (see `GDAL_CACHE_MEMORY_FRACTION`) between the workers.
+
+    Args:
+        workers: number of worker processes running GDAL commands at the same time
+        cpu_count: number of CPUs of the node
+        memory_mb: memory of the node in MB
+
+    Returns:
+        the resources of each worker
+
+    Examples:
+        >>> split_resources(workers=8, cpu_count=16, memory_mb=65536)
+        GdalResources(num_threads=2, cache_max_mb=2048)
+        >>> split_resources(workers=25, cpu_count=4, memory_mb=4096)
+        GdalResources(num_threads=1, cache_max_mb=64)
+    """
+    workers = max(1, workers)
+    return GdalResources(
+        num_threads=max(1, cpu_count // workers),
+        cache_max_mb=max(MIN_GDAL_CACHEMAX_MB, int(memory_mb * GDAL_CACHE_MEMORY_FRACTION) // workers),
+    )
+
+
+def govern_gdal_resources(workers: int) -> GdalResources:
+    """Split the resources of the node between `workers` processes running GDAL commands, before starting them.
+    The GDAL commands run by this process and its child processes (see `run_gdal`) are then limited to their share,
+    instead of each using all the CPUs and a share of the whole memory.
+
+    Args:
+        workers: number of worker processes running GDAL commands at the same time
+
+    Returns:
+        the resources of each worker
+    """
+    global _resources  # pylint: disable=global-statement
+    cpu_count = get_cpu_count()
+    memory_mb = get_memory_mb()
+    _resources = split_resources(workers, cpu_count, memory_mb)
+    get_log().info(
+        "gdal_resources",
+        cpuCount=cpu_count,
+        memoryMb=memory_mb,
+        workers=workers,
+        numThreads=_resources.num_threads,
+        cacheMaxMb=_resources.cache_max_mb,
+    )
+    return _resources
+
+
+def get_gdal_resources() -> GdalResources | None:
+    """Get the resources of the GDAL commands of this process.
+
+    Returns:
+        the resources set by `govern_gdal_resources`, or None if the GDAL commands are not limited
+    """
+    return _resources
@@ -35,7 +35,7 @@ class GdalInfoBand(TypedDict):
     Examples:
         "Red", "Green", "Blue", "Alpha", "Gray", "Palette", "NIR", "Undefined"
     """
-    noDataValue: int | None
+    noDataValue: float | None
     colorTable: GdalInfoBandColorTable | None
 
 
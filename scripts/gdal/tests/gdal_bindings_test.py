@@ -0,0 +1,130 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pytest_subtests import SubTests
+
+from scripts.gdal import gdal_bindings
+from scripts.gdal.gdal_bindings import OPTION_VALUE_COUNTS, run, split_command
+
+
+def test_split_command_option_values(subtests: SubTests) -> None:
+    for option, value_count in OPTION_VALUE_COUNTS.items():
+        values = [str(value) for value in range(value_count)]
+        with subtests.test(msg=option):
+            assert split_command([option, *values, "input.tiff", "output.tiff"]) == (
+                [option, *values],
+                ["input.tiff", "output.tiff"],
+                {},
+            )
+
+
+def test_split_command_srcwin() -> None:
+    assert split_command(["-srcwin", "0", "-10", "256", "256", "in.tiff", "out.tiff"]) == (
+        ["-srcwin", "0", "-10", "256", "256"],
+        ["in.tiff", "out.tiff"],
+        {},
+    )
+
+
+def test_split_command_scale(subtests: SubTests) -> None:
+    with subtests.test(msg="Without values"):
+        assert split_command(["-scale", "in.tiff", "out.tiff"]) == (["-scale"], ["in.tiff", "out.tiff"], {})
+
+    with subtests.test(msg="Source range"):
+        assert split_command(["-scale", "0", "255", "in.tiff", "out.tiff"]) == (
+            ["-scale", "0", "255"],
+            ["in.tiff", "out.tiff"],
+            {},
+        )
+
+    with subtests.test(msg="Negative values"):
+        assert split_command(["-scale", "-10.5", "10.5", "0", "255", "-ot", "Byte", "in.tiff", "out.tiff"]) == (
+            ["-scale", "-10.5", "10.5", "0", "255", "-ot", "Byte"],
+            ["in.tiff", "out.tiff"],
+            {},
+        )
+
+
+def test_split_command_colorinterp() -> None:
+    assert split_command(["-colorinterp_4", "undefined", "-b", "1", "in.tiff", "out.tiff"]) == (
+        ["-colorinterp_4", "undefined", "-b", "1"],
+        ["in.tiff", "out.tiff"],
+        {},
+    )
+
+
+def test_split_command_config() -> None:
+    assert split_command(
+        ["--config", "GDAL_NUM_THREADS", "2", "-of", "COG", "--config", "GDAL_CACHEMAX", "256", "in", "out"]
+    ) == (
+        ["-of", "COG"],
+        ["in", "out"],
+        {"GDAL_NUM_THREADS": "2", "GDAL_CACHEMAX": "256"},
+    )
+
+
+def test_split_command_options_without_value() -> None:
+    assert split_command(["-json", "-stats", "-mm", "file.tiff"]) == (["-json", "-stats", "-mm"], ["file.tiff"], {})
+
+
+def test_run_sets_cache_max_once(subtests: SubTests) -> None:
+    gdal = MagicMock()
+    with (
+        patch("scripts.gdal.gdal_bindings.gdal", gdal),
+        patch("scripts.gdal.gdal_bindings._cache_max_mb", None),
+        patch.dict(gdal_bindings.PROGRAMS, {"gdalinfo": MagicMock(return_value="{}")}),
+    ):
+        run(["gdalinfo", "-json", "file.tiff"], {"GDAL_CACHEMAX": "256", "GDAL_NUM_THREADS": "2"})
+        run(["gdalinfo", "-json", "file.tiff"], {"GDAL_CACHEMAX": "256", "GDAL_NUM_THREADS": "2"})
+
+    with subtests.test(msg="Cache size set once for the process"):
+        gdal.SetCacheMax.assert_called_once_with(256 * 1024 * 1024)
+
+    with subtests.test(msg="Not a configuration option of the command"):
+        assert gdal.config_options.call_args.args[0] == {"GDAL_NUM_THREADS": "2"}
+
+
+def test_run_returns_messages_as_stderr() -> None:
+    gdal = MagicMock(CE_Warning=2, CE_Failure=3, CE_Fatal=4)
+
+    def info(options: list[str], files: list[str]) -> str:
+        handler = gdal.PushErrorHandler.call_args.args[0]
+        handler(gdal.CE_Warning, 1, "TIFFReadDirectory: Unknown field")
+        return f"{options} {files}"
+
+    with patch("scripts.gdal.gdal_bindings.gdal", gdal), patch.dict(gdal_bindings.PROGRAMS, {"gdalinfo": info}):
+        result = run(["gdalinfo", "-json", "file.tiff"])
+
+    assert result == (b"['-json'] ['file.tiff']", b"Warning 1: TIFFReadDirectory: Unknown field\n")
+    gdal.PopErrorHandler.assert_called_once()
+
+
+def test_run_gdalinfo(tmp_path: Path) -> None:
+    gdal = pytest.importorskip("osgeo.gdal")
+    file = tmp_path / "file.tiff"
+    dataset = gdal.GetDriverByName("GTiff").Create(str(file), 2, 3, 1)
+    dataset.Close()
+
+    info = json.loads(run(["gdalinfo", "-json", str(file)])[0])
+
+    assert info["size"] == [2, 3]
+
+
+def test_run_gdal_translate(tmp_path: Path) -> None:
+    gdal = pytest.importorskip("osgeo.gdal")
+    source = tmp_path / "source.tiff"
+    target = tmp_path / "target.tiff"
+    dataset = gdal.GetDriverByName("GTiff").Create(str(source), 4, 4, 1)
+    dataset.Close()
+
+    run(["gdal_translate", "-of", "GTiff", "-srcwin", "0", "0", "2", "2", str(source), str(target)])
+
+    assert json.loads(run(["gdalinfo", "-json", str(target)])[0])["size"] == [2, 2]
+
+
+def test_run_failure() -> None:
+    pytest.importorskip("osgeo.gdal")
+    with pytest.raises(RuntimeError):
+        run(["gdalinfo", "-json", "/does/not/exist.tiff"])
@@ -1,7 +1,25 @@
+import json
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+from boto3 import client
+from moto import mock_aws
+from moto.s3.responses import DEFAULT_REGION_NAME
+from mypy_boto3_s3 import S3Client
+from pytest import CaptureFixture
 from pytest_subtests import SubTests
 
-from scripts.gdal.gdal_helper import is_geotiff
-from scripts.gdal.tests.gdalinfo import fake_gdal_info
+from scripts.gdal.gdal_helper import (
+    GdalBackend,
+    gdal_info,
+    invalidate_gdal_info,
+    is_geotiff,
+    run_gdal,
+    take_gdal_info_cache_stats,
+)
+from scripts.gdal.tests.gdalinfo import add_band, fake_gdal_info
 
 
 def test_is_geotiff(subtests: SubTests) -> None:
@@ -16,3 +34,70 @@ def test_is_geotiff(subtests: SubTests) -> None:
 
     with subtests.test():
         assert is_geotiff("file.tiff", gdalinfo_not_geotiff) is False
+
+
+def test_gdal_info_cache(tmp_path: Path, subtests: SubTests) -> None:
+    path = os.path.join(tmp_path, "file.tiff")
+    Path(path).write_bytes(b"content")
+    gdalinfo_process = subprocess.CompletedProcess(args=[], returncode=0, stdout=json.dumps({"bands": []}).encode())
+    take_gdal_info_cache_stats()
+
+    with patch("scripts.gdal.gdal_helper.run_gdal", return_value=gdalinfo_process) as run_command:
+        gdal_info(path)
+        info = gdal_info(path)
+        with subtests.test(msg="Cached"):
+            assert run_command.call_count == 1
+
+        add_band(info)
+        with subtests.test(msg="Cached result not updated by the caller"):
+            assert not gdal_info(path)["bands"]
+
+        invalidate_gdal_info(path)
+        gdal_info(path)
+        with subtests.test(msg="Invalidated"):
+            assert run_command.call_count == 2
+
+        Path(path).write_bytes(b"updated content")
+        gdal_info(path)
+        with subtests.test(msg="File modified"):
+            assert run_command.call_count == 3
+
+    stats = take_gdal_info_cache_stats()
+    with subtests.test(msg="Counters"):
+        assert (stats.hits, stats.misses) == (2, 3)
+
+
+def test_run_gdal_bindings_backend(capsys: CaptureFixture[str]) -> None:
+    with (
+        patch("scripts.gdal.gdal_bindings.is_supported", return_value=True),
+        patch("scripts.gdal.gdal_bindings.run", return_value=(b"output", b"Warning 1: warning")) as run,
+    ):
+        result = run_gdal(["gdalinfo", "-json"], "file.tiff", backend=GdalBackend.BINDINGS)
+
+    run.assert_called_once_with(["gdalinfo", "-json", "file.tiff"], {})
+    assert (result.stdout, result.stderr) == (b"output", b"Warning 1: warning")
+    assert "run_gdal_stderr" in capsys.readouterr().out
+
+
+@mock_aws
+def test_run_gdal_vsis3_input(subtests: SubTests) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    s3_client.put_object(Bucket="testbucket", Key="file.tiff", Body=b"content")
+    gdalinfo_process = subprocess.CompletedProcess(args=[], returncode=0, stdout=b"{}", stderr=b"")
+
+    with (
+        patch("scripts.gdal.gdal_helper.GDAL_VSIS3_INPUTS", True),
+        patch("scripts.gdal.gdal_helper.subprocess.run", return_value=gdalinfo_process) as run,
+        patch("scripts.gdal.gdal_helper.fetch") as fetch,
+    ):
+        run_gdal(["gdalinfo", "-json"], "s3://testbucket/file.tiff", backend=GdalBackend.SUBPROCESS)
+
+    with subtests.test(msg="Not downloaded"):
+        fetch.assert_not_called()
+
+    with subtests.test(msg="Read as a /vsis3/ path"):
+        assert run.call_args.args[0] == ["gdalinfo", "-json", "/vsis3/testbucket/file.tiff"]
+
+    with subtests.test(msg="VSI configuration"):
+        assert run.call_args.kwargs["env"]["GDAL_DISABLE_READDIR_ON_OPEN"] == "EMPTY_DIR"
@@ -0,0 +1,24 @@
+import subprocess
+from unittest.mock import patch
+
+from pytest_subtests import SubTests
+
+from scripts.gdal.gdal_helper import GdalBackend, run_gdal
+from scripts.gdal.gdal_resources import GdalResources
+
+
+def test_run_gdal_with_resources(subtests: SubTests) -> None:
+    gdal_process = subprocess.CompletedProcess(args=[], returncode=0, stdout=b"", stderr=b"")
+
+    with (
+        patch("scripts.gdal.gdal_helper.get_gdal_resources", return_value=GdalResources(num_threads=2, cache_max_mb=256)),
+        patch("scripts.gdal.gdal_helper.subprocess.run", return_value=gdal_process) as run,
+    ):
+        run_gdal(["gdal_translate", "-co", "num_threads=all_cpus"], "input.tiff", "output.tiff", GdalBackend.SUBPROCESS)
+
+    with subtests.test(msg="Threads of the command"):
+        assert run.call_args.args[0] == ["gdal_translate", "-co", "num_threads=2", "input.tiff", "output.tiff"]
+
+    with subtests.test(msg="GDAL configuration"):
+        assert run.call_args.kwargs["env"]["GDAL_NUM_THREADS"] == "2"
+        assert run.call_args.kwargs["env"]["GDAL_CACHEMAX"] == "256"
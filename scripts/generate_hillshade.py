@@ -10,12 +10,14 @@ from topo_imagery_common.cli.cli_helper import InputParameterError, TileFiles, l
 from topo_imagery_common.cli.common_args import CommonArgumentParser
 from topo_imagery_common.datetimes import RFC_3339_DATETIME_FORMAT
 from topo_imagery_common.files.files_helper import SUFFIX_JSON, ContentType, is_tiff
-from topo_imagery_common.files.fs import exists, read, write, write_all
+from topo_imagery_common.files.fs import exists, upload_file, write, write_all, write_io_telemetry_summary
+from topo_imagery_common.files.io_telemetry import call_with_telemetry, get_io_telemetry
 from topo_imagery_common.log.time_helper import time_in_ms
 
 from scripts.gdal.gdal_commands import get_gdal_command, get_hillshade_command
 from scripts.gdal.gdal_helper import run_gdal
 from scripts.gdal.gdal_presets import CompressionPreset, HillshadePreset
+from scripts.gdal.gdal_resources import govern_gdal_resources
 from scripts.json_codec import dict_to_json_bytes
 from scripts.stac.imagery.create_stac import create_item
 from scripts.standardising import create_vrt
@@ -101,7 +103,7 @@ def create_hillshade(
         hillshade_working_path = os.path.join(tmp_path, hillshade_file_name)
         hillshade_cog_working_path = os.path.join(tmp_path, tile.output + "_cog.tiff")
 
-        source_files = write_all(tile.inputs, f"{tmp_path}/source/")
+        source_files = write_all(tile.inputs, f"{tmp_path}/source/", use_source_cache=True)
         source_tiffs = [file for file in source_files if is_tiff(file)]
 
         # Start from base VRT
@@ -118,7 +120,7 @@ def create_hillshade(
         )
 
         # Note: This file is used as an implicit indicator that processing has completed, so should be written last.
-        write(hillshade_file_path, read(hillshade_cog_working_path), content_type=ContentType.GEOTIFF.value)
+        upload_file(hillshade_cog_working_path, hillshade_file_path, content_type=ContentType.GEOTIFF.value, hardlink=True)
 
         return hillshade_file_path, tile.inputs
 
@@ -142,10 +144,18 @@ def run_create_hillshade(
     Returns:
         the list of generated hillshade TIFF paths with their input files.
     """
+    results = []
+    govern_gdal_resources(concurrency)
     with Pool(concurrency) as p:
-        results = list(p.map(partial(create_hillshade, preset=preset, target_output=target_output, force=force), todo))
+        for result, worker_telemetry in p.map(
+            partial(call_with_telemetry, partial(create_hillshade, preset=preset, target_output=target_output, force=force)),
+            todo,
+        ):
+            get_io_telemetry().merge(worker_telemetry)
+            results.append(result)
         p.close()
         p.join()
+    write_io_telemetry_summary(target_output)
 
     return results
 
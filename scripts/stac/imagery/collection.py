@@ -11,7 +11,8 @@ from shapely.geometry.base import BaseGeometry
 from topo_imagery_common.datetimes import convert_utc_to_nz_datetime, format_rfc_3339_datetime_string, parse_rfc_3339_datetime
 from topo_imagery_common.files import checksum
 from topo_imagery_common.files.files_helper import ContentType
-from topo_imagery_common.files.fs import exists, read, write
+from topo_imagery_common.files.fs import NoSuchFileError, exists, read, write
+from topo_imagery_common.files.fs_executor import run_all
 
 from scripts.json_codec import dict_to_json_bytes
 from scripts.stac.imagery.capture_area import generate_capture_area
@@ -126,8 +127,7 @@ class ImageryCollection:
         Returns:
             The ImageryCollection loaded from the file.
         """
-        file_content = read(path)
-        stac_from_file = json.loads(file_content.decode("UTF-8"))
+        stac_from_file = json.loads(read(path))
         collection = cls.__new__(cls)
         collection.stac = stac_from_file
         collection.published_location = os.path.dirname(path)
@@ -421,7 +421,7 @@ class ImageryCollection:
             source_directory: the location of the capture-dates.geojson file to be linked
         """
 
-        capture_dates_content = read(os.path.join(source_directory, CAPTURE_DATES_FILE_NAME))
+        capture_dates_content = read(os.path.join(source_directory, CAPTURE_DATES_FILE_NAME), use_mmap=True)
         file_checksum = checksum.multihash_as_hex(capture_dates_content)
         capture_dates = {
             "href": f"./{CAPTURE_DATES_FILE_NAME}",
@@ -537,25 +537,31 @@ class ImageryCollection:
         self.stac.setdefault("extent", {}).setdefault("temporal", {})["interval"] = None
 
     def get_items_stac(self) -> list[dict[str, Any]]:
-        """Get the STAC Items content from the Collection links.
+        """Get the STAC Items content from the Collection links, reading them in the shared `fs` executor
+        (see `run_all`).
+
+        Raises:
+            FileNotFoundError: if a STAC Item does not exist
 
         Returns:
             a list of STAC Item contents
         """
+        items_content = run_all(_read_item, self._get_items_paths())
+        try:
+            return [json.loads(content.result()) for content in items_content]
+        finally:
+            for content in items_content:
+                content.cancel()
+
+    def _get_items_paths(self) -> list[str]:
         if not self.published_location:
             get_log().info("Collection is not published: no STAC Item to load.")
             return []
-        items_stac = []
-        for link in self.stac.get("links", []):
-            if link["rel"] != Relation.ITEM:
-                continue
-            item_path = os.path.join(self.published_location, os.path.basename(link["href"]))
-            if not exists(item_path):
-                get_log().error(f"STAC Item not found: {item_path}")
-                raise FileNotFoundError(item_path)
-            existing_item_stac = json.loads(read(item_path))
-            items_stac.append(existing_item_stac)
-        return items_stac
+        return [
+            os.path.join(self.published_location, os.path.basename(link["href"]))
+            for link in self.stac.get("links", [])
+            if link["rel"] == Relation.ITEM
+        ]
 
     def reset_items(self) -> None:
         """Reset the STAC Item links list in the Collection links."""
@@ -586,3 +592,22 @@ class ImageryCollection:
         capture_area_geometry = shape(self.capture_area["geometry"])
         updated_capture_area_geometry = capture_area_geometry.difference(item_geometry)
         self.capture_area["geometry"] = json.loads(to_geojson(updated_capture_area_geometry))
+
+
+def _read_item(path: str) -> bytes:
+    """Read a STAC Item file.
+
+    Args:
+        path: path of the file to read
+
+    Raises:
+        FileNotFoundError: if the file does not exist
+
+    Returns:
+        the content of the file
+    """
+    try:
+        return read(path)
+    except NoSuchFileError as error:
+        get_log().error(f"STAC Item not found: {error.path}")
+        raise FileNotFoundError(error.path) from error
@@ -4,7 +4,7 @@ from typing import Any
 
 from linz_logger import get_log
 from shapely.geometry.base import BaseGeometry
-from topo_imagery_common.files import checksum, fs
+from topo_imagery_common.files import fs
 from topo_imagery_common.files.files_helper import get_file_name_from_path
 from topo_imagery_common.files.fs import NoSuchFileError, read
 
@@ -185,7 +185,7 @@ def create_item(
     if derived_from is not None:
         for derived in derived_from:
             derived_item_content = read(derived)
-            derived_stac = json.loads(derived_item_content.decode("UTF-8"))
+            derived_stac = json.loads(derived_item_content)
             if not start_datetime or derived_stac["properties"]["start_datetime"] < start_datetime:
                 start_datetime = derived_stac["properties"]["start_datetime"]
             if not end_datetime or derived_stac["properties"]["end_datetime"] > end_datetime:
@@ -226,8 +226,7 @@ def create_or_load_base_item(
         An ImageryItem with basic information.
     """
     id_ = get_file_name_from_path(asset_path)
-    file_content = fs.read(asset_path)
-    file_content_checksum = checksum.multihash_as_hex(file_content)
+    file_content_checksum = fs.get_multihash(asset_path)
 
     if (topo_imagery_hash := os.environ.get("GIT_HASH")) is not None:
         commit_url = f"https://github.com/linz/topo-imagery/commit/{topo_imagery_hash}"
@@ -50,8 +50,7 @@ class ImageryItem:
         Returns:
             ImageryItem: The new ImageryItem.
         """
-        file_content = read(file_name)
-        stac_from_file = json.loads(file_content.decode("UTF-8"))
+        stac_from_file = json.loads(read(file_name))
         if (bbox := stac_from_file.get("bbox")) is not None:
             stac_from_file["bbox"] = tuple(bbox)
         new_item = cls(
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import tempfile
@@ -5,6 +6,7 @@ from decimal import Decimal
 from pathlib import Path
 from shutil import rmtree
 from tempfile import mkdtemp
+from typing import Any
 
 import pytest
 import shapely.geometry
@@ -934,6 +936,33 @@ def test_get_items_from_collection(tmp_path: Path, fake_collection_context: Coll
     assert len(collection_items) == 1
     assert collection_items[0] == existing_item
 
+    async def get_items_in_event_loop() -> list[dict[str, Any]]:
+        return collection.get_items_stac()
+
+    assert asyncio.run(get_items_in_event_loop()) == [existing_item]
+
+
+def test_get_items_from_collection_item_not_found(tmp_path: Path, fake_collection_context: CollectionContext) -> None:
+    created_datetime = any_epoch_datetime_string()
+    existing_collection_content = {
+        "type": "Collection",
+        "stac_version": STAC_VERSION,
+        "id": fake_collection_context.collection_id,
+        "linz:slug": fake_collection_context.linz_slug,
+        "links": [
+            {"rel": "self", "href": "./collection.json", "type": "application/json"},
+            {"rel": "item", "href": "./item_a.json", "type": "application/geo+json"},
+        ],
+        "created": created_datetime,
+        "updated": created_datetime,
+    }
+    existing_collection_path = tmp_path / "collection.json"
+    existing_collection_path.write_text(json.dumps(existing_collection_content))
+
+    collection = ImageryCollection.from_file(existing_collection_path.as_posix())
+    with pytest.raises(FileNotFoundError):
+        collection.get_items_stac()
+
 
 def test_reset_items_in_collection(fake_collection_context: CollectionContext) -> None:
     collection = ImageryCollection(fake_collection_context, any_epoch_datetime_string(), any_epoch_datetime_string())
@@ -1,3 +1,4 @@
+from collections.abc import Buffer
 from enum import Enum
 
 from topo_imagery_common.files import checksum
@@ -34,7 +35,7 @@ class Link:
 
     stac: dict[str, str]
 
-    def __init__(self, path: str, rel: Relation, media_type: StacMediaType, file_content: bytes | None = None) -> None:
+    def __init__(self, path: str, rel: Relation, media_type: StacMediaType, file_content: Buffer | None = None) -> None:
         self.stac = {
             "href": path,
             "rel": str(rel),
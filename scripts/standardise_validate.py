@@ -15,7 +15,8 @@ from topo_imagery_common.cli.cli_helper import (
 )
 from topo_imagery_common.datetimes import RFC_3339_DATETIME_FORMAT, format_rfc_3339_nz_midnight_datetime_string
 from topo_imagery_common.files.files_helper import SUFFIX_JSON, ContentType
-from topo_imagery_common.files.fs import exists, write
+from topo_imagery_common.files.fs import write
+from topo_imagery_common.files.prefix_index import PrefixIndex
 
 from scripts.gdal.gdal_helper import get_srs, get_vfs_path
 from scripts.json_codec import dict_to_json_bytes
@@ -179,9 +180,12 @@ def main() -> None:
     # SRS needed for FileCheck (non visual QA)
     srs = get_srs()
 
+    # List the existing STAC items once, instead of looking up each of them
+    target_index = None if force else PrefixIndex([arguments.target])
+
     for file in tiff_files:
         stac_item_path = file.get_path_standardised().rsplit(".", 1)[0] + SUFFIX_JSON
-        if force or not exists(stac_item_path):
+        if target_index is None or not target_index.exists(stac_item_path):
             file.set_srs(srs)
 
             # Validate the file
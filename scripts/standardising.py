@@ -12,7 +12,17 @@ from tifffile import TiffFile
 from topo_imagery_common.aws.aws_helper import is_s3
 from topo_imagery_common.cli.cli_helper import TileFiles
 from topo_imagery_common.files.files_helper import ContentType, is_tiff
-from topo_imagery_common.files.fs import exists, read, write, write_all, write_sidecars
+from topo_imagery_common.files.fs import (
+    download_file,
+    exists,
+    iter_write_all,
+    upload_file,
+    write_io_telemetry_summary,
+    write_sidecars,
+)
+from topo_imagery_common.files.io_telemetry import call_with_telemetry, get_io_telemetry
+from topo_imagery_common.files.prefix_index import PrefixIndex
+from topo_imagery_common.files.source_cache import unshare
 from topo_imagery_common.log.time_helper import time_in_ms
 
 from scripts.gdal.gdal_bands import get_gdal_band_offset
@@ -26,9 +36,12 @@ from scripts.gdal.gdal_commands import (
     get_transform_srs_command,
 )
 from scripts.gdal.gdal_footprint import SUFFIX_FOOTPRINT, create_footprint
-from scripts.gdal.gdal_helper import gdal_info, run_gdal
+from scripts.gdal.gdal_helper import gdal_info, invalidate_gdal_info, run_gdal, take_gdal_info_cache_stats
 from scripts.gdal.gdal_presets import CompressionPreset
+from scripts.gdal.gdal_resources import govern_gdal_resources
+from scripts.gdal.gdalinfo import GdalInfoBand
 from scripts.tiff.file_tiff import FileTiff, FileTiffType
+from scripts.tiff.tiff_header import tiff_header_info
 from scripts.tile.tile_index import Bounds, get_bounds_from_name
 
 
@@ -90,31 +103,55 @@ def run_standardising(
 
     get_log().info("standardising_start", gdalVersion=gdal_version, fileCount=len(tiles_to_process))
 
-    with Pool(concurrency) as p:
-        standardized_tiffs = [
-            entry
-            for entry in p.map(
-                partial(
-                    standardising,
-                    config=standardising_config,
-                    target_output=target_output,
-                ),
-                tiles_to_process,
-            )
-            if entry is not None
-        ]
+    # List the target and source directories once, instead of looking up each output and source sidecar file
+    target_index = None if standardising_config.force else PrefixIndex([target_output])
+    source_index = PrefixIndex({os.path.dirname(input_) for tile in tiles_to_process for input_ in tile.inputs})
+
+    standardized_tiffs = []
+    govern_gdal_resources(concurrency)
+    # The indexes are given to each worker once, instead of with each tile
+    with Pool(concurrency, initializer=set_prefix_indexes, initargs=(target_index, source_index)) as p:
+        for entry, worker_telemetry in p.map(
+            partial(
+                call_with_telemetry,
+                partial(standardising, config=standardising_config, target_output=target_output),
+            ),
+            tiles_to_process,
+        ):
+            get_io_telemetry().merge(worker_telemetry)
+            if entry is not None:
+                standardized_tiffs.append(entry)
         p.close()
         p.join()
+    write_io_telemetry_summary(target_output)
 
     get_log().info("standardising_end", duration=time_in_ms() - start_time, fileCount=len(standardized_tiffs))
 
     return standardized_tiffs
 
 
+_target_index: PrefixIndex | None = None
+_source_index: PrefixIndex | None = None
+
+
+def set_prefix_indexes(target_index: PrefixIndex | None, source_index: PrefixIndex | None) -> None:
+    """Set the indexes `standardising()` uses when none are passed to it, like in the workers of `run_standardising()`.
+
+    Args:
+        target_index: an index of the target directory
+        source_index: an index of the input directories
+    """
+    global _target_index, _source_index  # pylint: disable=global-statement
+    _target_index = target_index
+    _source_index = source_index
+
+
 def standardising(
     files: TileFiles,
     config: StandardisingConfig,
     target_output: str = "/tmp/",
+    target_index: PrefixIndex | None = None,
+    source_index: PrefixIndex | None = None,
 ) -> FileTiff | None:
     """Standardise geospatial TIFF files using GDAL.
     Optionally create a footprint sidecar file.
@@ -132,6 +169,10 @@ def standardising(
             cutline: path to the cutline file. Must be `.fgb` or `.geojson`
             scale_to_resolution: scale TIFFs to the specified x,y resolution. Defaults to None = no scaling.
         target_output: output directory path. Defaults to "/tmp/". Not to be confused with `tmp_path`.
+        target_index: an index of `target_output` to check if the output file already exists.
+            Defaults to the index set by `set_prefix_indexes()`, if any.
+        source_index: an index of the input directories to find the sidecar files.
+            Defaults to the index set by `set_prefix_indexes()`, if any.
 
     Raises:
         Exception: if cutline is not a .fgb or .geojson file
@@ -139,31 +180,49 @@ def standardising(
     Returns:
         a FileTiff wrapper
     """
+    # pylint: disable=too-many-locals
+    target_index = target_index or _target_index
+    source_index = source_index or _source_index
     standardised_file_path = os.path.join(target_output, f"{files.output}.tiff")
     tiff = FileTiff(files.inputs, config.gdal_preset, files.includeDerived)
     tiff.set_path_standardised(standardised_file_path)
 
     # Skip processing if output file already exists
-    if not config.force and exists(standardised_file_path):
+    if not config.force and (target_index.exists if target_index else exists)(standardised_file_path):
         get_log().info("standardised_tiff_already_exists", path=standardised_file_path)
         return tiff
 
+    # Count the `gdalinfo` runs of this tile only
+    take_gdal_info_cache_stats()
     # Download any needed file from S3 ["/foo/bar.tiff", "s3://foo"] => "/tmp/bar.tiff", "/tmp/foo.tiff"
     with tempfile.TemporaryDirectory() as tmp_path:
 
         # Copy source TIFFs and any .prj or .tfw sidecar files to tmp_path
-        get_prj_tfw_sidecars(tiff, f"{tmp_path}/source/")
-        source_files = write_all(tiff.get_paths_original(), f"{tmp_path}/source/")
+        get_prj_tfw_sidecars(tiff, f"{tmp_path}/source/", source_index)
+        written_files: dict[str, str] = {}
+        source_bands: list[list[GdalInfoBand]] = []
+        for input_file, source_file in iter_write_all(
+            tiff.get_paths_original(), f"{tmp_path}/source/", use_source_cache=True, source_index=source_index
+        ):
+            written_files[input_file] = source_file
+            if is_tiff(source_file):
+                # Inspect the sources already written while the others are still transferring
+                source_bands.append(tiff_header_info(source_file)["bands"])
+        # The order of the sources sets their priority in the VRT
+        source_files = [written_files[input_file] for input_file in tiff.get_paths_original()]
 
         # Determine if VRT needs alpha
-        vrt_add_alpha = check_vrt_alpha(source_files, config.gdal_preset)
+        vrt_add_alpha = check_vrt_alpha(source_bands, config.gdal_preset)
 
         # Force RGBNIR Band 4 colorInterpretation to NIR if mislabelled as Alpha
-        if (config.gdal_preset == "rgbnir_zstd") and (detect_mislabelled_rgbnir_bands(source_files)):
+        if (config.gdal_preset == "rgbnir_zstd") and (detect_mislabelled_rgbnir_bands(source_bands)):
             for source_file in source_files:
                 if is_tiff(source_file):
                     get_log().info("Relabelling RGBNIR Band 4 as NIR", path=source_file)
+                    # `gdal_edit` updates the file in place, it must not alter the copy in the source cache
+                    unshare(source_file)
                     run_gdal(get_relabel_colorinterp_command(), source_file, None)
+                    invalidate_gdal_info(source_file)
 
         # Create base VRT file
         current_working_file = create_vrt(
@@ -191,6 +250,7 @@ def standardising(
 
         # Validate output and create footprints
         if check_tiff_empty(current_working_file):
+            _log_gdal_info_cache_stats(files.output)
             return None
 
         if config.create_footprints:
@@ -201,14 +261,35 @@ def standardising(
                 tiff_for_footprint = create_fillnodata_tiff(current_working_file, fillnodata_tiff_path)
             temp_footprint = create_footprint(tiff_for_footprint, tmp_path, config.gsd, config.gdal_preset)
             footprint_file_path = os.path.join(target_output, f"{files.output}{SUFFIX_FOOTPRINT}")
-            write(footprint_file_path, read(temp_footprint), content_type=ContentType.GEOJSON.value)
+            upload_file(
+                temp_footprint,
+                footprint_file_path,
+                content_type=ContentType.GEOJSON.value,
+                skip_unchanged=config.force,
+                hardlink=True,
+            )
 
-        # Copy the final version of the working / temp file to the desired destination
-        write(standardised_file_path, read(current_working_file), content_type=ContentType.GEOTIFF.value)
+        # Copy the final version of the working / temp file to the desired destination.
+        # Forced re-runs often produce the same file, which does not need to be uploaded again.
+        # The working file is discarded after, so a local destination can be a hard link to it.
+        upload_file(
+            current_working_file,
+            standardised_file_path,
+            content_type=ContentType.GEOTIFF.value,
+            skip_unchanged=config.force,
+            hardlink=True,
+        )
 
+    _log_gdal_info_cache_stats(files.output)
     return tiff
 
 
+def _log_gdal_info_cache_stats(tile_name: str) -> None:
+    """Log the number of `gdalinfo` subprocesses run and avoided by the `gdal_info` cache since the start of the tile."""
+    stats = take_gdal_info_cache_stats()
+    get_log().info("gdalinfo_cache", tile=tile_name, gdalinfoRun=stats.misses, gdalinfoAvoided=stats.hits)
+
+
 def create_vrt(
     source_tiffs: list[str],
     target_path: str,
@@ -238,41 +319,50 @@ def create_vrt(
     return vrt_path
 
 
-def get_prj_tfw_sidecars(tiff: FileTiff, target_path: str) -> list[str]:
-    """Get any .prj and .tfw sidecar files that have the same basename as the TIFF file."""
+def get_prj_tfw_sidecars(tiff: FileTiff, target_path: str, source_index: PrefixIndex | None = None) -> list[str]:
+    """Get any .prj and .tfw sidecar files that have the same basename as the TIFF file.
+    If a `source_index` is given, only the sidecar files it lists are read.
+    """
     sidecars = [
         f"{os.path.splitext(file_input)[0]}{extension}"
         for extension in [".prj", ".tfw"]
         for file_input in tiff.get_paths_original()
     ]
+    if source_index is not None:
+        sidecars = [sidecar for sidecar in sidecars if source_index.exists(sidecar)]
     write_sidecars(sidecars, target_path)
     return sidecars
 
 
-def detect_mislabelled_rgbnir_bands(source_files: list[str]) -> bool:
-    """Check if RGBNIR bands need color_interpretation relabelling."""
-    for file in source_files:
-        if is_tiff(file):
-            bands = gdal_info(file)["bands"]
-            # Check if the 4th band is labelled 'Alpha'
-            if bands[3].get("colorInterpretation", "") == "Alpha":
-                return True
+def detect_mislabelled_rgbnir_bands(source_bands: list[list[GdalInfoBand]]) -> bool:
+    """Check if RGBNIR bands need color_interpretation relabelling.
+
+    Args:
+        source_bands: the bands of each source TIFF, from the TIFF header (see `tiff_header_info`)
+    """
+    for bands in source_bands:
+        # Check if the 4th band is labelled 'Alpha'
+        if bands[3].get("colorInterpretation", "") == "Alpha":
+            return True
     return False
 
 
-def check_vrt_alpha(source_files: list[str], preset: str) -> bool:
-    """Check if alpha is needed in the VRT."""
-    for file in source_files:
-        if is_tiff(file):
-            bands = gdal_info(file)["bands"]
-            has_alpha = (
-                len(bands) == 4
-                and bands[3].get("colorInterpretation") == "Alpha"
-                and preset != CompressionPreset.RGBNIR_ZSTD.value
-            ) or (len(bands) == 5 and bands[4].get("colorInterpretation") == "Alpha")
-            is_gray = len(bands) == 1 and bands[0].get("colorInterpretation") == "Gray"
-            if has_alpha or is_gray:
-                return False
+def check_vrt_alpha(source_bands: list[list[GdalInfoBand]], preset: str) -> bool:
+    """Check if alpha is needed in the VRT.
+
+    Args:
+        source_bands: the bands of each source TIFF, from the TIFF header (see `tiff_header_info`)
+        preset: the gdal preset used
+    """
+    for bands in source_bands:
+        has_alpha = (
+            len(bands) == 4
+            and bands[3].get("colorInterpretation") == "Alpha"
+            and preset != CompressionPreset.RGBNIR_ZSTD.value
+        ) or (len(bands) == 5 and bands[4].get("colorInterpretation") == "Alpha")
+        is_gray = len(bands) == 1 and bands[0].get("colorInterpretation") == "Gray"
+        if has_alpha or is_gray:
+            return False
     return True
 
 
@@ -285,7 +375,7 @@ def apply_cutline(input_file: str, config: StandardisingConfig, tmp_path: str) -
         input_cutline_path = config.cutline
         if is_s3(config.cutline):
             input_cutline_path = os.path.join(tmp_path, "cutline" + os.path.splitext(config.cutline)[1])
-            write(input_cutline_path, read(config.cutline))
+            download_file(config.cutline, input_cutline_path)
 
         target_vrt = os.path.join(tmp_path, "cutline.vrt")
         run_gdal(get_cutline_command(input_cutline_path), input_file=input_file, output_file=target_vrt)
@@ -11,6 +11,7 @@ from pytest import CaptureFixture, raises
 from pytest_subtests import SubTests
 from shapely.geometry import shape
 from topo_imagery_common.files.fs_s3 import write
+from topo_imagery_common.files.hedged_requests import HedgedRequests
 
 from scripts.collection_from_items import NoItemsError, main
 from scripts.conftest import any_epoch_datetime_string
@@ -81,6 +82,43 @@ def test_should_create_collection_file(item: ImageryItem, fake_collection_contex
     assert '"type": "Collection"' in resp["Body"].read().decode("utf-8")
 
 
+@mock_aws
+def test_should_hedge_item_reads(item: ImageryItem, fake_collection_context: CollectionContext) -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="stacfiles")
+    item.add_collection("abc")
+    write("s3://stacfiles/item.json", dict_to_json_bytes(item.stac))
+    args = [
+        "--uri",
+        "s3://stacfiles/",
+        "--collection-id",
+        "abc",
+        "--category",
+        "urban-aerial-photos",
+        "--region",
+        "hawkes-bay",
+        "--gsd",
+        "1",
+        "--lifecycle",
+        "ongoing",
+        "--producer",
+        "Placeholder",
+        "--licensor",
+        "Placeholder",
+        "--concurrency",
+        "25",
+        "--linz-slug",
+        fake_collection_context.linz_slug,
+        "--hedge-requests",
+        "true",
+    ]
+
+    with patch("scripts.collection_from_items.HedgedRequests.call", autospec=True, side_effect=HedgedRequests.call) as call:
+        main(args)
+
+    assert [called.args[2] for called in call.call_args_list] == ["s3://stacfiles/item.json"]
+
+
 @mock_aws
 def test_should_create_coastal_collection_file(item: ImageryItem, fake_collection_context: CollectionContext) -> None:
     # Mock AWS S3
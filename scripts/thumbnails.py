@@ -7,12 +7,13 @@ from multiprocessing import Pool
 from linz_logger import get_log
 from topo_imagery_common.cli.common_args import CommonArgumentParser
 from topo_imagery_common.files.files_helper import ContentType, get_file_name_from_path, is_tiff
-from topo_imagery_common.files.fs import exists, read, write
+from topo_imagery_common.files.fs import download_file, exists, read, upload_file
 from topo_imagery_common.log.time_helper import time_in_ms
 
-from scripts.gdal import gdal_helper
 from scripts.gdal.gdal_commands import get_thumbnail_command
 from scripts.gdal.gdal_helper import is_geotiff, run_gdal
+from scripts.gdal.gdal_resources import govern_gdal_resources
+from scripts.tiff.tiff_header import tiff_header_info
 
 
 def thumbnails(path: str, target: str) -> str | None:
@@ -41,12 +42,12 @@ def thumbnails(path: str, target: str) -> str | None:
         tmp_thumbnail = os.path.join(tmp_path, f"{basename}-thumbnail.jpg")
         source_tiff = os.path.join(tmp_path, f"{basename}.tiff")
         # Download source file
-        write(source_tiff, read(path))
+        download_file(path, source_tiff)
 
         # Generate thumbnail
         # For both GeoTIFF and TIFF (not georeferenced) this is done in 2 steps.
         # Why? because it hasn't been found another way to get the same visual aspect.
-        gdalinfo_data = gdal_helper.gdal_info(source_tiff)
+        gdalinfo_data = tiff_header_info(source_tiff)
         if is_geotiff(source_tiff, gdalinfo_data):
             get_log().info("thumbnail_generate_geotiff", path=target_thumbnail)
             run_gdal(get_thumbnail_command("jpeg", source_tiff, transitional_jpg, "50%", "50%", None, gdalinfo_data))
@@ -70,7 +71,7 @@ def thumbnails(path: str, target: str) -> str | None:
             run_gdal(get_thumbnail_command("jpeg", transitional_jpg, tmp_thumbnail, "30%", "30%", None, gdalinfo_data))
 
         # Upload to target
-        write(target_thumbnail, read(tmp_thumbnail), content_type=ContentType.JPEG.value)
+        upload_file(tmp_thumbnail, target_thumbnail, content_type=ContentType.JPEG.value, hardlink=True)
     return target_thumbnail
 
 
@@ -90,6 +91,7 @@ def main() -> None:
 
     concurrency = 25
     thumbnail_list = []
+    govern_gdal_resources(concurrency)
 
     for tiff_list in source:
         with Pool(concurrency) as p:
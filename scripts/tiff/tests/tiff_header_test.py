@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+
+import numpy
+from boto3 import client
+from moto import mock_aws
+from moto.s3.responses import DEFAULT_REGION_NAME
+from mypy_boto3_s3 import S3Client
+from pytest_subtests import SubTests
+from tifffile import imwrite
+
+from scripts.tiff.tiff_header import tiff_header_info
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "tests", "data")
+
+
+def test_tiff_header_info_rgb(subtests: SubTests) -> None:
+    info = tiff_header_info(os.path.join(DATA_PATH, "input_aerial.tif"))
+
+    with subtests.test(msg="Bands"):
+        assert [band["colorInterpretation"] for band in info["bands"]] == ["Red", "Green", "Blue"]
+
+    with subtests.test(msg="No data"):
+        assert info["bands"][0]["noDataValue"] == 255
+
+    with subtests.test(msg="GeoTIFF"):
+        assert info["driverShortName"] == "GTiff" and "coordinateSystem" in info
+
+
+def test_tiff_header_info_dem() -> None:
+    info = tiff_header_info(os.path.join(DATA_PATH, "input_dem_01.tif"))
+
+    assert [(band["colorInterpretation"], band["type"], band["noDataValue"]) for band in info["bands"]] == [
+        ("Gray", "Float32", -9999)
+    ]
+
+
+def test_tiff_header_info_undefined_extra_sample() -> None:
+    info = tiff_header_info(os.path.join(DATA_PATH, "input_nir.tif"))
+
+    assert [band["colorInterpretation"] for band in info["bands"]] == ["Red", "Green", "Blue", "Undefined"]
+
+
+def test_tiff_header_info_keys_without_value(tmp_path: Path) -> None:
+    path = os.path.join(tmp_path, "gray.tiff")
+    imwrite(path, numpy.zeros((8, 8), numpy.uint8), photometric="minisblack")
+
+    band = tiff_header_info(path)["bands"][0]
+
+    assert "noDataValue" not in band and "colorTable" not in band
+
+
+def test_tiff_header_info_gdal_metadata_color_interpretation(tmp_path: Path) -> None:
+    path = os.path.join(tmp_path, "nir.tiff")
+    metadata = '<GDALMetadata><Item name="COLORINTERP" sample="3" role="colorinterp">NIR</Item></GDALMetadata>'
+    imwrite(
+        path,
+        numpy.zeros((8, 8, 5), numpy.uint8),
+        photometric="rgb",
+        extrasamples=[0, 2],
+        extratags=[(42112, "s", 0, metadata, True)],
+    )
+
+    info = tiff_header_info(path)
+
+    assert [band["colorInterpretation"] for band in info["bands"]] == ["Red", "Green", "Blue", "NIR", "Alpha"]
+
+
+def test_tiff_header_info_palette(tmp_path: Path) -> None:
+    path = os.path.join(tmp_path, "palette.tiff")
+    colormap = numpy.zeros((3, 256), numpy.uint16)
+    colormap[0, 1] = 65535
+    imwrite(path, numpy.zeros((8, 8), numpy.uint8), photometric="palette", colormap=colormap)
+
+    band = tiff_header_info(path)["bands"][0]
+
+    assert band["colorInterpretation"] == "Palette"
+    assert band["colorTable"] is not None
+    assert band["colorTable"]["entries"][1] == [255, 0, 0, 255]
+
+
+@mock_aws
+def test_tiff_header_info_s3() -> None:
+    s3_client: S3Client = client("s3", region_name=DEFAULT_REGION_NAME)
+    s3_client.create_bucket(Bucket="testbucket")
+    path = os.path.join(DATA_PATH, "input_aerial.tif")
+    s3_client.put_object(Bucket="testbucket", Key="input_aerial.tif", Body=Path(path).read_bytes())
+
+    assert tiff_header_info("s3://testbucket/input_aerial.tif")["bands"] == tiff_header_info(path)["bands"]
@@ -0,0 +1,166 @@
+import xml.etree.ElementTree as ET
+from typing import Any, cast
+
+from linz_logger import get_log
+from tifffile import PHOTOMETRIC, TiffFile, TiffFileError, TiffPage
+from topo_imagery_common.files.files_helper import is_tiff
+from topo_imagery_common.files.fs import open as fs_open
+
+from scripts.gdal.gdal_helper import gdal_info
+from scripts.gdal.gdalinfo import GdalInfo, GdalInfoBand, GdalInfoBandColorTable
+
+TAG_GDAL_METADATA = 42112
+TAG_GDAL_NODATA = 42113
+TAG_GEO_KEY_DIRECTORY = 34735
+
+PHOTOMETRIC_COLOR_INTERPRETATIONS: dict[int, list[str]] = {
+    PHOTOMETRIC.MINISWHITE: ["Gray"],
+    PHOTOMETRIC.MINISBLACK: ["Gray"],
+    PHOTOMETRIC.RGB: ["Red", "Green", "Blue"],
+    PHOTOMETRIC.PALETTE: ["Palette"],
+    PHOTOMETRIC.SEPARATED: ["Cyan", "Magenta", "Yellow", "Black"],
+    PHOTOMETRIC.YCBCR: ["Red", "Green", "Blue"],
+}
+"""`colorInterpretation` of the first bands by TIFF Photometric Interpretation, as set by the GDAL GTiff driver"""
+EXTRA_SAMPLE_ASSOCIATED_ALPHA = 1
+EXTRA_SAMPLE_UNASSOCIATED_ALPHA = 2
+GDAL_DATA_TYPES = {
+    "uint8": "Byte",
+    "int8": "Int8",
+    "uint16": "UInt16",
+    "int16": "Int16",
+    "uint32": "UInt32",
+    "int32": "Int32",
+    "uint64": "UInt64",
+    "int64": "Int64",
+    "float32": "Float32",
+    "float64": "Float64",
+}
+
+
+def tiff_header_info(path: str) -> GdalInfo:
+    """Get the bands of a TIFF from its header only, without running `gdalinfo`.
+    S3 files are not downloaded: only the parts of the file holding the header are read (see `fs.open`).
+    The result is the subset of the `gdalinfo` output needed to check the bands: the size, the `bands`
+    (number, type, block size, `colorInterpretation`, `noDataValue` and `colorTable`) and, for GeoTIFFs,
+    an empty `coordinateSystem`. The extents and the metadata are not included.
+
+    Args:
+        path: path to the file
+
+    Returns:
+        a subset of the `gdalinfo` output, or the full `gdalinfo` output if the file is not a TIFF
+    """
+    if not is_tiff(path):
+        return gdal_info(path)
+    try:
+        with fs_open(path) as file, TiffFile(file) as tiff:
+            page = tiff.pages.first
+            info: dict[str, Any] = {
+                "description": path,
+                "driverShortName": "GTiff",
+                "driverLongName": "GeoTIFF",
+                "files": [path],
+                "size": [page.imagewidth, page.imagelength],
+                "bands": get_bands(page),
+            }
+            if TAG_GEO_KEY_DIRECTORY in page.tags:
+                info["coordinateSystem"] = {}
+            return cast(GdalInfo, info)
+    except TiffFileError as e:
+        get_log().debug("tiff_header_info_failed", path=path, error=str(e))
+        return gdal_info(path)
+
+
+def get_bands(page: TiffPage) -> list[GdalInfoBand]:
+    """Get the bands of a TIFF page as described by `gdalinfo`.
+    Like `gdalinfo`, the `noDataValue` and `colorTable` keys are left out when the band has none.
+
+    Args:
+        page: the first page of the TIFF
+
+    Returns:
+        the bands
+    """
+    color_interpretations = get_color_interpretations(page)
+    no_data_value = get_no_data_value(page)
+    color_table = get_color_table(page)
+    data_type = GDAL_DATA_TYPES.get(str(page.dtype), str(page.dtype))
+    block = [page.tilewidth, page.tilelength] if page.is_tiled else [page.imagewidth, page.rowsperstrip]
+    bands: list[GdalInfoBand] = []
+    for index, color_interpretation in enumerate(color_interpretations):
+        band: dict[str, Any] = {
+            "band": index + 1,
+            "block": block,
+            "type": data_type,
+            "colorInterpretation": color_interpretation,
+        }
+        if no_data_value is not None:
+            band["noDataValue"] = no_data_value
+        if color_table is not None and color_interpretation == "Palette":
+            band["colorTable"] = color_table
+        bands.append(cast(GdalInfoBand, band))
+    return bands
+
+
+def get_color_interpretations(page: TiffPage) -> list[str]:
+    """Get the `colorInterpretation` of each band, from the Photometric Interpretation and Extra Samples TIFF tags,
+    overridden by the colour interpretations GDAL writes in its metadata tag (like "NIR").
+
+    Args:
+        page: the first page of the TIFF
+
+    Returns:
+        the `colorInterpretation` of each band
+    """
+    band_count: int = page.samplesperpixel
+    color_interpretations = PHOTOMETRIC_COLOR_INTERPRETATIONS.get(int(page.photometric), [])[:band_count]
+    # The extra samples are the last bands
+    extra_samples = list(page.extrasamples)
+    first_extra_band = band_count - len(extra_samples)
+    for index in range(len(color_interpretations), band_count):
+        extra_sample = extra_samples[index - first_extra_band] if index >= first_extra_band else None
+        if extra_sample in (EXTRA_SAMPLE_ASSOCIATED_ALPHA, EXTRA_SAMPLE_UNASSOCIATED_ALPHA):
+            color_interpretations.append("Alpha")
+        else:
+            color_interpretations.append("Undefined")
+
+    if TAG_GDAL_METADATA in page.tags:
+        for item in ET.fromstring(page.tags[TAG_GDAL_METADATA].value).iter("Item"):
+            sample = item.get("sample")
+            if item.get("role") == "colorinterp" and sample is not None and int(sample) < band_count and item.text:
+                color_interpretations[int(sample)] = item.text
+    return color_interpretations
+
+
+def get_no_data_value(page: TiffPage) -> float | None:
+    """Get the no data value of the bands, from the GDAL no data TIFF tag.
+
+    Args:
+        page: the first page of the TIFF
+
+    Returns:
+        the no data value, or None if it is not set
+    """
+    if TAG_GDAL_NODATA not in page.tags:
+        return None
+    return float(str(page.tags[TAG_GDAL_NODATA].value).strip("\x00 "))
+
+
+def get_color_table(page: TiffPage) -> GdalInfoBandColorTable | None:
+    """Get the colour table from the Color Map TIFF tag, with the 16 bits values scaled to 8 bits like GDAL does.
+
+    Args:
+        page: the first page of the TIFF
+
+    Returns:
+        the colour table, or None if there is none
+    """
+    colormap = page.colormap
+    if colormap is None:
+        return None
+    red, green, blue = (channel.tolist() for channel in colormap)
+    # GDAL only scales the values if they don't all fit in 8 bits
+    divisor = 257 if max(red + green + blue) > 255 else 1
+    entries = [[r // divisor, g // divisor, b // divisor, 255] for r, g, b in zip(red, green, blue)]
+    return {"palette": "RGB", "count": len(entries), "entries": entries}
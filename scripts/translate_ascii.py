@@ -12,6 +12,7 @@ from topo_imagery_common.log.time_helper import time_in_ms
 
 from scripts.gdal.gdal_commands import get_ascii_translate_command
 from scripts.gdal.gdal_helper import run_gdal
+from scripts.gdal.gdal_resources import govern_gdal_resources
 
 
 def main() -> None:
@@ -38,6 +39,7 @@ def main() -> None:
         concurrency = 4
 
     start_time = time_in_ms()
+    govern_gdal_resources(concurrency)
     with tempfile.TemporaryDirectory() as tmp_path:
         with Pool(concurrency) as p:
             tiffs = p.map(